@@ -67,7 +67,7 @@ const RestaurantCard = ({ restaurant }) => {
   const formattedRating = Number.isInteger(numericRating) ? numericRating : numericRating.toFixed(1);
 
   return (
-    <div className="bg-white rounded-xl shadow-sm overflow-hidden border border-gray-100 hover:shadow-md transition-shadow duration-300">
+    <div data-testid="restaurant-card" className="bg-white rounded-xl shadow-sm overflow-hidden border border-gray-100 hover:shadow-md transition-shadow duration-300">
       {/* Restaurant Image */}
       <div className="relative h-48 bg-gray-100">
         <img
@@ -470,11 +470,11 @@ const RestaurantMenu = () => {
           {/* Menu Items */}
           <div className="lg:w-3/4 space-y-8">
             {restaurant.menu.categories.map(category => (
-              <section key={category.id} id={category.id} className="scroll-mt-20">
+              <section key={category.id} id={category.id} data-testid="menu-category" className="scroll-mt-20">
                 <h2 className="text-2xl font-bold mb-6 text-gray-900">{category.name}</h2>
                 <div className="space-y-6">
                   {category.items.map(item => (
-                    <div key={item.id} className="bg-white rounded-lg shadow-sm overflow-hidden border border-gray-100">
+                    <div key={item.id} data-testid="menu-item" className="bg-white rounded-lg shadow-sm overflow-hidden border border-gray-100">
                       <div className="p-4">
                         <div className="flex justify-between">
                           <div className="flex-1">
@@ -502,7 +502,7 @@ const RestaurantMenu = () => {
 
                             {/* Customizations */}
                             {item.customizations?.map(customization => (
-                              <div key={customization.id} className="mt-3">
+                              <div key={customization.id} data-testid="customization" className="mt-3">
                                 <p className="text-sm font-medium text-gray-700 mb-1">{customization.name}:</p>
                                 
                                 {customization.options ? (
@@ -588,6 +588,7 @@ const RestaurantMenu = () => {
                               className="px-3 py-1 bg-gray-100 text-gray-600 hover:bg-gray-200 transition-colors"
                               onClick={() => handleQuantityChange(item.id, -1)}
                               type="button"
+                              aria-label="Decrease quantity"
                             >
                               <FaMinus className="w-3 h-3" />
                             </button>
@@ -598,6 +599,7 @@ const RestaurantMenu = () => {
                               className="px-3 py-1 bg-gray-100 text-gray-600 hover:bg-gray-200 transition-colors"
                               onClick={() => handleQuantityChange(item.id, 1)}
                               type="button"
+                              aria-label="Increase quantity"
                             >
                               <FaPlus className="w-3 h-3" />
                             </button>
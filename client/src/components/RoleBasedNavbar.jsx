@@ -111,7 +111,7 @@ const RoleBasedNavbar = () => {
             )}
             {/* Cart (only for non-admin users) */}
             {!isAdmin && isAuthenticated && (
-              <Link to="/cart" className="relative p-2 text-gray-700 hover:text-red-600">
+              <Link to="/cart" aria-label="Cart" className="relative p-2 text-gray-700 hover:text-red-600">
                 <FaShoppingCart className="text-xl" />
                 {totalItems > 0 && (
                   <span className="absolute -top-1 -right-1 bg-red-600 text-white text-xs w-5 h-5 flex items-center justify-center rounded-full">
@@ -125,6 +125,7 @@ const RoleBasedNavbar = () => {
               <div className="relative">
                 <button
                   onClick={() => setShowDropdown(!showDropdown)}
+                  aria-label="Account menu"
                   className="flex items-center text-sm rounded-full focus:outline-none"
                 >
                   <FaUser className="h-8 w-8 rounded-full bg-gray-200 p-1.5 text-gray-700" />
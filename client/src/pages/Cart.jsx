@@ -69,7 +69,7 @@ const Cart = () => {
               </div>
               <div className="p-4 space-y-4">
                 {restaurantData.items.map(item => (
-                  <div key={`${item.id}-${restaurantId}`} className="flex items-center justify-between gap-4 pb-4 border-b last:border-b-0">
+                  <div key={`${item.id}-${restaurantId}`} data-testid="cart-item" className="flex items-center justify-between gap-4 pb-4 border-b last:border-b-0">
                     <div className="flex items-center gap-4 flex-1 min-w-0">
                       <img 
                         src={item.image || 'https://via.placeholder.com/100'}
@@ -85,6 +85,7 @@ const Cart = () => {
                       <div className="flex items-center border rounded-lg overflow-hidden bg-gray-50">
                         <button 
                           onClick={() => updateQuantity(restaurantId, item._id, item.quantity - 1, item.selectedOptions)}
+                          aria-label="Decrease quantity"
                           className="px-2 py-1 text-gray-600 hover:bg-gray-200 focus:outline-none"
                         >
                           <FaMinus size={10} />
@@ -94,6 +95,7 @@ const Cart = () => {
                         </span>
                         <button 
                           onClick={() => updateQuantity(restaurantId, item._id, item.quantity + 1, item.selectedOptions)}
+                          aria-label="Increase quantity"
                           className="px-2 py-1 text-gray-600 hover:bg-gray-200 focus:outline-none"
                         >
                           <FaPlus size={10} />
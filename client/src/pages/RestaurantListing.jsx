@@ -347,6 +347,7 @@ const RestaurantListing = () => {
           {/* Sort dropdown */}
           <div className="relative">
             <select 
+              aria-label="Sort by"
               className="appearance-none bg-white border border-gray-300 rounded-md pl-3 pr-8 py-2 text-sm w-full md:w-auto"
               value={sortBy}
               onChange={handleSortChange}
@@ -377,7 +378,7 @@ const RestaurantListing = () => {
             </div>
             
             {/* Delivery Options */}
-            <div className="mb-6">
+            <div className="mb-6" role="group" aria-label="Delivery Options">
               <h4 className="font-medium text-gray-900 mb-2">Delivery Options</h4>
               <div className="space-y-2">
                 {deliveryOptions.map(option => (
@@ -395,7 +396,7 @@ const RestaurantListing = () => {
             </div>
             
             {/* Popular Filters */}
-            <div className="mb-6">
+            <div className="mb-6" role="group" aria-label="Popular Filters">
               <h4 className="font-medium text-gray-900 mb-2">Popular Filters</h4>
               <div className="space-y-2">
                 {popularFilters.map(filter => (
@@ -413,7 +414,7 @@ const RestaurantListing = () => {
             </div>
             
             {/* Cuisines */}
-            <div>
+            <div role="group" aria-label="Cuisines">
               <h4 className="font-medium text-gray-900 mb-2">Cuisines</h4>
               <div className="space-y-2">
                 {cuisines.map(cuisine => (
@@ -176,8 +176,9 @@ const AuthPage = ({ initialMode = 'login' }) => {
         <form className="space-y-5" onSubmit={handleSubmit}>
           {!isLogin && (
             <div className="space-y-1">
-              <label className="text-sm font-medium text-gray-700">Full Name</label>
+              <label htmlFor="auth-name" className="text-sm font-medium text-gray-700">Full Name</label>
               <input
+                id="auth-name"
                 type="text"
                 placeholder="John Doe"
                 className="w-full px-4 py-3 border border-gray-200 rounded-lg focus:ring-2 focus:ring-red-300 focus:border-transparent transition-all"
@@ -190,8 +191,9 @@ const AuthPage = ({ initialMode = 'login' }) => {
           )}
           
           <div className="space-y-1">
-            <label className="text-sm font-medium text-gray-700">Email Address</label>
+            <label htmlFor="auth-email" className="text-sm font-medium text-gray-700">Email Address</label>
             <input
+              id="auth-email"
               type="email"
               placeholder="you@example.com"
               className={`w-full px-4 py-3 border ${emailExists ? 'border-red-500' : 'border-gray-200'} rounded-lg focus:ring-2 focus:ring-red-300 focus:border-transparent transition-all`}
@@ -208,7 +210,7 @@ const AuthPage = ({ initialMode = 'login' }) => {
           
           <div className="space-y-1">
             <div className="flex justify-between items-center">
-              <label className="text-sm font-medium text-gray-700">Password</label>
+              <label htmlFor="auth-password" className="text-sm font-medium text-gray-700">Password</label>
               {isLogin && (
                 <a href="#" className="text-xs text-red-600 hover:underline">
                   Forgot password?
@@ -216,6 +218,7 @@ const AuthPage = ({ initialMode = 'login' }) => {
               )}
             </div>
             <input
+              id="auth-password"
               type="password"
               placeholder="••••••••"
               className="w-full px-4 py-3 border border-gray-200 rounded-lg focus:ring-2 focus:ring-red-300 focus:border-transparent transition-all"
@@ -228,8 +231,9 @@ const AuthPage = ({ initialMode = 'login' }) => {
           
           {!isLogin && (
             <div className="space-y-1">
-              <label className="text-sm font-medium text-gray-700">Confirm Password</label>
+              <label htmlFor="auth-confirm-password" className="text-sm font-medium text-gray-700">Confirm Password</label>
               <input
+                id="auth-confirm-password"
                 type="password"
                 placeholder="••••••••"
                 className="w-full px-4 py-3 border border-gray-200 rounded-lg focus:ring-2 focus:ring-red-300 focus:border-transparent transition-all"
@@ -241,8 +245,8 @@ const AuthPage = ({ initialMode = 'login' }) => {
             </div>
           )}
           
-          {authError && <p className="text-red-600 text-center">{authError}</p>}
-          {error && <p className="text-red-600 text-center">{error}</p>}
+          {authError && <p role="alert" className="text-red-600 text-center">{authError}</p>}
+          {error && <p role="alert" className="text-red-600 text-center">{error}</p>}
           
           <button
             type="submit"
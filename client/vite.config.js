@@ -8,6 +8,10 @@ export default defineConfig({
   server: {
     port: 5173,
     host: true,
+    // Transform the app and its lazy routes at startup instead of on first request
+    warmup: {
+      clientFiles: ['./src/main.jsx', './src/pages/**/*.jsx', './src/components/**/*.jsx']
+    },
     proxy: {
       '/api': {
         target: 'http://localhost:5000',
@@ -1,11 +1,12 @@
 const MenuItem = require('../models/MenuItem');
 const Restaurant = require('../models/Restaurant');
+const { bumpCatalogVersion } = require('../utils/catalogCache');
+const { streamQuery } = require('../utils/streamJson');
 
-// Get all menu items
+// Get all menu items, streamed from a cursor (?format=ndjson for one per line)
 const getMenuItems = async (req, res) => {
     try {
-        const menuItems = await MenuItem.find();
-        res.json(menuItems);
+        await streamQuery(req, res, MenuItem.find());
     } catch (error) {
         console.error('Error fetching menu items:', error);
         res.status(500).json({ message: 'Error fetching menu items' });
@@ -34,6 +35,7 @@ const createMenuItem = async (req, res) => {
                 { new: true }
             );
         }
+        bumpCatalogVersion();
 
         res.status(201).json(savedMenuItem);
     } catch (error) {
@@ -71,6 +73,7 @@ const updateMenuItem = async (req, res) => {
                 { $addToSet: { menuItems: id } }
             );
         }
+        bumpCatalogVersion();
 
         res.json(updatedItem);
     } catch (error) {
@@ -100,6 +103,7 @@ const deleteMenuItem = async (req, res) => {
                 { $pull: { menuItems: id } }
             );
         }
+        bumpCatalogVersion();
 
         res.json({ message: 'Menu item deleted successfully' });
     } catch (error) {
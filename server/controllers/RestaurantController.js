@@ -1,10 +1,12 @@
 const Order = require('../models/Order');
 const MenuItem = require('../models/MenuItem');
 const Restaurant = require('../models/Restaurant');
+const { bumpCatalogVersion } = require('../utils/catalogCache');
+const { geocodeLocation } = require('../utils/geocode');
 
 exports.createRestaurant = async (req, res) => {
   try {
-    const { name, cuisine, image, location, deliveryTime, country, rating, isOpen } = req.body;
+    const { name, cuisine, image, location, deliveryTime, country, rating, isOpen, lat, lng } = req.body;
     
     // Basic validation
     if (!name || !cuisine || !image || !location || !deliveryTime) {
@@ -21,6 +23,17 @@ exports.createRestaurant = async (req, res) => {
       });
     }
     
+    // Place it on the map: explicit coordinates win over the gazetteer
+    let placed = null;
+    if (lat !== undefined && lng !== undefined) {
+      placed = {
+        point: { type: 'Point', coordinates: [parseFloat(lng), parseFloat(lat)] },
+        precision: 'manual'
+      };
+    } else {
+      placed = geocodeLocation(location);
+    }
+
     // Create restaurant object with validated data
     const newRestaurant = new Restaurant({
       name: name.trim(),
@@ -31,10 +44,13 @@ exports.createRestaurant = async (req, res) => {
       country: country?.trim() || 'Ethiopia',
       isOpen: isOpen !== undefined ? isOpen : true,
       isPopular: false,
-      rating: rating !== undefined ? parseFloat(rating) : 0
+      rating: rating !== undefined ? parseFloat(rating) : 0,
+      geo: placed?.point,
+      geoPrecision: placed?.precision
     });
     
     const savedRestaurant = await newRestaurant.save();
+    bumpCatalogVersion();
     res.status(201).json(savedRestaurant);
   } catch (error) {
     console.error('Restaurant creation error:', error);
@@ -2,15 +2,18 @@ const MenuItem = require('../models/MenuItem');
 const Order = require('../models/Order');
 const User = require('../models/User');
 const Restaurant = require('../models/Restaurant');
+const { bumpCatalogVersion } = require('../utils/catalogCache');
+const { countFor, findPage, parsePageParams } = require('../utils/pagination');
 
-// @desc    Get all users with pagination
-// @route   GET /api/admin/users
+// @desc    Get all users, newest first, a page at a time
+// @route   GET /api/admin/users?cursor=&limit=&count=exact|estimated|none
 // @access  Private/Admin
 exports.getUsers = async (req, res) => {
     try {
-        const page = parseInt(req.query.page) || 1;
-        const limit = parseInt(req.query.limit) || 10;
-        const skip = (page - 1) * limit;
+        const params = parsePageParams(req.query, { defaultLimit: 10 });
+        if (!params) {
+            return res.status(400).json({ success: false, error: 'Invalid cursor' });
+        }
         const search = req.query.search || '';
 
         const query = search ? {
@@ -20,22 +23,20 @@ exports.getUsers = async (req, res) => {
             ]
         } : {};
 
-        const users = await User.find(query)
-            .select('-password')
-            .sort({ createdAt: -1 })
-            .skip(skip)
-            .limit(limit);
-
-        const total = await User.countDocuments(query);
+        const [{ items: users, nextCursor }, counted] = await Promise.all([
+            findPage(User, query, {
+                field: 'createdAt',
+                after: params.after,
+                limit: params.limit,
+                prepare: (q) => q.select('-password')
+            }),
+            countFor(User, query, params.count)
+        ]);
 
         res.json({
             success: true,
             users,
-            pagination: {
-                current: page,
-                pages: Math.ceil(total / limit),
-                total
-            }
+            pagination: { limit: params.limit, nextCursor, ...counted }
         });
     } catch (error) {
         console.error('Error fetching users:', error);
@@ -43,35 +44,35 @@ exports.getUsers = async (req, res) => {
     }
 };
 
-// @desc    Get all orders with pagination
-// @route   GET /api/admin/orders
+// @desc    Get all orders, newest first, a page at a time
+// @route   GET /api/admin/orders?cursor=&limit=&status=&count=exact|estimated|none
 // @access  Private/Admin
 exports.getOrders = async (req, res) => {
     try {
-        const page = parseInt(req.query.page) || 1;
-        const limit = parseInt(req.query.limit) || 10;
-        const skip = (page - 1) * limit;
+        const params = parsePageParams(req.query, { defaultLimit: 10 });
+        if (!params) {
+            return res.status(400).json({ success: false, error: 'Invalid cursor' });
+        }
         const status = req.query.status;
 
         const query = status ? { deliveryStatus: status } : {};
 
-        const orders = await Order.find(query)
-            .populate('userId', 'fullName email')
-            .populate('restaurantId', 'name')
-            .sort({ createdAt: -1 })
-            .skip(skip)
-            .limit(limit);
-
-        const total = await Order.countDocuments(query);
+        const [{ items: orders, nextCursor }, counted] = await Promise.all([
+            findPage(Order, query, {
+                field: 'createdAt',
+                after: params.after,
+                limit: params.limit,
+                prepare: (q) => q
+                    .populate('userId', 'fullName email')
+                    .populate('restaurantId', 'name')
+            }),
+            countFor(Order, query, params.count)
+        ]);
 
         res.json({
             success: true,
             orders,
-            pagination: {
-                current: page,
-                pages: Math.ceil(total / limit),
-                total
-            }
+            pagination: { limit: params.limit, nextCursor, ...counted }
         });
     } catch (error) {
         console.error('Error fetching orders:', error);
@@ -374,6 +375,7 @@ exports.updateProduct = async (req, res) => {
         if (!product) {
             return res.status(404).json({ success: false, error: 'Product not found' });
         }
+        bumpCatalogVersion();
 
         res.json({ success: true, product });
     } catch (error) {
@@ -394,6 +396,7 @@ exports.deleteProduct = async (req, res) => {
         if (!product) {
             return res.status(404).json({ success: false, error: 'Product not found' });
         }
+        bumpCatalogVersion();
 
         res.json({ success: true, message: 'Product deleted successfully' });
     } catch (error) {
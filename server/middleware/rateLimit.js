@@ -3,6 +3,9 @@ const { MemoryStore } = require('express-rate-limit');
 const { ipKeyGenerator } = require('express-rate-limit');
 const logger = require('../utils/logger');
 
+// Store of every limiter built below, so the debug metrics can report their size
+const limiterStores = [];
+
 // Common rate limit configuration
 const createRateLimiter = (options = {}) => {
   const {
@@ -22,6 +25,8 @@ const createRateLimiter = (options = {}) => {
     })
   } = options;
 
+  limiterStores.push(store);
+
   return rateLimit({
     windowMs,
     max,
@@ -116,10 +121,20 @@ const sensitiveOperationLimiter = createRateLimiter({
   }
 });
 
+/**
+ * Number of client keys held by the in-memory limiter stores
+ * (MemoryStore keeps the current and the previous window)
+ */
+const countRateLimitKeys = () => limiterStores.reduce(
+  (total, store) => total + (store.current?.size || 0) + (store.previous?.size || 0),
+  0
+);
+
 module.exports = {
   authLimiter,
   registrationLimiter,
   apiLimiter,
   sensitiveOperationLimiter,
-  createRateLimiter // Export for custom limiters in other files
+  createRateLimiter, // Export for custom limiters in other files
+  countRateLimitKeys
 };
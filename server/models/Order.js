@@ -130,8 +130,9 @@ const orderSchema = new Schema({
 // Add indexes for faster querying
 orderSchema.index({ userId: 1 });
 orderSchema.index({ restaurantId: 1 });
-orderSchema.index({ deliveryStatus: 1 });
-orderSchema.index({ createdAt: -1 });
+orderSchema.index({ deliveryStatus: 1, createdAt: -1, _id: -1 });
+// Admin order table: newest first, paged by (createdAt, _id)
+orderSchema.index({ createdAt: -1, _id: -1 });
 orderSchema.index({ tx_ref: 1 });
 orderSchema.index({ paymentStatus: 1 });
 
@@ -10,6 +10,25 @@
 const mongoose = require('mongoose');
 const Schema = mongoose.Schema;
 
+// GeoJSON point; coordinates are [longitude, latitude]
+const pointSchema = new Schema({
+    type: {
+        type: String,
+        enum: ['Point'],
+        required: true
+    },
+    coordinates: {
+        type: [Number],
+        required: true,
+        validate: {
+            validator: (value) => value.length === 2 &&
+                value[0] >= -180 && value[0] <= 180 &&
+                value[1] >= -90 && value[1] <= 90,
+            message: 'Coordinates must be [longitude, latitude]'
+        }
+    }
+}, { _id: false });
+
 const restaurantSchema = new Schema({
     name: {
         type: String,
@@ -58,11 +77,27 @@ const restaurantSchema = new Schema({
         type: String,
         trim: true,
         default: 'Ethiopia'
+    },
+    // Where the restaurant is, geocoded from location (utils/geocode);
+    // absent until it has been placed
+    geo: {
+        type: pointSchema,
+        default: undefined
+    },
+    geoPrecision: {
+        type: String,
+        enum: ['place', 'city', 'manual']
     }
 }, {
     timestamps: true
 });
 
+// Listings: best rated first, paged by (rating, _id)
+restaurantSchema.index({ rating: -1, _id: -1 });
+
+// Nearest-restaurant queries ($near, $geoNear); restaurants without geo are skipped
+restaurantSchema.index({ geo: '2dsphere' });
+
 const Restaurant = mongoose.model('Restaurant', restaurantSchema);
 
 //
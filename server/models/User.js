@@ -92,6 +92,9 @@ const userSchema = new Schema({
   }
 });
 
+// Admin user table: newest first, paged by (createdAt, _id)
+userSchema.index({ createdAt: -1, _id: -1 });
+
 // Hash password before saving
 userSchema.pre('save', async function(next) {
   if (!this.isModified('password')) {
@@ -3,19 +3,21 @@ const router = express.Router();
 const mongoose = require('mongoose');
 
 const Cart = require('../models/Cart');
+const { streamQuery } = require('../utils/streamJson');
 
 // Middleware to handle async/await errors
 const asyncHandler = fn => (req, res, next) => {
   Promise.resolve(fn(req, res, next)).catch(next);
 };
 
-// Get all carts (admin only)
+// Get all carts (admin only), streamed from a cursor; count comes last,
+// once it is known (?format=ndjson sends the bare carts, one per line)
 router.get('/', asyncHandler(async (req, res) => {
-    const carts = await Cart.find().populate('restaurant', 'name');
-    res.json({
-        success: true,
-        count: carts.length,
-        data: carts
+    await streamQuery(req, res, Cart.find().populate('restaurant', 'name'), {
+        envelope: {
+            open: '{"success":true,"data":[',
+            close: (count) => `],"count":${count}}`
+        }
     });
 }));
 
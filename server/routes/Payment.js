@@ -329,7 +329,7 @@ router.post('/', async (req, res) => {
       });
 
       const response = await axios.post(
-        'https://api.chapa.co/v1/transaction/initialize',
+        `${process.env.CHAPA_API_URL || 'https://api.chapa.co/v1'}/transaction/initialize`,
         formData.toString(),
         {
           headers: {
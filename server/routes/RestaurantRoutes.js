@@ -3,8 +3,26 @@ const mongoose = require('mongoose');
 const router = express.Router();
 const Restaurant = require('../models/Restaurant');
 const { getRestaurantAnalytics, createRestaurant } = require('../controllers/RestaurantController');
+const {
+    bumpCatalogVersion,
+    cacheKey,
+    getCatalogEntry,
+    sendCatalogEntry
+} = require('../utils/catalogCache');
+const { hasSearchTerms, searchRestaurants } = require('../utils/searchIndex');
+const { geocodeLocation } = require('../utils/geocode');
+const { countFor, encodeCursor, findPage, parsePageParams } = require('../utils/pagination');
+const { streamQuery } = require('../utils/streamJson');
+
 // Auth middleware removed - using simplified approach
 
+// Restaurants for ids, in the order given
+const restaurantsInOrder = async (ids) => {
+    const restaurants = await Restaurant.find({ _id: { $in: ids } }).lean();
+    const byId = new Map(restaurants.map((restaurant) => [String(restaurant._id), restaurant]));
+    return ids.map((id) => byId.get(id)).filter(Boolean);
+};
+
 // Add address-based restaurant search route with input sanitization
 router.get('/search/by-address', async (req, res) => {
     try {
@@ -15,8 +33,10 @@ router.get('/search/by-address', async (req, res) => {
             return res.status(400).json({ message: 'A valid address is required' });
         }
         
-        // Sanitize the address input
-        address = address.trim().replace(/[{}[\]()&|\-+*?^$\\]/g, '');
+        address = address.trim();
+        if (address.length > 200) {
+            return res.status(400).json({ message: 'A valid address is required' });
+        }
         
         // Validate radius is a positive number
         radius = parseInt(radius, 10);
@@ -24,21 +44,9 @@ router.get('/search/by-address', async (req, res) => {
             return res.status(400).json({ message: 'Invalid radius value' });
         }
 
-        // Perform search with sanitized input
-        const restaurants = await Restaurant.find({
-            $and: [
-                {
-                    $or: [
-                        { location: { $regex: address.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'), $options: 'i' } },
-                        { name: { $regex: address.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'), $options: 'i' } },
-                        { cuisine: { $regex: address.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'), $options: 'i' } }
-                    ]
-                },
-                { isOpen: true }
-            ]
-        }).limit(20);
-
-        res.json(restaurants);
+        // Ranked matches on location, name, cuisine and menu from the search index
+        const { ids } = await searchRestaurants(address, { limit: 20, openOnly: true });
+        res.json(await restaurantsInOrder(ids));
     } catch (error) {
         console.error('Error searching restaurants by address:', error);
         res.status(500).json({ message: 'Error searching restaurants' });
@@ -69,22 +77,21 @@ router.get('/search/by-location', async (req, res) => {
             return res.status(400).json({ message: 'Invalid radius value' });
         }
 
-        // In a real app, you'd implement geospatial queries like this:
-        // const restaurants = await Restaurant.find({
-        //     location: {
-        //         $near: {
-        //             $geometry: {
-        //                 type: 'Point',
-        //                 coordinates: [lng, lat]
-        //             },
-        //             $maxDistance: radius * 1000 // Convert km to meters
-        //         }
-        //     },
-        //     isOpen: true
-        // }).limit(20);
-        
-        // For now, return all open restaurants with distance limit
-        const restaurants = await Restaurant.find({ isOpen: true }).limit(20);
+        // Open restaurants within radius km, nearest first (2dsphere index on geo)
+        const restaurants = await Restaurant.aggregate([
+            {
+                $geoNear: {
+                    near: { type: 'Point', coordinates: [lng, lat] },
+                    key: 'geo',
+                    distanceField: 'distanceKm',
+                    distanceMultiplier: 0.001,
+                    maxDistance: radius * 1000,
+                    query: { isOpen: true },
+                    spherical: true
+                }
+            },
+            { $limit: 20 }
+        ]);
         
         res.json(restaurants);
     } catch (error) {
@@ -105,23 +112,25 @@ router.get('/search/by-location', async (req, res) => {
 
 router.get('/popular', async (req, res) => {
     try {
-        // Step 1: Get the top-rated restaurant for each country
-        const topPerCountry = await Restaurant.aggregate([
-            { $match: { isPopular: true } },
-            { $sort: { country: 1, rating: -1 } },
-            {
-                $group: {
-                    _id: "$country",
-                    restaurant: { $first: "$$ROOT" }
-                }
-            },
-            { $replaceRoot: { newRoot: "$restaurant" } }
-        ]);
-        // Step 2: Sort those by rating and pick the top 5
-        const top5 = topPerCountry
-            .sort((a, b) => b.rating - a.rating)
-            .slice(0, 5);
-        res.json(top5);
+        const entry = await getCatalogEntry(cacheKey('popular'), async () => {
+            // Step 1: Get the top-rated restaurant for each country
+            const topPerCountry = await Restaurant.aggregate([
+                { $match: { isPopular: true } },
+                { $sort: { country: 1, rating: -1 } },
+                {
+                    $group: {
+                        _id: "$country",
+                        restaurant: { $first: "$$ROOT" }
+                    }
+                },
+                { $replaceRoot: { newRoot: "$restaurant" } }
+            ]);
+            // Step 2: Sort those by rating and pick the top 5
+            return topPerCountry
+                .sort((a, b) => b.rating - a.rating)
+                .slice(0, 5);
+        });
+        sendCatalogEntry(req, res, entry);
     } catch (error) {
         res.status(500).json({ message: error.message });
     }
@@ -141,52 +150,81 @@ router.get('/', async (req, res) => {
             query.country = { $regex: new RegExp(country.replace(/[^a-zA-Z0-9\s]/g, ''), 'i') };
         }
         
-        // Search functionality with input sanitization
-        if (search) {
-            if (typeof search !== 'string' || search.length > 100) {
-                return res.status(400).json({ message: 'Invalid search query' });
-            }
-            const sanitizedSearch = search.replace(/[^a-zA-Z0-9\s]/g, '');
-            query.$or = [
-                { name: { $regex: sanitizedSearch, $options: 'i' } },
-                { 'address.city': { $regex: sanitizedSearch, $options: 'i' } },
-                { cuisine: { $regex: sanitizedSearch, $options: 'i' } }
-            ];
+        // Search goes through the in-process index (utils/searchIndex)
+        if (search && (typeof search !== 'string' || search.length > 100)) {
+            return res.status(400).json({ message: 'Invalid search query' });
         }
         
-        // Add pagination and limit results
-        const page = parseInt(req.query.page) || 1;
-        const limit = parseInt(req.query.limit) || 20;
-        const skip = (page - 1) * limit;
-        
-        const [restaurants, total] = await Promise.all([
-            Restaurant.find(query)
-                .skip(skip)
-                .limit(limit)
-                .sort({ rating: -1 }),
-            Restaurant.countDocuments(query)
-        ]);
-        
-        res.json({
-            data: restaurants,
-            pagination: {
-                total,
-                page,
-                pages: Math.ceil(total / limit),
-                limit
+        // Ranked search results page by offset; listings by (rating, _id)
+        const ranked = Boolean(search && hasSearchTerms(search));
+        const params = parsePageParams(req.query, { ranked });
+        if (!params) {
+            return res.status(400).json({ message: 'Invalid cursor' });
+        }
+        const { after, limit, count } = params;
+        // ?page= is the old offset paging, kept for existing callers
+        const page = !req.query.cursor && Math.max(parseInt(req.query.page, 10) || 0, 0);
+        const legacyPagination = (total) => ({
+            total,
+            page,
+            pages: Math.ceil(total / limit),
+            limit
+        });
+
+        const entry = await getCatalogEntry(cacheKey('list', req.query), async () => {
+            if (ranked) {
+                // Ranked by relevance, then rating
+                const offset = page ? (page - 1) * limit : after?.offset || 0;
+                const { ids, total } = await searchRestaurants(search, {
+                    offset,
+                    limit,
+                    country: query.country?.$regex
+                });
+                const end = offset + ids.length;
+                return {
+                    data: await restaurantsInOrder(ids),
+                    pagination: page ? legacyPagination(total) : {
+                        limit,
+                        nextCursor: end < total ? encodeCursor({ offset: end }) : null,
+                        total,
+                        totalIsEstimate: false
+                    }
+                };
+            }
+            if (page) {
+                const [restaurants, total] = await Promise.all([
+                    Restaurant.find(query)
+                        .sort({ rating: -1, _id: -1 })
+                        .skip((page - 1) * limit)
+                        .limit(limit)
+                        .lean(),
+                    Restaurant.countDocuments(query)
+                ]);
+                return { data: restaurants, pagination: legacyPagination(total) };
             }
+            const [{ items, nextCursor }, counted] = await Promise.all([
+                findPage(Restaurant, query, {
+                    field: 'rating',
+                    after,
+                    limit,
+                    prepare: (q) => q.lean()
+                }),
+                countFor(Restaurant, query, count)
+            ]);
+            return { data: items, pagination: { limit, nextCursor, ...counted } };
         });
+        sendCatalogEntry(req, res, entry);
     } catch (error) {
         console.error('Error fetching restaurants:', error);
         res.status(500).json({ message: 'Error fetching restaurants' });
     }
 });
 
-// Keep the /all route for backward compatibility
+// Keep the /all route for backward compatibility; streamed, so it holds
+// one batch in memory however many restaurants there are (?format=ndjson)
 router.get('/all', async (req, res) => {
     try {
-        const restaurants = await Restaurant.find();
-        res.json(restaurants);
+        await streamQuery(req, res, Restaurant.find());
     } catch (error) {
         res.status(500).json({ message: error.message });
     }
@@ -194,8 +232,10 @@ router.get('/all', async (req, res) => {
 
 router.get('/open', async (req, res) => {
     try {
-        const restaurants = await Restaurant.find({ isOpen: true });
-        res.json(restaurants);
+        const entry = await getCatalogEntry(cacheKey('open'), () =>
+            Restaurant.find({ isOpen: true }).lean()
+        );
+        sendCatalogEntry(req, res, entry);
     } catch (error) {
         res.status(500).json({ message: error.message });
     }
@@ -213,8 +253,10 @@ router.get('/close', async (req, res) => {
 // Place custom filter routes BEFORE any parameterized routes
 router.get('/cuisines', async (req, res) => {
   try {
-    const cuisines = await Restaurant.distinct('cuisine');
-    res.json(cuisines);
+    const entry = await getCatalogEntry(cacheKey('cuisines'), () =>
+      Restaurant.distinct('cuisine')
+    );
+    sendCatalogEntry(req, res, entry);
   } catch (error) {
     res.status(500).json({ message: error.message });
   }
@@ -228,11 +270,13 @@ router.get('/:id', async (req, res) => {
             return res.status(400).json({ message: 'Invalid restaurant ID format' });
         }
         
-        const restaurant = await Restaurant.findById(req.params.id);
-        if (!restaurant) {
+        const entry = await getCatalogEntry(cacheKey(`restaurant:${req.params.id}`), () =>
+            Restaurant.findById(req.params.id).lean()
+        );
+        if (entry.empty) {
             return res.status(404).json({ message: 'Restaurant not found' });
         }
-        res.json(restaurant);
+        sendCatalogEntry(req, res, entry);
     } catch (error) {
         console.error('Error fetching restaurant:', error);
         res.status(500).json({ message: 'Server error while fetching restaurant' });
@@ -267,16 +311,35 @@ const checkRole = (roles) => {
 
 router.put('/:id', async (req, res) => {
     try {
-        
+        const update = { ...req.body };
+        if (update.geo !== undefined) {
+            // Coordinates sent with the update are placed by hand
+            update.geoPrecision = update.geoPrecision || 'manual';
+        } else if (typeof update.location === 'string') {
+            // A new location moves the restaurant, unless its point was
+            // entered by hand: those are kept, as the backfill keeps them
+            const current = await Restaurant.findById(req.params.id, 'geoPrecision').lean();
+            if (current && current.geoPrecision !== 'manual') {
+                const placed = geocodeLocation(update.location);
+                if (placed) {
+                    update.geo = placed.point;
+                    update.geoPrecision = placed.precision;
+                } else {
+                    update.$unset = { geo: 1, geoPrecision: 1 };
+                }
+            }
+        }
+
         const updatedRestaurant = await Restaurant.findByIdAndUpdate(
             req.params.id,
-            req.body,
+            update,
             { new: true, runValidators: true }
         );
         
         if (!updatedRestaurant) {
             return res.status(404).json({ message: 'Restaurant not found' });
         }
+        bumpCatalogVersion();
         res.json(updatedRestaurant);
     } catch (error) {
         res.status(400).json({ message: error.message });
@@ -290,6 +353,7 @@ router.delete('/:id', async (req, res) => {
     if (!deletedRestaurant) {
       return res.status(404).json({ message: 'Restaurant not found' });
     }
+    bumpCatalogVersion();
     res.json({ message: 'Restaurant deleted successfully' });
   } catch (error) {
     res.status(400).json({ message: error.message });
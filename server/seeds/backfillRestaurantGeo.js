@@ -0,0 +1,75 @@
+// Backfill Restaurant.geo from the location strings, offline, using the
+// bundled gazetteer (utils/geocode). Safe to re-run: only restaurants
+// without a point are touched, unless --force is given, and coordinates
+// entered by hand (geoPrecision 'manual') are always kept.
+//
+//   node seeds/backfillRestaurantGeo.js            # fill in missing points
+//   node seeds/backfillRestaurantGeo.js --force    # re-geocode every location
+//   node seeds/backfillRestaurantGeo.js --dry-run  # report only
+//
+// Restart the server afterwards, or write to any restaurant, so its catalog
+// cache picks the points up.
+
+require('dotenv').config();
+const Restaurant = require('../models/Restaurant');
+const { connectDB, disconnectDB } = require('../utils/db');
+const { geocodeLocation } = require('../utils/geocode');
+
+async function backfillRestaurantGeo({ force = false, dryRun = false } = {}) {
+  const filter = force
+    ? { geoPrecision: { $ne: 'manual' } }
+    : { geo: { $exists: false } };
+  const restaurants = await Restaurant.find(filter, 'name location').lean();
+
+  const operations = [];
+  const unplaced = [];
+  const counts = { place: 0, city: 0 };
+  for (const restaurant of restaurants) {
+    const placed = geocodeLocation(restaurant.location);
+    if (!placed) {
+      unplaced.push(restaurant);
+      continue;
+    }
+    counts[placed.precision] += 1;
+    operations.push({
+      updateOne: {
+        filter: { _id: restaurant._id },
+        update: { $set: { geo: placed.point, geoPrecision: placed.precision } }
+      }
+    });
+  }
+
+  if (!dryRun) {
+    // The 2dsphere index has to exist before $near/$geoNear can run
+    await Restaurant.createIndexes();
+    for (let i = 0; i < operations.length; i += 1000) {
+      await Restaurant.bulkWrite(operations.slice(i, i + 1000), { ordered: false });
+    }
+  }
+
+  console.log(
+    `${dryRun ? 'Would place' : 'Placed'} ${operations.length} of ${restaurants.length} restaurants ` +
+    `(${counts.place} at a neighbourhood or landmark, ${counts.city} at a city centre)`
+  );
+  for (const restaurant of unplaced) {
+    console.log(`  not in the gazetteer: ${restaurant.name} - "${restaurant.location}"`);
+  }
+  return { placed: operations.length, unplaced: unplaced.length };
+}
+
+// Only run if this file is executed directly
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  connectDB()
+    .then(() =>
+      backfillRestaurantGeo({ force: args.includes('--force'), dryRun: args.includes('--dry-run') })
+        .finally(disconnectDB)
+    )
+    .then(() => process.exit(0))
+    .catch((error) => {
+      console.error('Error backfilling restaurant locations:', error);
+      process.exit(1);
+    });
+}
+
+module.exports = { backfillRestaurantGeo };
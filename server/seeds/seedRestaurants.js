@@ -10,6 +10,7 @@
 const mongoose = require('mongoose');
 const Restaurant = require('../models/Restaurant');
 const { connectDB } = require('../utils/db');
+const { geocodeLocation } = require('../utils/geocode');
 
 const restaurants = [
   // USA Restaurants (4)
@@ -418,7 +419,14 @@ async function seedRestaurants() {
     console.log('Cleared existing restaurants');
     
     // Insert new data
-    const createdRestaurants = await Restaurant.insertMany(restaurants);
+    const createdRestaurants = await Restaurant.insertMany(
+      restaurants.map((restaurant) => {
+        const placed = geocodeLocation(restaurant.location);
+        return placed
+          ? { ...restaurant, geo: placed.point, geoPrecision: placed.precision }
+          : restaurant;
+      })
+    );
     console.log(`Successfully seeded ${createdRestaurants.length} restaurants`);
     return createdRestaurants;
   } catch (error) {
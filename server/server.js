@@ -26,7 +26,8 @@ const {
   registrationLimiter, 
   apiLimiter, 
   sensitiveOperationLimiter,
-  createRateLimiter 
+  createRateLimiter,
+  countRateLimitKeys
 } = require('./middleware/rateLimit');
 
 // Import logger
@@ -81,7 +82,8 @@ const corsOptions = {
     'Set-Cookie',
     'Authorization',
     'Expires',
-    'Content-Type'
+    'Content-Type',
+    'ETag'
   ],
   preflightContinue: false,
   optionsSuccessStatus: 204,
@@ -133,6 +135,43 @@ app.get('/api/health', (req, res) => {
   });
 });
 
+// Process metrics for long-running soak tests (testsprite_tests/harness/soak.py).
+// Registered before the rate limiters so sampling does not count against them.
+if (process.env.ENABLE_DEBUG_METRICS === 'true') {
+  const { monitorEventLoopDelay } = require('perf_hooks');
+  const loopDelay = monitorEventLoopDelay({ resolution: 10 });
+  loopDelay.enable();
+  const toMs = (ns) => Math.round(ns / 1e4) / 100;
+
+  app.get('/api/debug/metrics', async (req, res) => {
+    try {
+      const collections = {};
+      if (mongoose.connection.readyState === 1) {
+        for (const name of ['sessions', 'users', 'orders', 'carts']) {
+          collections[name] = await mongoose.connection.db.collection(name).estimatedDocumentCount();
+        }
+      }
+      const { rss, heapUsed, heapTotal, external, arrayBuffers } = process.memoryUsage();
+      res.json({
+        pid: process.pid,
+        uptime: process.uptime(),
+        memory: { rss, heapUsed, heapTotal, external, arrayBuffers },
+        // Delay since the previous sample
+        eventLoop: {
+          meanMs: toMs(loopDelay.mean),
+          p99Ms: toMs(loopDelay.percentile(99)),
+          maxMs: toMs(loopDelay.max)
+        },
+        rateLimitKeys: countRateLimitKeys(),
+        collections
+      });
+      loopDelay.reset();
+    } catch (error) {
+      res.status(500).json({ message: error.message });
+    }
+  });
+}
+
 // Security headers middleware
 app.use((req, res, next) => {
   // Prevent clickjacking
@@ -0,0 +1,97 @@
+const crypto = require('crypto');
+
+// In-process cache of the restaurant catalog's read responses.
+//
+// Every entry remembers the catalog version it was built from; a write to
+// restaurants or menu items calls bumpCatalogVersion(), after which older
+// entries are rebuilt on their next read. Responses are sent with a strong
+// ETag (a hash of the exact body), so browsers and a CDN revalidate with
+// If-None-Match and get a 304 while the body is unchanged, even across a
+// version bump that did not touch it.
+//
+// The version lives in this process only: with several server instances,
+// each one's cache only sees its own writes.
+
+const MAX_ENTRIES = 500;
+
+let version = 0;
+const entries = new Map(); // key -> { version, etag, body, empty }
+const pending = new Map(); // version:key -> promise of an entry being built
+
+const bumpCatalogVersion = () => {
+  version += 1;
+  entries.clear();
+};
+
+const catalogVersion = () => version;
+
+// Stable key for a route and its query string, whatever the parameter order
+const cacheKey = (name, query = {}) => {
+  const params = Object.keys(query)
+    .sort()
+    .map((key) => `${key}=${JSON.stringify(query[key])}`);
+  return `${name}?${params.join('&')}`;
+};
+
+const buildEntry = async (load) => {
+  const builtFrom = version;
+  const value = await load();
+  if (value === null || value === undefined) {
+    return { version: builtFrom, empty: true };
+  }
+  const body = JSON.stringify(value);
+  const hash = crypto.createHash('sha1').update(body).digest('base64url');
+  return { version: builtFrom, etag: `"${hash}"`, body, empty: false };
+};
+
+// Cached entry for key, calling load() (a promise of a JSON-able value) on a
+// miss. Concurrent misses for one key share a single load. An entry whose
+// value is null or undefined has empty set, so routes can answer 404.
+const getCatalogEntry = async (key, load) => {
+  const cached = entries.get(key);
+  if (cached && cached.version === version) {
+    // Re-insert so the Map's order doubles as least-recently-used order
+    entries.delete(key);
+    entries.set(key, cached);
+    return cached;
+  }
+  // Loads started before the latest write are not joined
+  const loadKey = `${version}:${key}`;
+  if (!pending.has(loadKey)) {
+    pending.set(
+      loadKey,
+      buildEntry(load).finally(() => pending.delete(loadKey))
+    );
+  }
+  const entry = await pending.get(loadKey);
+  // A write during the load leaves the entry stale; serve it, but don't keep it
+  if (entry.version === version) {
+    entries.set(key, entry);
+    if (entries.size > MAX_ENTRIES) {
+      entries.delete(entries.keys().next().value);
+    }
+  }
+  return entry;
+};
+
+// Send an entry's body, or 304 when the client already holds it
+const sendCatalogEntry = (req, res, entry) => {
+  res.set({
+    ETag: entry.etag,
+    // Shared caches may keep it, but must revalidate before every reuse
+    'Cache-Control': 'public, no-cache',
+    'Content-Type': 'application/json; charset=utf-8'
+  });
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+  return res.send(entry.body);
+};
+
+module.exports = {
+  bumpCatalogVersion,
+  cacheKey,
+  catalogVersion,
+  getCatalogEntry,
+  sendCatalogEntry
+};
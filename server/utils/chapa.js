@@ -4,7 +4,7 @@ const crypto = require('crypto');
 class ChapaService {
   constructor() {
     this.secretKey = process.env.CHAPA_SECRET_KEY;
-    this.baseUrl = 'https://api.chapa.co/v1';
+    this.baseUrl = process.env.CHAPA_API_URL || 'https://api.chapa.co/v1';
   }
 
   /**
@@ -0,0 +1,64 @@
+const gazetteer = require('../data/gazetteer.json');
+
+// Offline geocoding of restaurant location strings against the bundled
+// gazetteer (data/gazetteer.json): cities, and neighbourhoods or landmarks
+// within them. No network calls, so it is safe in seeds, backfills and
+// request handlers alike.
+//
+// A location such as "Bole Road, Addis Ababa, Ethiopia" is split on commas
+// and the most specific run of parts the gazetteer knows wins: "Bole Road,
+// Addis Ababa" before "Addis Ababa". Street addresses the gazetteer cannot
+// place ("123 Main St, New York") fall back to their city's centre.
+
+const normalize = (text) =>
+  String(text || '')
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim();
+
+const places = new Map(); // normalized name -> entry
+const ambiguous = new Set();
+const countries = new Set();
+
+for (const entry of gazetteer) {
+  countries.add(normalize(entry.country));
+  const keys = [normalize(entry.name)];
+  if (entry.city) {
+    keys.unshift(`${normalize(entry.name)}, ${normalize(entry.city)}`);
+  }
+  for (const key of keys) {
+    if (places.has(key) && places.get(key) !== entry) {
+      ambiguous.add(key);
+    }
+    places.set(key, entry);
+  }
+}
+for (const key of ambiguous) {
+  places.delete(key);
+}
+
+// { point, precision } for a location string, or null if the gazetteer has
+// no place in it. point is a GeoJSON Point; precision is 'place' for a
+// neighbourhood or landmark and 'city' for a city centre.
+const geocodeLocation = (location) => {
+  const parts = String(location || '').split(',').map(normalize).filter(Boolean);
+  if (parts.length > 1 && countries.has(parts[parts.length - 1])) {
+    parts.pop();
+  }
+  for (let start = 0; start < parts.length; start += 1) {
+    for (let end = parts.length; end > start; end -= 1) {
+      const entry = places.get(parts.slice(start, end).join(', '));
+      if (entry) {
+        return {
+          point: { type: 'Point', coordinates: [entry.lng, entry.lat] },
+          precision: entry.city ? 'place' : 'city'
+        };
+      }
+    }
+  }
+  return null;
+};
+
+module.exports = { geocodeLocation };
@@ -0,0 +1,134 @@
+const mongoose = require('mongoose');
+
+// Keyset ("cursor") pagination.
+//
+// A page is "the next limit documents after the last one you saw" in a
+// stable order: a sort field plus _id to break ties. The client gets that
+// position back as an opaque cursor token and sends it as ?cursor= for the
+// next page, so every page is one index range scan however deep it is,
+// instead of skipping over all the documents before it.
+//
+// Totals are optional (?count=exact|estimated|none, default estimated): an
+// exact count scans every match on every page, so by default only the
+// collection's estimated size is reported, and only for unfiltered lists.
+
+const COUNT_MODES = ['exact', 'estimated', 'none'];
+
+const encodeCursor = (payload) =>
+    Buffer.from(JSON.stringify(payload)).toString('base64url');
+
+// Payload of a cursor token, or null if it is not one of ours
+const decodeCursor = (token) => {
+    if (typeof token !== 'string' || token.length > 512) {
+        return null;
+    }
+    try {
+        const payload = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'));
+        return payload && typeof payload === 'object' ? payload : null;
+    } catch (error) {
+        return null;
+    }
+};
+
+// Cursor values survive the trip through JSON: dates are tagged
+const packValue = (value) => {
+    if (value instanceof Date) return { date: value.toISOString() };
+    return value === undefined ? null : value;
+};
+
+// Cursors come back from the client: only plain values and tagged dates may
+// reach the filter, never an object MongoDB would read as an operator
+const isCursorValue = (value) => {
+    if (value === null || typeof value === 'string') return true;
+    if (typeof value === 'number') return Number.isFinite(value);
+    return Boolean(value) &&
+        typeof value === 'object' &&
+        Object.keys(value).length === 1 &&
+        typeof value.date === 'string' &&
+        !Number.isNaN(Date.parse(value.date));
+};
+
+const unpackValue = (value) => {
+    if (value && typeof value === 'object' && typeof value.date === 'string') {
+        return new Date(value.date);
+    }
+    return value;
+};
+
+// Filter for the documents after (value, id) in order field dir, _id dir.
+// Missing and null values sort before everything else in MongoDB.
+const afterPosition = (field, direction, value, id) => {
+    const beyond = direction < 0 ? '$lt' : '$gt';
+    const tie = { [field]: value, _id: { [beyond]: id } };
+    if (value === null) {
+        return direction < 0 ? tie : { $or: [tie, { [field]: { $ne: null } }] };
+    }
+    const past = { [field]: { [beyond]: value } };
+    return direction < 0 ? { $or: [past, tie, { [field]: null }] } : { $or: [past, tie] };
+};
+
+// Parsed ?cursor=, ?limit= and ?count= for a list route. Returns null when
+// the cursor is malformed, so the route can answer 400. With ranked, the
+// cursor holds an offset into results that have no stable sort key (search).
+const parsePageParams = (query, { defaultLimit = 20, maxLimit = 100, ranked = false } = {}) => {
+    let after = null;
+    if (query.cursor) {
+        after = decodeCursor(query.cursor);
+        const valid = ranked
+            ? Number.isInteger(after?.offset) && after.offset >= 0
+            : mongoose.Types.ObjectId.isValid(after?.id) && isCursorValue(after.value);
+        if (!valid) return null;
+    }
+    const limit = Math.min(Math.max(parseInt(query.limit, 10) || defaultLimit, 1), maxLimit);
+    const count = COUNT_MODES.includes(query.count) ? query.count : 'estimated';
+    return { after, limit, count };
+};
+
+// One page of model matching filter, ordered by field (direction) then _id.
+// prepare(query) adds projections and populates. Returns
+// { items, nextCursor } where nextCursor is null on the last page.
+const findPage = async (model, filter, { field, direction = -1, after, limit, prepare = (q) => q }) => {
+    let conditions = filter;
+    if (after) {
+        const position = afterPosition(
+            field,
+            direction,
+            unpackValue(after.value),
+            new mongoose.Types.ObjectId(after.id)
+        );
+        conditions = Object.keys(filter).length ? { $and: [filter, position] } : position;
+    }
+    const items = await prepare(
+        model.find(conditions)
+            .sort({ [field]: direction, _id: direction })
+            .limit(limit + 1)
+    );
+    const hasMore = items.length > limit;
+    if (hasMore) items.pop();
+    const last = items[items.length - 1];
+    return {
+        items,
+        nextCursor: hasMore
+            ? encodeCursor({ value: packValue(last[field]), id: String(last._id) })
+            : null
+    };
+};
+
+// { total, totalIsEstimate } for a list, per the count mode
+const countFor = async (model, filter, mode) => {
+    if (mode === 'exact') {
+        return { total: await model.countDocuments(filter), totalIsEstimate: false };
+    }
+    if (mode === 'estimated' && !Object.keys(filter).length) {
+        return { total: await model.estimatedDocumentCount(), totalIsEstimate: true };
+    }
+    return { total: null, totalIsEstimate: false };
+};
+
+module.exports = {
+    countFor,
+    decodeCursor,
+    encodeCursor,
+    findPage,
+    parsePageParams
+};
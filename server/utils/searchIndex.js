@@ -0,0 +1,309 @@
+const Restaurant = require('../models/Restaurant');
+const MenuItem = require('../models/MenuItem');
+const { catalogVersion } = require('./catalogCache');
+
+// In-process inverted index over the restaurant catalog.
+//
+// Every restaurant is indexed under the words of its name, cuisine,
+// location and country, and of the names and categories of its menu items,
+// each word weighted by the most important field it appears in. A query
+// matches restaurants that contain every one of its words, where a word
+// also matches:
+//   - longer words it is a prefix of, for the last word of the query
+//     (typeahead: "piz" finds "pizza");
+//   - words one edit away (insertion, deletion, substitution or swap of
+//     two neighbours), for words of four letters or more ("piza").
+// Results are ranked by the summed weight of the matched words, scaled down
+// for prefix and typo matches, then by rating.
+//
+// Typo candidates come from a table of every indexed word with one letter
+// deleted: two words are within one edit exactly when they share such a
+// variant (or one is a variant of the other), so a lookup costs a few map
+// reads instead of a scan of the vocabulary.
+//
+// The index is rebuilt from MongoDB on the first search after the catalog
+// version (see catalogCache) changes.
+
+const FIELD_WEIGHTS = {
+  name: 4,
+  cuisine: 3,
+  location: 2,
+  country: 1,
+  menu: 1
+};
+
+const EXACT = 1;
+const PREFIX = 0.8;
+const TYPO = 0.5;
+
+// Words a short prefix may expand to; keeps one-letter queries cheap
+const MAX_PREFIX_TERMS = 300;
+const MIN_TYPO_LENGTH = 4;
+const MAX_QUERY_TERMS = 8;
+
+const normalize = (text) =>
+  String(text || '')
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase();
+
+const tokenize = (text) => normalize(text).split(/[^a-z0-9]+/).filter(Boolean);
+
+const deletions = (term) => {
+  const variants = new Set();
+  for (let i = 0; i < term.length; i += 1) {
+    variants.add(term.slice(0, i) + term.slice(i + 1));
+  }
+  return variants;
+};
+
+// Optimal string alignment distance, stopping once it exceeds 1
+const withinOneEdit = (a, b) => {
+  if (Math.abs(a.length - b.length) > 1) return false;
+  let i = 0;
+  while (i < a.length && i < b.length && a[i] === b[i]) i += 1;
+  if (a.length === b.length) {
+    if (a.slice(i + 1) === b.slice(i + 1)) return true;
+    return a[i] === b[i + 1] && a[i + 1] === b[i] && a.slice(i + 2) === b.slice(i + 2);
+  }
+  return a.length > b.length ? a.slice(i + 1) === b.slice(i) : a.slice(i) === b.slice(i + 1);
+};
+
+class SearchIndex {
+  constructor() {
+    this.docs = []; // { id, rating, isOpen, country }, in rating order after finish()
+    this.fields = []; // per doc: Map(term -> weight), until finish()
+    this.postings = new Map(); // term -> { docs: Int32Array, weights: Float32Array }
+    this.terms = []; // sorted vocabulary, for prefix ranges
+    this.variants = new Map(); // term with one letter deleted -> [terms]
+  }
+
+  add(doc, fields) {
+    const terms = new Map();
+    for (const [field, text] of Object.entries(fields)) {
+      const weight = FIELD_WEIGHTS[field];
+      for (const term of tokenize(text)) {
+        if ((terms.get(term) || 0) < weight) terms.set(term, weight);
+      }
+    }
+    this.docs.push(doc);
+    this.fields.push(terms);
+  }
+
+  finish() {
+    // Number documents by rating, so ties in score resolve in index order
+    const order = this.docs.map((doc, i) => i).sort((a, b) => this.docs[b].rating - this.docs[a].rating);
+    const lists = new Map();
+    order.forEach((original, doc) => {
+      for (const [term, weight] of this.fields[original]) {
+        const list = lists.get(term);
+        if (list) list.push(doc, weight);
+        else lists.set(term, [doc, weight]);
+      }
+    });
+    this.docs = order.map((original) => this.docs[original]);
+    this.fields = null;
+    // Flat copies of the filterable fields, so filtering costs no calls
+    this.open = Uint8Array.from(this.docs, (doc) => (doc.isOpen ? 1 : 0));
+    this.countries = [...new Set(this.docs.map((doc) => doc.country))];
+    const codes = new Map(this.countries.map((country, code) => [country, code]));
+    this.country = Int32Array.from(this.docs, (doc) => codes.get(doc.country));
+
+    for (const [term, list] of lists) {
+      const docs = new Int32Array(list.length / 2);
+      const weights = new Float32Array(list.length / 2);
+      for (let i = 0; i < docs.length; i += 1) {
+        docs[i] = list[2 * i];
+        weights[i] = list[2 * i + 1];
+      }
+      this.postings.set(term, { docs, weights });
+    }
+    this.terms = [...this.postings.keys()].sort();
+    for (const term of this.terms) {
+      if (term.length < MIN_TYPO_LENGTH - 1) continue;
+      for (const variant of deletions(term)) {
+        const terms = this.variants.get(variant);
+        if (terms) terms.push(term);
+        else this.variants.set(variant, [term]);
+      }
+    }
+    return this;
+  }
+
+  prefixed(prefix) {
+    let low = 0;
+    let high = this.terms.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (this.terms[mid] < prefix) low = mid + 1;
+      else high = mid;
+    }
+    const found = [];
+    for (let i = low; i < this.terms.length && found.length < MAX_PREFIX_TERMS; i += 1) {
+      if (!this.terms[i].startsWith(prefix)) break;
+      found.push(this.terms[i]);
+    }
+    return found;
+  }
+
+  typos(word) {
+    const candidates = new Set(this.variants.get(word) || []);
+    for (const variant of deletions(word)) {
+      if (this.postings.has(variant)) candidates.add(variant);
+      for (const term of this.variants.get(variant) || []) candidates.add(term);
+    }
+    candidates.delete(word);
+    return [...candidates].filter((term) => withinOneEdit(word, term));
+  }
+
+  // [[posting, quality], ...] for every indexed word one query word matches
+  expand(word, allowPrefix) {
+    const expansions = [[word, EXACT]];
+    if (allowPrefix) {
+      for (const term of this.prefixed(word)) {
+        if (term !== word) expansions.push([term, PREFIX]);
+      }
+    }
+    if (word.length >= MIN_TYPO_LENGTH) {
+      for (const term of this.typos(word)) expansions.push([term, TYPO]);
+    }
+    return expansions
+      .filter(([term]) => this.postings.has(term))
+      .map(([term, quality]) => [this.postings.get(term), quality]);
+  }
+
+  search(text, { offset = 0, limit = 20, openOnly = false, country = null } = {}) {
+    const words = [...new Set(tokenize(text))].slice(0, MAX_QUERY_TERMS);
+    // The last word is still being typed unless the query ends in a space
+    const typing = !/\s$/.test(text);
+    const expanded = words
+      .map((word, i) => this.expand(word, typing && i === words.length - 1))
+      .map((expansions) => ({
+        expansions,
+        size: expansions.reduce((sum, [posting]) => sum + posting.docs.length, 0)
+      }))
+      // Rarest word first: later words only score documents still matching
+      .sort((a, b) => a.size - b.size);
+    if (!expanded.length || !expanded[0].size) {
+      return { ids: [], total: 0 };
+    }
+
+    const count = this.docs.length;
+    const matched = new Uint8Array(count); // words matched so far
+    const total = new Float32Array(count);
+    const best = new Float32Array(count); // score of the current word
+    expanded.forEach(({ expansions }, w) => {
+      for (const [{ docs, weights }, quality] of expansions) {
+        for (let i = 0; i < docs.length; i += 1) {
+          const doc = docs[i];
+          const score = weights[i] * quality;
+          if (matched[doc] === w) {
+            matched[doc] = w + 1;
+            best[doc] = score;
+            total[doc] += score;
+          } else if (matched[doc] === w + 1 && best[doc] < score) {
+            // Matched through another expansion of this word already
+            total[doc] += score - best[doc];
+            best[doc] = score;
+          }
+        }
+      }
+    });
+
+    // Documents come in rating order, so an equal score never displaces an
+    // earlier one and the page is a bounded insertion sort
+    const countryAllowed = country
+      ? Uint8Array.from(this.countries, (name) => (country.test(name) ? 1 : 0))
+      : null;
+    const wanted = offset + limit;
+    const page = [];
+    let hits = 0;
+    for (let doc = 0; doc < count; doc += 1) {
+      if (matched[doc] !== expanded.length) continue;
+      if (openOnly && !this.open[doc]) continue;
+      if (countryAllowed && !countryAllowed[this.country[doc]]) continue;
+      hits += 1;
+      const score = total[doc];
+      if (page.length === wanted && page[wanted - 1][1] >= score) continue;
+      let at = page.length;
+      while (at > 0 && page[at - 1][1] < score) at -= 1;
+      page.splice(at, 0, [doc, score]);
+      if (page.length > wanted) page.pop();
+    }
+    return {
+      ids: page.slice(offset).map(([doc]) => this.docs[doc].id),
+      total: hits
+    };
+  }
+}
+
+const buildIndex = async () => {
+  const [restaurants, menuItems] = await Promise.all([
+    Restaurant.find({}, 'name cuisine location country rating isOpen').lean(),
+    MenuItem.find({}, 'name category restaurant').lean()
+  ]);
+  // MenuItem.restaurant holds the restaurant's name (as seeded) or, for items
+  // created through the API, its id: file the words under whichever it is
+  const menus = new Map();
+  for (const item of menuItems) {
+    if (!item.restaurant) continue;
+    const key = String(item.restaurant);
+    const words = menus.get(key) || [];
+    words.push(item.name, item.category);
+    menus.set(key, words);
+  }
+  const index = new SearchIndex();
+  for (const restaurant of restaurants) {
+    const id = String(restaurant._id);
+    const menu = [...(menus.get(id) || []), ...(menus.get(restaurant.name) || [])];
+    index.add(
+      {
+        id,
+        rating: restaurant.rating || 0,
+        isOpen: restaurant.isOpen !== false,
+        country: restaurant.country || ''
+      },
+      {
+        name: restaurant.name,
+        cuisine: restaurant.cuisine,
+        location: restaurant.location,
+        country: restaurant.country,
+        menu: menu.join(' ')
+      }
+    );
+  }
+  return index.finish();
+};
+
+let current = null; // { version, index }
+let building = null; // { version, promise }
+
+const currentIndex = async () => {
+  const version = catalogVersion();
+  if (current && current.version === version) {
+    return current.index;
+  }
+  if (!building || building.version !== version) {
+    const promise = buildIndex().then((index) => {
+      current = { version, index };
+      return index;
+    });
+    building = { version, promise };
+    promise.finally(() => {
+      if (building && building.promise === promise) building = null;
+    }).catch(() => {});
+  }
+  return building.promise;
+};
+
+const hasSearchTerms = (text) => tokenize(text).length > 0;
+
+// Ranked restaurant ids for a query: { ids, total }. Options: offset and
+// limit of the page, openOnly, and country, a RegExp the country must match.
+const searchRestaurants = async (text, options) => (await currentIndex()).search(text, options);
+
+module.exports = {
+  SearchIndex,
+  hasSearchTerms,
+  searchRestaurants
+};
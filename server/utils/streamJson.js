@@ -0,0 +1,85 @@
+// Streams a Mongoose query to the response straight from a lean cursor, so
+// a whole collection never sits in memory and the first byte leaves as soon
+// as the headers do.
+//
+// By default the body is an ordinary JSON array (or the given envelope),
+// sent chunked: callers parse it exactly as before. ?format=ndjson, or
+// Accept: application/x-ndjson, sends one document per line instead, which
+// clients can process as it arrives.
+//
+// Writes wait for the socket to drain, so a slow client slows the cursor
+// down rather than filling buffers; a client that goes away closes it.
+
+const BATCH_SIZE = 500;
+// Documents are written in chunks of roughly this many characters
+const CHUNK_SIZE = 64 * 1024;
+
+const NDJSON = 'application/x-ndjson';
+
+// Resolves once the socket takes more data, or is gone
+const drained = (res) => new Promise((resolve) => {
+  const done = () => {
+    res.off('drain', done);
+    res.off('close', done);
+    resolve();
+  };
+  res.on('drain', done);
+  res.on('close', done);
+});
+
+const wantsNdjson = (req) =>
+  req.query.format === 'ndjson' ||
+  req.accepts(['application/json', NDJSON]) === NDJSON;
+
+// envelope: { open, close(count) } wrapping the array in JSON mode, e.g.
+// { open: '{"data":[', close: (count) => `],"count":${count}}` }
+const streamQuery = async (req, res, query, { envelope } = {}) => {
+  const ndjson = wantsNdjson(req);
+  const cursor = query.lean().cursor({ batchSize: BATCH_SIZE });
+  let closed = false;
+  res.on('close', () => {
+    closed = true;
+  });
+
+  res.status(200);
+  res.set('Content-Type', `${ndjson ? NDJSON : 'application/json'}; charset=utf-8`);
+  res.flushHeaders();
+
+  let chunk = ndjson ? '' : envelope ? envelope.open : '[';
+  let count = 0;
+  const flush = async () => {
+    if (!chunk || closed) return;
+    const accepted = res.write(chunk);
+    chunk = '';
+    if (!accepted) {
+      await drained(res);
+    }
+  };
+
+  try {
+    for await (const doc of cursor) {
+      if (closed) break;
+      const json = JSON.stringify(doc);
+      chunk += ndjson ? `${json}\n` : `${count ? ',' : ''}${json}`;
+      count += 1;
+      if (chunk.length >= CHUNK_SIZE) {
+        await flush();
+      }
+    }
+    if (closed) return;
+    if (!ndjson) {
+      chunk += envelope ? envelope.close(count) : ']';
+    }
+    await flush();
+    res.end();
+  } catch (error) {
+    // Part of the body may be out already: cut the response short so the
+    // client sees a failed transfer instead of truncated JSON
+    console.error('Error streaming response:', error);
+    res.destroy(error);
+  } finally {
+    await cursor.close().catch(() => {});
+  }
+};
+
+module.exports = { streamQuery };
@@ -1,77 +0,0 @@
-import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Attempt to access user profile or orders API endpoint without JWT token to verify access denial.
-        await page.goto('http://localhost:5173/api/user/profile', timeout=10000)
-        
-
-        # Attempt to access user profile API endpoint with an invalid or expired JWT token.
-        await page.goto('http://localhost:5173/api/user/profile?token=invalid_or_expired_token', timeout=10000)
-        
-
-        # Access the user profile API endpoint with a valid JWT token.
-        await page.goto('http://localhost:5173/api/user/profile?token=valid_jwt_token', timeout=10000)
-        
-
-        # Assert access is denied without JWT token
-        assert 'Unauthorized' in await page.content() or '401' in await page.content()
-        # Assert access is denied with invalid or expired JWT token
-        assert 'Invalid token' in await page.content() or 'Token expired' in await page.content() or '401' in await page.content()
-        # Assert access is granted with valid JWT token and data is returned
-        assert 'user' in await page.content() or 'profile' in await page.content() or '200' in await page.content()
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
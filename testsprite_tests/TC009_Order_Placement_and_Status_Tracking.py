@@ -1,164 +1,68 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
+from datetime import datetime, timedelta, timezone
+
+from playwright.async_api import expect
+
+from harness import config
+from harness.actions import Actions
+from harness.auth import sign_in
+from harness.browser import run_standalone
+from harness.chapa import seed_cart
+from harness.factories import ORDERS, Factory
+from harness.pages import CheckoutPage
+
+async def run_test(context):
+    act = Actions(context)
+    with Factory() as data:
+        # Login as user with items in cart. The account, restaurant, menu and an
+        # earlier paid order are inserted directly instead of built through the UI.
+        user = data.user()
+        restaurant = data.restaurant()
+        tibs, injera = data.menu_items(restaurant, 2)
+        earlier = data.order(
+            user,
+            restaurant,
+            [(injera, 2)],
+            status="confirmed",
+            paymentStatus="paid",
+            createdAt=datetime.now(timezone.utc) - timedelta(days=1),
         )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Find and navigate to login page or login form to start user login with items in cart.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Try to navigate to a known login URL or reload the page to check for any changes.
-        await page.goto('http://localhost:5173/login', timeout=10000)
-        
-
-        # Input email and password, then click Sign In to login.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Create Account' button to start new user registration for order flow testing.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click the 'Create Account' button to submit the registration form and create the new user account.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Clear the Full Name input field and re-enter 'John Doe' to try to bypass the validation error, then resubmit the form.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Clear and re-enter Full Name, Email, Password, and Confirm Password fields fully, then resubmit the form to ensure all required fields are recognized.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Try to navigate to login page and attempt login with the same credentials to check if the user already exists or if login is possible.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await sign_in(context, user["email"], data.password)
+        await seed_cart(context, restaurant, tibs)
+
+        # Proceed to checkout and place the order selecting payment method
+        checkout = await CheckoutPage(await context.new_page()).open(act)
+        await act.fill(checkout.address, "Bole Road, Addis Ababa")
+        await act.click(checkout.cash_on_delivery)
+        await act.click(checkout.submit, expect_api="/api/orders/checkout")
+
+        # Confirm order is created with correct details and status 'Pending'
+        placed = data.db[ORDERS].find_one({"userId": user["_id"], "_id": {"$ne": earlier["_id"]}})
+        assert placed, "checkout did not create an order"
+        assert placed["status"] == "pending", f"new order has status {placed['status']!r}"
+        assert placed["paymentMethod"] == "cash_on_delivery", placed["paymentMethod"]
+        assert [(i["name"], i["quantity"]) for i in placed["items"]] == [(tibs["name"], 1)]
+        assert placed["totalPrice"] == tibs["price"], placed["totalPrice"]
+
+        # Simulate order status updates by restaurant/admin
+        response = await context.request.patch(
+            f"{config.API_URL}/api/orders/update-status/{placed['_id']}",
+            data={"status": "confirmed"},
+        )
+        assert response.ok, f"status update answered HTTP {response.status}"
+
+        # Verify the user can see the status update; navigate to order history page
+        page = checkout.page
+        await act.goto(page, f"{config.BASE_URL}/orders")
+        placed_card = page.get_by_text(f"Order #{str(placed['_id'])[-5:]}")
+        await expect(placed_card).to_be_visible()
+
+        # Confirm past orders are displayed with details and correct statuses
+        earlier_card = page.get_by_text(f"Order #{str(earlier['_id'])[-5:]}")
+        await expect(earlier_card).to_be_visible()
+        await expect(page.get_by_text("Confirmed", exact=True)).to_have_count(2)
+        await expect(page.get_by_text(tibs["name"])).to_be_visible()
+        await expect(page.get_by_text(injera["name"])).to_be_visible()
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,90 +1,27 @@
 import asyncio
-from playwright import async_api
+import re
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Click on 'Restaurants' to browse and select a restaurant for ordering
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+from playwright.async_api import expect
 
-        # Click 'Order Now' on the first restaurant (Smokehouse BBQ) to start an order
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+from harness.actions import Actions
+from harness.browser import run_standalone
+from harness.chapa import ChapaRoutes, checkout_with_chapa, seed_cart, verify_order
 
-        # Select sauce choice 'Original BBQ' and add BBQ Ribs Platter to cart
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/section/div/div/div/div/div/div[3]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+AUTH_ROLE = "customer"
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/section/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+async def run_test(context):
+    # The Chapa checkout page declines the payment
+    chapa = await ChapaRoutes("failed").install(context)
+    await seed_cart(context)
+    act = Actions(context)
 
-        # Click on the cart or checkout button to proceed to checkout
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[3]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Pay for a cart item with Chapa; the callback reports the failure to the server
+    page = await checkout_with_chapa(context, act)
 
-        # Generic failing assertion since expected result is unknown
-        assert False, 'Test plan execution failed: payment failure handling not verified.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+    # The customer lands on the failure page and the order is not paid
+    await expect(page).to_have_url(re.compile(r"/payment/failed/"))
+    result = await verify_order(page, chapa.last_order)
+    assert result.get("paymentStatus") == "failed", f"unexpected payment state: {result}"
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, auth_role=AUTH_ROLE))
@@ -1,78 +1,34 @@
 import asyncio
-from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Click on 'Order Now' button for the first restaurant to add items to cart.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/section[2]/div/div[2]/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+from harness import config
+from harness.actions import Actions, Unverified
+from harness.browser import run_standalone
+from harness.pages import HomePage, RestaurantMenuPage
 
-        # Select quantity using radio button and click 'Add to Cart' button for the item.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/section[3]/div/div/div/div/div/div[3]/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    act = Actions(context)
+    home = HomePage(page)
+    menu = RestaurantMenuPage(page)
+    
+    # Navigate to your target URL; stops here if the app renders nothing
+    await act.goto(page, config.BASE_URL)
+    
+    # Interact with the page elements to simulate user flow
+    # Click on 'Order Now' button for the first restaurant to add items to cart.
+    await act.click(home.order_now(0))
+    
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/section[2]/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Select quantity using radio button and click 'Add to Cart' button for the item.
+    await act.click(menu.option(0, 0, 1, category=2))
+    
 
-        # Generic failing assertion since expected result is unknown
-        assert False, 'Test plan execution failed: generic failure assertion'
-        await asyncio.sleep(5)
+    await act.click(menu.add_to_cart(0, category=1))
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Generic failing assertion since expected result is unknown
+    raise Unverified('Test plan execution failed: generic failure assertion')
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,78 +1,37 @@
 import asyncio
-from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Try to find a way to navigate to the restaurant listing page or reveal search/filter UI by scrolling or other means.
-        await page.mouse.wheel(0, window.innerHeight)
-        
+from harness import config
+from harness.actions import Actions, Unverified
+from harness.browser import run_standalone
+from harness.pages import Navbar
 
-        # Try to find any navigation or search elements by opening any menus or checking for hidden UI elements.
-        await page.mouse.wheel(0, window.innerHeight)
-        
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    act = Actions(context)
+    nav = Navbar(page)
+    
+    # Navigate to your target URL; stops here if the app renders nothing
+    await act.goto(page, config.BASE_URL)
+    
+    # Interact with the page elements to simulate user flow
+    # Try to find a way to navigate to the restaurant listing page or reveal search/filter UI by scrolling or other means.
+    await act.scroll(page)
+    
 
-        # Try to navigate to a known URL for restaurant listing or search page using go_to_url as no navigation elements are visible.
-        await page.goto('http://localhost:5173/restaurants', timeout=10000)
-        
+    # Try to find any navigation or search elements by opening any menus or checking for hidden UI elements.
+    await act.scroll(page)
+    
 
-        # Try to reload the page or click on the 'Restaurants' menu link to attempt reloading the restaurant list.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Try to navigate to a known URL for restaurant listing or search page using go_to_url as no navigation elements are visible.
+    await act.goto(page, f"{config.BASE_URL}/restaurants")
+    
 
-        assert False, 'Test failed: Expected result unknown, forcing failure.'
-        await asyncio.sleep(5)
+    # Try to reload the page or click on the 'Restaurants' menu link to attempt reloading the restaurant list.
+    await act.click(nav.restaurants_link)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    raise Unverified('Test failed: Expected result unknown, forcing failure.')
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,106 +1,52 @@
 import asyncio
-from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import config
+from harness.actions import Actions, Unverified
+from harness.browser import run_standalone
+from harness.pages import Navbar, RestaurantListingPage
+
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    act = Actions(context)
+    nav = Navbar(page)
+    listing = RestaurantListingPage(page)
+    
+    # Navigate to your target URL; stops here if the app renders nothing
+    await act.goto(page, config.BASE_URL)
+    
+    # Interact with the page elements to simulate user flow
+    # Click on the 'Restaurants' link to navigate to the restaurant browsing page.
+    await act.click(nav.restaurants_link)
     
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Click on the 'Restaurants' link to navigate to the restaurant browsing page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Apply filters by clicking checkboxes for rating 4.0+ and cuisine type (e.g., American), then verify filtered results.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[3]/div/label[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
-        # Apply the 'American' cuisine filter and verify that the results update accordingly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[4]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Apply filters by clicking checkboxes for rating 4.0+ and cuisine type (e.g., American), then verify filtered results.
+    await act.click(listing.filter_option('Popular Filters', 3))
+    
 
-        # Click the 'Clear all' button to clear all filters and verify that the full list of restaurants is displayed again.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Apply the 'American' cuisine filter and verify that the results update accordingly.
+    await act.click(listing.filter_option('Cuisines', 0))
+    
 
-        # Verify sorting functionality by selecting different sort options from the 'Sort by' dropdown and verifying the restaurant list updates accordingly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/div/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Click the 'Clear all' button to clear all filters and verify that the full list of restaurants is displayed again.
+    await act.click(listing.clear_filters)
+    
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[2]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Verify sorting functionality by selecting different sort options from the 'Sort by' dropdown and verifying the restaurant list updates accordingly.
+    await act.click(listing.sort)
+    
 
-        # Select 'Sort by: Delivery Time' from the dropdown and verify the restaurant list updates accordingly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/div/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    await act.click(listing.filter_option('Delivery Options', 0))
+    
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[2]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Select 'Sort by: Delivery Time' from the dropdown and verify the restaurant list updates accordingly.
+    await act.click(listing.sort)
+    
 
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
+    await act.click(listing.filter_option('Delivery Options', 0))
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    raise Unverified('Test plan execution failed: generic failure assertion.')
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,172 +0,0 @@
-import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Click on the Sign Up link to test registration form input validation.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[3]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Input malicious script in Full Name, Email, Password, Confirm Password fields and try to submit.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('xss')</script>")
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('xss')</script>")
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('xss')</script>")
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('xss')</script>")
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Navigate to login page and test login form input validation with malicious scripts.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Input malicious script in Email and Password fields and try to submit login form.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('xss')</script>")
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill("<script>alert('xss')</script>")
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/p/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Check for any error messages or validation feedback on login form after submission. If none, try submitting invalid email format to verify validation.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email-format')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Navigate to restaurant management page to test input validation and sanitization in restaurant management form.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on a restaurant's 'Order Now' button to navigate to restaurant menu management and test input validation there.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Scroll down to check for any text input fields for special instructions or customizations in the menu management page.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Try to input invalid or malicious values into other input fields if any, or try to add item to cart with default values and observe if any injection vulnerabilities occur.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/section[2]/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Navigate to restaurant management page or menu management page to check for any text input fields or forms for restaurant or menu management (e.g., adding or editing restaurants or menu items) to test input validation and sanitization.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Assert that after submitting malicious scripts in registration form, no alert is shown and error messages are displayed for invalid inputs.
-        assert not await page.is_dialog_open(), "Alert dialog should not be opened due to XSS script injection attempt in registration."
-        error_msgs = await frame.locator('xpath=//div[contains(@class, "error") or contains(text(), "invalid") or contains(text(), "required")]').all_text_contents()
-        assert any(error_msgs), "Error messages should be displayed for invalid registration inputs."
-        # Assert that after submitting malicious scripts in login form, no alert is shown and error messages are displayed for invalid inputs.
-        assert not await page.is_dialog_open(), "Alert dialog should not be opened due to XSS script injection attempt in login."
-        login_error_msgs = await frame.locator('xpath=//div[contains(@class, "error") or contains(text(), "invalid") or contains(text(), "required")]').all_text_contents()
-        assert any(login_error_msgs), "Error messages should be displayed for invalid login inputs."
-        # Assert that invalid email format submission in login form is rejected with validation error.
-        invalid_email_error = await frame.locator('xpath=//div[contains(text(), "invalid email") or contains(text(), "email format")]').all_text_contents()
-        assert any(invalid_email_error), "Invalid email format should trigger validation error message."
-        # Assert that after adding item to cart or submitting menu management inputs, no alert is shown and no injection occurs.
-        assert not await page.is_dialog_open(), "Alert dialog should not be opened due to XSS script injection attempt in menu or cart."
-        # Assert that no unexpected navigation or page errors occurred after submissions.
-        assert 'error' not in (await page.content()).lower(), "Page should not contain error messages after form submissions."]}  
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
@@ -1,102 +1,20 @@
 import asyncio
-from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Switch to tablet viewport and verify the same UI components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+from harness import config
+from harness.browser import run_standalone
+from harness.visual import check_breakpoints
 
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+# Checks how pages look, so images and fonts must load.
+LEAN_PAGES = False
 
-        await page.mouse.wheel(0, 500)
-        
+async def run_test(context):
+    # Verify navigation bars and home page sections at every breakpoint
+    await check_breakpoints(context, "home", "/")
 
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+    # Verify a restaurant's menu (categories, items, quantity controls) at every breakpoint
+    response = await context.request.get(f"{config.API_URL}/api/restaurants?limit=1")
+    restaurant = (await response.json())["data"][0]
+    await check_breakpoints(context, "restaurant-menu", f"/restaurants/{restaurant['_id']}")
 
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
-
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
-
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.mouse.wheel(0, 300)
-        
-
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.mouse.wheel(0, 300)
-        
-
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
-
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
-
-        # Switch to tablet viewport and verify navigation bars, home page sections, and menus are fully visible and functional
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
-
-        assert False, 'Test plan execution failed: generic failure assertion'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, lean=LEAN_PAGES))
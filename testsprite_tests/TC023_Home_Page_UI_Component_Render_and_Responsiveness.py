@@ -1,94 +1,56 @@
 import asyncio
-from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Load the home page on tablet view to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+from harness import config
+from harness.actions import Actions, Unverified
+from harness.browser import run_standalone
+from harness.pages import Navbar
 
-        # Simulate tablet device viewport and reload home page to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+# Checks how pages look, so images and fonts must load.
+LEAN_PAGES = False
 
-        # Simulate tablet viewport and reload home page to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+async def run_test(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+    act = Actions(context)
+    nav = Navbar(page)
+    
+    # Navigate to your target URL; stops here if the app renders nothing
+    await act.goto(page, config.BASE_URL)
+    
+    # Interact with the page elements to simulate user flow
+    # Load the home page on tablet view to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
 
-        # Simulate tablet device viewport and reload home page to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+    # Simulate tablet device viewport and reload home page to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
 
-        # Simulate tablet viewport and reload home page to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+    # Simulate tablet viewport and reload home page to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
 
-        # Simulate tablet viewport and reload home page to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+    # Simulate tablet device viewport and reload home page to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
 
-        # Simulate tablet viewport and reload home page to verify layout and components
-        await page.goto('http://localhost:5173/', timeout=10000)
-        
+    # Simulate tablet viewport and reload home page to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
+
+    # Simulate tablet viewport and reload home page to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
 
-        # Simulate tablet viewport and reload home page to verify layout and components
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/nav/div/div/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Simulate tablet viewport and reload home page to verify layout and components
+    await act.goto(page, config.BASE_URL)
+    
 
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
+    # Simulate tablet viewport and reload home page to verify layout and components
+    await act.click(nav.login_link)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    raise Unverified('Test plan execution failed: generic failure assertion.')
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test, lean=LEAN_PAGES))
@@ -0,0 +1,6 @@
+"""Shared runtime for the TestSprite Playwright scripts.
+
+The package itself imports nothing, so the HTTP and history tools run
+without playwright installed; import ``harness.actions``,
+``harness.browser`` and the other modules directly.
+"""
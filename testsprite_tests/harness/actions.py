@@ -0,0 +1,320 @@
+"""Event-driven page actions for the TestSprite scripts.
+
+The generated scripts slept a fixed three seconds before every fill and
+click. :class:`Actions` instead waits for the element to become actionable,
+performs the action, and then waits only as long as the page is actually
+busy: for the ``/api/*`` requests the action fired to finish and for the
+DOM to stop changing. Each step runs against its own deadline.
+
+Steps also fail fast. A navigation that renders nothing (or a Vite error
+overlay) and a target that never becomes visible raise :class:`StepFailed`
+straight away, with the URL and a summary of what the page did contain,
+instead of letting every later step time out in turn.
+"""
+
+import asyncio
+import time
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from . import config, trace
+
+# Resolves once the document has seen no mutation for ``quietMs`` or
+# ``maxMs`` has elapsed, whichever comes first.
+_DOM_QUIET_JS = """
+([quietMs, maxMs]) => new Promise((resolve) => {
+  let timer;
+  const finish = () => {
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(cap);
+    resolve();
+  };
+  const observer = new MutationObserver(() => {
+    clearTimeout(timer);
+    timer = setTimeout(finish, quietMs);
+  });
+  observer.observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true,
+  });
+  timer = setTimeout(finish, quietMs);
+  const cap = setTimeout(finish, maxMs);
+})
+"""
+
+# True once the React root has content or Vite has given up with an overlay.
+_RENDERED_JS = """
+() => {
+  const root = document.getElementById('root') || document.body;
+  return !!document.querySelector('vite-error-overlay') || !!(root && root.childElementCount);
+}
+"""
+
+_PAGE_STATE_JS = """
+() => {
+  const root = document.getElementById('root');
+  const overlay = document.querySelector('vite-error-overlay');
+  const message = overlay && overlay.shadowRoot && overlay.shadowRoot.querySelector('.message');
+  return {
+    url: location.href,
+    rootChildren: root ? root.childElementCount : null,
+    textLength: document.body ? document.body.innerText.trim().length : 0,
+    forms: document.forms.length,
+    inputs: document.querySelectorAll('input, textarea, select').length,
+    buttons: document.querySelectorAll('button').length,
+    links: document.links.length,
+    overlay: overlay ? (message ? message.textContent.trim() : 'Vite error overlay') : null,
+  };
+}
+"""
+
+
+class StepFailed(AssertionError):
+    """A step's precondition does not hold; the message says what was found instead."""
+
+
+class Unverified(AssertionError):
+    """The flow ran, but the script has no real check of the expected outcome.
+
+    TestSprite ends such scripts with a placeholder failure; the runner
+    reports them as ``unverified`` rather than ``failed``.
+    """
+
+
+def describe_page(state):
+    """One-line summary of :data:`_PAGE_STATE_JS` output for failure messages."""
+    if state is None:
+        return "page closed"
+    if state["overlay"]:
+        return f"{state['url']} shows a build error: {state['overlay'].splitlines()[0]}"
+    if state["rootChildren"] == 0 or not state["textLength"]:
+        return f"{state['url']} is empty"
+    return (
+        f"{state['url']} has {state['forms']} forms, {state['inputs']} inputs, "
+        f"{state['buttons']} buttons, {state['links']} links"
+    )
+
+
+class Deadline:
+    """Millisecond budget shared by every wait inside one step."""
+
+    def __init__(self, timeout_ms):
+        self.expires = time.monotonic() + timeout_ms / 1000
+
+    def remaining_ms(self):
+        return max(0, int((self.expires - time.monotonic()) * 1000))
+
+    @property
+    def expired(self):
+        return self.remaining_ms() == 0
+
+
+def _first_line(exc):
+    lines = str(exc).strip().splitlines()
+    return lines[0] if lines else type(exc).__name__
+
+
+def is_api_request(request):
+    return urlparse(request.url).path.startswith("/api/")
+
+
+class Actions:
+    """Fill, click and navigate without fixed sleeps.
+
+    One instance is bound to a browser context so that API traffic is
+    tracked across every page the test opens. Under ``harness.run`` each
+    step is also recorded as a span; see :mod:`harness.trace`.
+    """
+
+    def __init__(self, context, *, step_timeout_ms=None, settle_timeout_ms=None):
+        self.context = context
+        self.tracer = trace.current()
+        self.step_timeout_ms = step_timeout_ms or config.STEP_TIMEOUT_MS
+        self.settle_timeout_ms = settle_timeout_ms or config.SETTLE_TIMEOUT_MS
+        self._pending = set()
+        self._step_requests = None
+        self._changed = asyncio.Event()
+        self.dialogs = []
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_request_done)
+        context.on("requestfailed", self._on_request_done)
+        context.on("page", self._watch_page)
+        for page in context.pages:
+            self._watch_page(page)
+
+    def _watch_page(self, page):
+        page.on("dialog", self._on_dialog)
+
+    async def _on_dialog(self, dialog):
+        # Record alerts/confirms (e.g. from injected scripts) and get them out
+        # of the way so they cannot block the next step.
+        self.dialogs.append(dialog.message)
+        await dialog.dismiss()
+
+    def _on_request(self, request):
+        if not is_api_request(request):
+            return
+        self._pending.add(request)
+        if self._step_requests is not None:
+            self._step_requests.add(request)
+
+    def _on_request_done(self, request):
+        if request in self._pending:
+            self._pending.discard(request)
+            self._changed.set()
+
+    async def click(self, locator, *, expect_api=None, timeout=None):
+        """Click ``locator`` once it is visible, then wait for the page to settle."""
+        await self._run(
+            "click", locator, lambda t: locator.click(timeout=t), expect_api, timeout
+        )
+
+    async def fill(self, locator, value, *, expect_api=None, timeout=None):
+        """Fill ``locator`` once it is visible, then wait for the page to settle."""
+        await self._run(
+            "fill", locator, lambda t: locator.fill(value, timeout=t), expect_api, timeout
+        )
+
+    async def goto(self, page, url, *, timeout=10000):
+        """Navigate, wait for the app to render, then for any API calls made on load.
+
+        Raises :class:`StepFailed` if the page cannot be loaded or renders
+        nothing within the step timeout.
+        """
+        with self._span("goto", url) as span:
+            self._step_requests = set()
+            try:
+                with span.phase("action"):
+                    try:
+                        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                    except async_api.Error as exc:
+                        raise StepFailed(f"cannot load {url}: {_first_line(exc)}") from None
+                with span.phase("locate"):
+                    await self.expect_rendered(page)
+                with span.phase("settle"):
+                    await self.settle(page, Deadline(self.settle_timeout_ms))
+            finally:
+                self._step_requests = None
+
+    async def scroll(self, page, delta_y=None):
+        """Scroll the page by ``delta_y`` pixels (one viewport by default)."""
+        if delta_y is None:
+            delta_y = (page.viewport_size or {}).get("height", 720)
+        with self._span("scroll", str(delta_y)) as span:
+            self._step_requests = set()
+            try:
+                with span.phase("action"):
+                    await page.mouse.wheel(0, delta_y)
+                with span.phase("settle"):
+                    await self.settle(page, Deadline(self.settle_timeout_ms))
+            finally:
+                self._step_requests = None
+
+    async def expect_rendered(self, page, *, timeout=None):
+        """Fail fast unless the app rendered something without a build error."""
+        timeout = timeout or self.step_timeout_ms
+        try:
+            await page.wait_for_function(_RENDERED_JS, timeout=timeout)
+        except async_api.TimeoutError:
+            raise StepFailed(
+                f"nothing rendered within {timeout} ms: {describe_page(await self.page_state(page))}"
+            ) from None
+        state = await self.page_state(page)
+        if state and state["overlay"]:
+            raise StepFailed(describe_page(state))
+
+    async def page_state(self, page):
+        try:
+            return await page.evaluate(_PAGE_STATE_JS)
+        except async_api.Error:
+            return None
+
+    def _span(self, kind, target):
+        if self.tracer is None:
+            return nullcontext(trace.NULL_SPAN)
+        if not isinstance(target, str):
+            target = trace.describe(target)
+        return self.tracer.step(kind, target)
+
+    async def _run(self, kind, locator, action, expect_api, timeout):
+        with self._span(kind, locator) as span:
+            await self._run_step(span, kind, locator, action, expect_api, timeout)
+
+    async def _run_step(self, span, kind, locator, action, expect_api, timeout):
+        page = locator.page
+        if config.LEGACY_WAITS:
+            with span.phase("sleep"):
+                await page.wait_for_timeout(config.LEGACY_WAIT_MS)
+            with span.phase("action"):
+                await action(timeout or self.step_timeout_ms)
+            return
+
+        budget = timeout or self.step_timeout_ms
+        deadline = Deadline(budget)
+        with span.phase("locate"):
+            try:
+                await locator.wait_for(state="visible", timeout=deadline.remaining_ms())
+            except async_api.TimeoutError:
+                state = await self.page_state(page)
+                raise StepFailed(
+                    f"cannot {kind} {trace.describe(locator)}: not visible within "
+                    f"{budget} ms; {describe_page(state)}"
+                ) from None
+        self._step_requests = set()
+        try:
+            with span.phase("action"):
+                if expect_api:
+                    async with page.expect_response(
+                        lambda response: expect_api in response.url,
+                        timeout=deadline.remaining_ms(),
+                    ):
+                        await action(deadline.remaining_ms())
+                else:
+                    await action(deadline.remaining_ms())
+            with span.phase("settle"):
+                await self.settle(page, Deadline(self.settle_timeout_ms))
+        finally:
+            self._step_requests = None
+
+    async def settle(self, page, deadline):
+        """Wait for the DOM to go quiet and for this step's API calls to finish.
+
+        Running out of time here is not an error: the next step's own
+        locator wait decides whether the page reached the expected state.
+        """
+        await self.wait_for_dom_quiet(page, deadline)
+        if await self._wait_for_step_requests(deadline):
+            await self.wait_for_dom_quiet(page, deadline)
+
+    async def wait_for_dom_quiet(self, page, deadline):
+        remaining = deadline.remaining_ms()
+        if not remaining:
+            return
+        try:
+            await page.evaluate(
+                _DOM_QUIET_JS, [min(config.DOM_QUIET_MS, remaining), remaining]
+            )
+        except async_api.Error:
+            # The action navigated away mid-observation; wait for the new
+            # document instead.
+            try:
+                await page.wait_for_load_state(
+                    "domcontentloaded", timeout=max(1, deadline.remaining_ms())
+                )
+            except async_api.Error:
+                pass
+
+    async def _wait_for_step_requests(self, deadline):
+        """Return True if the step fired API calls, after waiting for them."""
+        tracked = self._step_requests or set()
+        while tracked & self._pending and not deadline.expired:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(), deadline.remaining_ms() / 1000
+                )
+            except asyncio.TimeoutError:
+                break
+        return bool(tracked)
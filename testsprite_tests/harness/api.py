@@ -0,0 +1,407 @@
+"""Browserless checks for the backend test plan.
+
+``tmp/config.json`` describes this project as a backend target
+(``localEndpoint: http://localhost:5000``), so every entry in
+``testsprite_backend_test_plan.json`` also has cases here that talk to the
+API directly: one pooled keep-alive ``httpx.AsyncClient`` per run, no
+Chromium and no Vite. They run through the normal runner::
+
+    python -m harness.run --backend              # every API case
+    python -m harness.run --backend TC002 TC010  # by plan ID prefix
+
+Cases are named ``TC002[crud]`` and so on. A case fails on the first
+response whose status or body does not match; the message names the call.
+Requires ``pip install httpx``.
+"""
+
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from . import config
+from .auth import ROLES
+from .load import load_fixtures
+
+# A well-formed ObjectId that no document will ever have.
+MISSING_ID = "0" * 24
+
+
+class Api:
+    """Records every call of a case and checks its status code."""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def call(self, method, path, *, token=None, expect=(200,), **kwargs):
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        started = time.perf_counter()
+        response = await self.client.request(method, path, headers=headers, **kwargs)
+        self.calls.append(
+            {
+                "call": f"{method} {path}",
+                "status": response.status_code,
+                "ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+        )
+        if isinstance(expect, int):
+            expect = (expect,)
+        assert response.status_code in expect, (
+            f"{method} {path} answered HTTP {response.status_code}, expected "
+            f"{'/'.join(map(str, expect))}: {response.text[:200]}"
+        )
+        return response
+
+    async def json(self, method, path, **kwargs):
+        return (await self.call(method, path, **kwargs)).json()
+
+
+def assert_jwt(token):
+    assert isinstance(token, str) and token.count(".") == 2, f"not a JWT: {token!r}"
+
+
+CASES = {}
+
+
+def case(plan_id, label):
+    def register(fn):
+        CASES[f"{plan_id}[{label}]"] = fn
+        return fn
+
+    return register
+
+
+# -- TC001 user registration and login ---------------------------------------
+
+
+@case("TC001", "register-and-login")
+async def register_and_login(api, fx):
+    body = {
+        "name": "API Test",
+        "email": f"api-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "ApiTest@123",
+    }
+    registered = await api.json("POST", "/api/users/register", json=body, expect=201)
+    assert_jwt(registered["token"])
+    assert "password" not in registered["user"], "registration echoed the password hash"
+
+    login = {"email": body["email"], "password": body["password"]}
+    session = await api.json("POST", "/api/users/login", json=login)
+    assert_jwt(session["token"])
+    me = await api.json("GET", "/api/users/me", token=session["token"])
+    assert body["email"] in str(me), "/api/users/me does not return the new account"
+
+
+@case("TC001", "duplicate-email")
+async def duplicate_email(api, fx):
+    body = {"name": "API Test", "email": ROLES["admin"].email, "password": "ApiTest@123"}
+    response = await api.json("POST", "/api/users/register", json=body, expect=400)
+    assert "already registered" in response["message"].lower(), response
+
+
+@case("TC001", "wrong-password")
+async def wrong_password(api, fx):
+    body = {"email": ROLES["customer"].email, "password": "definitely-wrong"}
+    response = await api.json("POST", "/api/users/login", json=body, expect=401)
+    assert "token" not in response, "failed login returned a token"
+
+
+# -- TC002 restaurant management ---------------------------------------------
+
+
+@case("TC002", "listing")
+async def restaurant_listing(api, fx):
+    page = await api.json("GET", "/api/restaurants", params={"limit": 5})
+    assert {"data", "pagination"} <= page.keys(), page.keys()
+    assert len(page["data"]) <= 5
+    cursor = page["pagination"]["nextCursor"]
+    if cursor:
+        following = await api.json("GET", "/api/restaurants", params={"limit": 5, "cursor": cursor})
+        seen = {r["_id"] for r in page["data"]}
+        assert not seen & {r["_id"] for r in following["data"]}, "cursor pages overlap"
+    await api.call("GET", "/api/restaurants", params={"cursor": "not-a-cursor"}, expect=400)
+    if page["data"]:
+        first = page["data"][0]
+        detail = await api.json("GET", f"/api/restaurants/{first['_id']}")
+        assert detail["_id"] == first["_id"]
+    await api.call("GET", "/api/restaurants/not-an-id", expect=400)
+    await api.call("GET", f"/api/restaurants/{MISSING_ID}", expect=404)
+
+
+@case("TC002", "crud")
+async def restaurant_crud(api, fx):
+    body = {
+        "name": f"API Test Kitchen {uuid.uuid4().hex[:8]}",
+        "cuisine": "Ethiopian",
+        "image": "https://example.com/kitchen.jpg",
+        "location": "Bole, Addis Ababa",
+        "deliveryTime": 30,
+    }
+    created = await api.json("POST", "/api/restaurants", json=body, expect=201)
+    path = f"/api/restaurants/{created['_id']}"
+    try:
+        updated = await api.json("PUT", path, json={"deliveryTime": 45})
+        assert updated["deliveryTime"] == 45, updated
+        assert (await api.json("GET", path))["deliveryTime"] == 45
+    finally:
+        await api.call("DELETE", path)
+    await api.call("GET", path, expect=404)
+
+
+@case("TC002", "missing-fields")
+async def restaurant_missing_fields(api, fx):
+    response = await api.json(
+        "POST", "/api/restaurants", json={"name": "Incomplete"}, expect=400
+    )
+    assert "missing required fields" in response["message"].lower(), response
+
+
+# -- TC003 menu items --------------------------------------------------------
+
+
+@case("TC003", "browse")
+async def menu_browse(api, fx):
+    items = await api.json("GET", "/api/menu-items")
+    assert isinstance(items, list)
+    streamed = await api.call("GET", "/api/menu-items", params={"format": "ndjson"})
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    lines = streamed.text.splitlines()
+    assert len(lines) == len(items), f"NDJSON sent {len(lines)} items, JSON {len(items)}"
+    if fx.restaurant_ids:
+        await api.call("GET", f"/api/menu-items/restaurant/{fx.restaurant_ids[0]}")
+    if items:
+        item = await api.json("GET", f"/api/menu-items/{items[0]['_id']}")
+        assert item["_id"] == items[0]["_id"]
+
+
+@case("TC003", "writes-need-admin")
+async def menu_writes_need_admin(api, fx):
+    body = {"name": "Unauthorized Dish", "price": 10}
+    await api.call("POST", "/api/menu-items", json=body, expect=401)
+    await api.call(
+        "POST", "/api/menu-items", json=body, token=fx.tokens.get("customer"), expect=(401, 403)
+    )
+
+
+# -- TC004 shopping cart -----------------------------------------------------
+
+
+@case("TC004", "save-and-read")
+async def cart_round_trip(api, fx):
+    assert fx.menu_items and fx.restaurant_ids, "no menu items to put in the cart"
+    item, restaurant_id = fx.menu_items[0], fx.restaurant_ids[0]
+    # Carts key on a plain userId string; a fresh one keeps this case away
+    # from the customer's real cart, which checkout empties concurrently.
+    user_id = uuid.uuid4().hex[:24]
+    body = {
+        "userId": user_id,
+        "restaurantId": restaurant_id,
+        "items": [
+            {
+                "menuItemId": item["_id"],
+                "name": item.get("name"),
+                "price": item.get("price") or 0,
+                "quantity": 2,
+                # Menu items name their restaurant; carts need its ObjectId.
+                "restaurant": restaurant_id,
+            }
+        ],
+    }
+    saved = await api.json("POST", "/api/cart", json=body, expect=201)
+    assert saved["data"]["items"][0]["quantity"] == 2, saved
+    cart = await api.json("GET", f"/api/cart/user/{user_id}")
+    assert cart["data"]["_id"] == saved["data"]["_id"]
+    await api.call("DELETE", f"/api/cart/user/{user_id}")
+    await api.call("GET", f"/api/cart/user/{user_id}", expect=404)
+
+
+@case("TC004", "invalid-user")
+async def cart_invalid_user(api, fx):
+    await api.call("GET", "/api/cart/user/not-an-id", expect=400)
+    await api.call("POST", "/api/cart", json={"items": []}, expect=400)
+
+
+# -- TC005 orders ------------------------------------------------------------
+
+
+@case("TC005", "requires-auth")
+async def orders_require_auth(api, fx):
+    await api.call("GET", "/api/orders", expect=401)
+    await api.call("POST", "/api/orders/checkout", json={}, expect=401)
+
+
+@case("TC005", "checkout-and-track")
+async def checkout_and_track(api, fx):
+    token = fx.tokens.get("customer")
+    assert token, "customer account unavailable"
+    assert fx.menu_items and fx.restaurant_ids, "no menu items to order"
+    item = fx.menu_items[0]
+    body = {
+        "restaurantId": fx.restaurant_ids[0],
+        "items": [
+            {
+                "menuItemId": item["_id"],
+                "name": item.get("name"),
+                "quantity": 1,
+                "price": item.get("price") or 1,
+            }
+        ],
+        "deliveryAddress": "Bole Road, Addis Ababa",
+        "paymentMethod": "cash_on_delivery",
+    }
+    created = await api.json("POST", "/api/orders/checkout", json=body, token=token)
+    order_id = created["order"]["_id"]
+    orders = await api.json("GET", "/api/orders", token=token)
+    assert order_id in {o["_id"] for o in orders}, "new order missing from order history"
+    order = await api.json("GET", f"/api/orders/{order_id}")
+    assert order["_id"] == order_id
+
+
+@case("TC005", "checkout-validation")
+async def checkout_validation(api, fx):
+    response = await api.json(
+        "POST", "/api/orders/checkout", json={}, token=fx.tokens.get("customer"), expect=400
+    )
+    assert set(response["missingFields"]) >= {"restaurantId", "deliveryAddress", "items"}
+
+
+# -- TC006 payment -----------------------------------------------------------
+
+
+@case("TC006", "status")
+async def payment_status(api, fx):
+    await api.call("GET", "/api/payment")
+    await api.call("GET", f"/api/payment/status/{MISSING_ID}", expect=404)
+
+
+# -- TC007 admin dashboard ---------------------------------------------------
+
+
+@case("TC007", "admin-access")
+async def admin_access(api, fx):
+    token = fx.tokens.get("admin")
+    assert token, "admin account unavailable"
+    users = await api.json("GET", "/api/admin/users", token=token)
+    assert users["success"] and isinstance(users["users"], list), users
+    for user in users["users"]:
+        assert "password" not in user, "admin user list exposes password hashes"
+    await api.call("GET", "/api/admin/orders", token=token)
+    await api.call("GET", "/api/admin/analytics", token=token)
+
+
+@case("TC007", "non-admin-denied")
+async def admin_denied(api, fx):
+    await api.call("GET", "/api/admin/users", expect=401)
+    await api.call("GET", "/api/admin/users", token=fx.tokens.get("customer"), expect=403)
+
+
+# -- TC008 search and filtering ----------------------------------------------
+
+
+@case("TC008", "search")
+async def search(api, fx):
+    term = fx.cuisines[0] if fx.cuisines else "pizza"
+    page = await api.json("GET", "/api/restaurants", params={"search": term})
+    # Ranked search: location and menu matches may follow, name/cuisine lead
+    assert page["data"], f"no restaurants match {term!r}"
+    top = page["data"][0]
+    text = f"{top.get('name', '')} {top.get('cuisine', '')}".lower()
+    assert term.lower() in text, f"{top['name']} ranked first for {term!r}"
+    typed = await api.json("GET", "/api/restaurants", params={"search": term[:3]})
+    assert typed["data"], f"typeahead {term[:3]!r} found nothing"
+    await api.call("GET", "/api/restaurants", params={"search": "x" * 101}, expect=400)
+    await api.call("GET", "/api/restaurants/search/by-address", params={"address": term})
+    # Central Addis Ababa: seeded restaurants are geocoded from their location
+    near = await api.json(
+        "GET",
+        "/api/restaurants/search/by-location",
+        params={"lat": 9.03, "lng": 38.74, "radius": 10},
+    )
+    distances = [r["distanceKm"] for r in near]
+    assert distances == sorted(distances), "by-location results are not nearest first"
+    assert all(d <= 10 for d in distances), f"results beyond the 10 km radius: {distances}"
+
+
+@case("TC008", "search-menu")
+async def search_menu(api, fx):
+    # Restaurants are found by their dishes; seeded items name their restaurant
+    items = [item for item in fx.menu_items if item.get("name") and item.get("restaurant")]
+    assert items, "no menu items to search for"
+    item = next((i for i in items if i["name"] == "Whopper"), items[0])
+    page = await api.json(
+        "GET", "/api/restaurants", params={"search": f"{item['name']} ", "limit": 100}
+    )
+    found = {key for r in page["data"] for key in (r["_id"], r.get("name"))}
+    assert item["restaurant"] in found, f"searching {item['name']!r} missed {item['restaurant']}"
+
+
+# -- TC009 promo codes -------------------------------------------------------
+
+
+@case("TC009", "active")
+async def promo_active(api, fx):
+    codes = await api.json("GET", "/api/promo-codes/active")
+    assert len(codes) <= 3, f"{len(codes)} active codes returned, expected at most 3"
+    for code in codes:
+        assert code["isActive"], f"inactive code {code['code']} listed as active"
+    await api.call("GET", f"/api/promo-codes/{MISSING_ID}", expect=404)
+
+
+# -- TC010 security middleware -----------------------------------------------
+
+
+@case("TC010", "token-checks")
+async def token_checks(api, fx):
+    await api.call("GET", "/api/users/me", expect=401)
+    await api.call("GET", "/api/users/me", token="not-a-jwt", expect=401)
+    await api.call("GET", "/api/users/me", token=fx.tokens.get("customer"))
+
+
+# -- Execution ---------------------------------------------------------------
+
+
+def discover(prefixes=()):
+    names = sorted(CASES)
+    if prefixes:
+        names = [name for name in names if name.startswith(tuple(prefixes))]
+    return names
+
+
+async def run_case(client, fx, name, timeout):
+    api = Api(client)
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(CASES[name](api, fx), timeout)
+        status, error = "passed", ""
+    except asyncio.TimeoutError:
+        status, error = "failed", f"timed out after {timeout}s"
+    except (AssertionError, httpx.HTTPError, KeyError, ValueError) as exc:
+        status, error = "failed", f"{type(exc).__name__}: {exc}"
+    return {
+        "status": status,
+        "error": error,
+        "seconds": round(time.perf_counter() - started, 3),
+        "calls": api.calls,
+    }
+
+
+async def run_all(names, *, workers, timeout):
+    """Run the named cases on one pooled client, ``workers`` at a time."""
+    limits = httpx.Limits(max_connections=workers, max_keepalive_connections=workers)
+    async with httpx.AsyncClient(
+        base_url=config.API_URL, limits=limits, timeout=timeout
+    ) as client:
+        fixtures = await load_fixtures(client)
+        gate = asyncio.Semaphore(workers)
+        results = {}
+
+        async def one(name):
+            async with gate:
+                result = await run_case(client, fixtures, name, timeout)
+            results[name] = result
+            print(f"{result['status']:>6}  {result['seconds'] * 1000:7.0f}ms  {name}")
+
+        await asyncio.gather(*(one(name) for name in names))
+    return results
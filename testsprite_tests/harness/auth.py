@@ -0,0 +1,185 @@
+"""Pre-authenticated sessions for login-dependent tests.
+
+A script that sets ``AUTH_ROLE = "owner"`` (or ``"customer"``/``"admin"``)
+starts in a browser context that is already signed in. Each role logs in
+once per run straight against ``POST /api/users/login``; the resulting
+cookies, the ``token``/``user`` localStorage entries the client reads, and
+the JWT are cached under ``tmp/auth/`` and reused until the token is close
+to expiry.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from . import config
+
+AUTH_DIR = config.TESTS_DIR / "tmp" / "auth"
+
+# Reuse a cached token only if it stays valid for at least this long.
+_EXPIRY_MARGIN_SECONDS = 5 * 60
+
+
+class AuthError(RuntimeError):
+    """Raised when a role cannot be signed in through the API."""
+
+
+@dataclass(frozen=True)
+class Credentials:
+    email: str
+    password: str
+    name: str
+    role: str
+
+
+def _credentials(key, email, password, name, role):
+    prefix = f"TESTSPRITE_{key.upper()}"
+    return Credentials(
+        email=os.environ.get(f"{prefix}_EMAIL", email),
+        password=os.environ.get(f"{prefix}_PASSWORD", password),
+        name=name,
+        role=role,
+    )
+
+
+ROLES = {
+    "customer": _credentials(
+        "customer", "customer@example.com", "Customer@12345", "Test Customer", "user"
+    ),
+    "owner": _credentials(
+        "owner", "owner@example.com", "Owner@12345", "Test Owner", "restaurant_owner"
+    ),
+    # Seeded by server/seeds/seedUsers.js
+    "admin": _credentials("admin", "admin@example.com", "Admin@12345", "Admin User", "admin"),
+}
+
+
+def token_expiry(token):
+    """Return the ``exp`` claim of a JWT without verifying it, or 0."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0))
+    except (IndexError, ValueError):
+        return 0
+
+
+async def sign_in(context, email, password):
+    """Sign an already open ``context`` in as any account; returns the login body.
+
+    For accounts that are not one of :data:`ROLES`, such as the users
+    :mod:`harness.factories` inserts. Same API login and localStorage entries
+    as a role session, but nothing is cached.
+    """
+    response = await context.request.post(
+        f"{config.API_URL}/api/users/login", data={"email": email, "password": password}
+    )
+    if not response.ok:
+        raise AuthError(
+            f"Login as {email} failed with HTTP {response.status}: {await response.text()}"
+        )
+    body = await response.json()
+    await context.add_init_script(
+        f"""(() => {{
+            if (location.origin !== {json.dumps(config.BASE_URL)}) return;
+            localStorage.setItem('token', {json.dumps(body["token"])});
+            localStorage.setItem('user', {json.dumps(json.dumps(body["user"]))});
+        }})()"""
+    )
+    return body
+
+
+class AuthStore:
+    """Signs roles in on demand and caches the result for the whole run."""
+
+    def __init__(self, playwright):
+        self._pw = playwright
+        self._sessions = {}
+        self._locks = defaultdict(asyncio.Lock)
+
+    async def storage_state(self, role):
+        """Playwright storage state for ``browser.new_context(storage_state=...)``."""
+        return (await self.session(role))["storageState"]
+
+    async def token(self, role):
+        return (await self.session(role))["token"]
+
+    async def session(self, role):
+        if role not in ROLES:
+            raise AuthError(f"Unknown role {role!r}; expected one of {sorted(ROLES)}")
+        async with self._locks[role]:
+            session = self._sessions.get(role) or _read_cache(role)
+            if not session:
+                session = await self._login(ROLES[role])
+                _write_cache(role, session)
+            self._sessions[role] = session
+            return session
+
+    async def _login(self, creds):
+        request = await self._pw.request.new_context(base_url=config.API_URL)
+        try:
+            credentials = {"email": creds.email, "password": creds.password}
+            response = await request.post("/api/users/login", data=credentials)
+            if response.status == 401 and creds.role != "admin":
+                # First run against a fresh database: create the account.
+                await request.post(
+                    "/api/users/register",
+                    data={**credentials, "name": creds.name, "role": creds.role},
+                )
+                response = await request.post("/api/users/login", data=credentials)
+            if not response.ok:
+                raise AuthError(
+                    f"Login as {creds.email} failed with HTTP {response.status}: "
+                    f"{await response.text()}"
+                )
+            body = await response.json()
+            state = await request.storage_state()
+        finally:
+            await request.dispose()
+
+        state["origins"] = [
+            {
+                "origin": config.BASE_URL,
+                "localStorage": [
+                    {"name": "token", "value": body["token"]},
+                    {"name": "user", "value": json.dumps(body["user"])},
+                ],
+            }
+        ]
+        return {
+            "baseUrl": config.BASE_URL,
+            "apiUrl": config.API_URL,
+            "token": body["token"],
+            "user": body["user"],
+            "storageState": state,
+        }
+
+
+def _cache_path(role):
+    return AUTH_DIR / f"{role}.json"
+
+
+def _read_cache(role):
+    try:
+        session = json.loads(_cache_path(role).read_text())
+    except (OSError, ValueError):
+        return None
+    if (session.get("baseUrl"), session.get("apiUrl")) != (config.BASE_URL, config.API_URL):
+        return None
+    if token_expiry(session.get("token", "")) - time.time() < _EXPIRY_MARGIN_SECONDS:
+        return None
+    return session
+
+
+def _write_cache(role, session):
+    AUTH_DIR.mkdir(parents=True, exist_ok=True)
+    _cache_path(role).write_text(json.dumps(session, indent=2))
+
+
+def clear_cache():
+    for path in AUTH_DIR.glob("*.json"):
+        path.unlink()
@@ -0,0 +1,242 @@
+"""Browser lifecycle for the TestSprite scripts.
+
+Scripts only receive a ready browser context. When a script is executed on
+its own, :func:`run_standalone` launches a private Chromium for it; under
+``harness.run`` a :class:`BrowserPool` launched once per run hands every
+test a fresh context on a shared browser instead, optionally one that
+``python -m harness.warm serve`` keeps running between runs.
+
+Contexts are lean by default (:func:`lean_pages`): functional tests do not
+look at pictures or typefaces, so those are never downloaded. Scripts that
+check how pages look opt out with a module-level ``LEAN_PAGES = False``.
+"""
+
+import asyncio
+import base64
+import itertools
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, urlunsplit
+
+from playwright.async_api import async_playwright
+
+from . import config
+from .auth import AuthStore
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",  # Match the viewport the scripts were recorded at
+    "--disable-dev-shm-usage",  # Avoid /dev/shm exhaustion in containers
+]
+
+
+# Third-party hosts that only add weight: web fonts and analytics.
+HEAVY_HOSTS = (
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "www.googletagmanager.com",
+    "www.google-analytics.com",
+    "stats.g.doubleclick.net",
+    "connect.facebook.net",
+    "cdn.segment.com",
+    "static.hotjar.com",
+)
+
+# 1x1 transparent GIF. Images are answered rather than aborted: the menu's
+# <img onError> handlers swap in a fallback URL, and a failed fallback would
+# fire onError again for as long as the page is open.
+_BLANK_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# The Vite client opens a "vite-hmr" socket on every page load and, once it
+# drops, polls the dev server and reloads the page when it answers. Handing
+# it a socket that never connects keeps it quiet without either.
+_DORMANT_HMR = """(() => {
+    const NativeWebSocket = window.WebSocket;
+    function WebSocket(url, protocols) {
+        const requested = [].concat(protocols || []);
+        if (requested.includes('vite-hmr') || requested.includes('vite-ping')) {
+            const dormant = new EventTarget();
+            Object.assign(dormant, { url: String(url), readyState: 0, send() {}, close() {} });
+            return dormant;
+        }
+        return new NativeWebSocket(url, protocols);
+    }
+    WebSocket.prototype = NativeWebSocket.prototype;
+    for (const state of ['CONNECTING', 'OPEN', 'CLOSING', 'CLOSED']) {
+        WebSocket[state] = NativeWebSocket[state];
+    }
+    window.WebSocket = WebSocket;
+})()"""
+
+
+async def lean_pages(context):
+    """Keep images, media, web fonts, analytics and Vite HMR out of ``context``.
+
+    Images get a blank GIF so layouts and ``onError`` handlers behave; media,
+    fonts and requests to :data:`HEAVY_HOSTS` are aborted. Everything else
+    falls through to the routes added after this one.
+    """
+
+    async def trim(route):
+        request = route.request
+        if request.resource_type == "image":
+            return await route.fulfill(content_type="image/gif", body=_BLANK_GIF)
+        if (
+            request.resource_type in ("media", "font")
+            or urlsplit(request.url).hostname in HEAVY_HOSTS
+        ):
+            return await route.abort()
+        await route.fallback()
+
+    await context.route("**/*", trim)
+    await context.add_init_script(_DORMANT_HMR)
+
+
+async def route_api(context):
+    """Send the client's ``/api`` calls to ``config.API_URL``.
+
+    The client has its API origin compiled in, so a run against another
+    server (such as one of :mod:`harness.stack`'s) rewrites the requests
+    instead of rebuilding the client.
+    """
+    target = urlsplit(config.API_URL)
+
+    async def forward(route):
+        parts = urlsplit(route.request.url)
+        await route.continue_(
+            url=urlunsplit((target.scheme, target.netloc, parts.path, parts.query, ""))
+        )
+
+    for origin in {config.CLIENT_API_URL, config.BASE_URL}:
+        await context.route(f"{origin}/api/**", forward)
+
+
+async def new_test_context(browser, *, lean=True, **options):
+    context = await browser.new_context(**options)
+    context.set_default_timeout(config.STEP_TIMEOUT_MS)
+    # Routes added later are tried first, so the catch-all goes in first.
+    if lean and config.LEAN_PAGES:
+        await lean_pages(context)
+    if config.API_URL != config.CLIENT_API_URL:
+        await route_api(context)
+    return context
+
+
+async def run_standalone(run_test, auth_role=None, lean=True):
+    """Run one script's ``run_test(context)`` in its own browser.
+
+    ``auth_role`` starts the context signed in as that role; see
+    :mod:`harness.auth`. ``lean=False`` loads pages in full.
+    """
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        try:
+            options = {}
+            if auth_role:
+                options["storage_state"] = await AuthStore(pw).storage_state(auth_role)
+            context = await new_test_context(browser, lean=lean, **options)
+            try:
+                await run_test(context)
+            finally:
+                await context.close()
+        finally:
+            await browser.close()
+
+
+class BrowserPool:
+    """A fixed set of Chromium processes shared by every test in a run.
+
+    Tests never share a context, so cookies, storage and routes stay
+    isolated, but they skip the driver start and browser launch.
+
+    With ``endpoint`` (see :func:`harness.warm.running_server`) the pool
+    connects to a Chromium that is already running instead of launching
+    ``size`` of its own. ``spares`` blank lean contexts are created ahead of
+    time and handed to tests that ask for nothing else, and are replaced in
+    the background as they are taken.
+    """
+
+    def __init__(self, size=1, *, spares=0, endpoint=None):
+        self.size = size
+        self.spares = spares
+        self.endpoint = endpoint
+        self._pw = None
+        self._browsers = []
+        self._next = None
+        self._spares = None
+        self._refills = set()
+        self.auth = None
+
+    async def start(self):
+        self._pw = await async_playwright().start()
+        self.auth = AuthStore(self._pw)
+        if self.endpoint:
+            self._browsers = [await self._pw.chromium.connect_over_cdp(self.endpoint)]
+        else:
+            self._browsers = await asyncio.gather(
+                *(
+                    self._pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+                    for _ in range(self.size)
+                )
+            )
+        self._next = itertools.cycle(self._browsers)
+        self._spares = asyncio.Queue()
+        for _ in range(self.spares):
+            self._refill()
+        return self
+
+    def _refill(self):
+        async def prepare():
+            await self._spares.put(await new_test_context(next(self._next)))
+
+        task = asyncio.create_task(prepare())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def _spare(self):
+        # Only a context that is already waiting; never block a test on one.
+        try:
+            context = self._spares.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        self._refill()
+        return context
+
+    async def stop(self):
+        for task in list(self._refills):
+            task.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        spares = []
+        while self._spares is not None and not self._spares.empty():
+            spares.append(self._spares.get_nowait())
+        await asyncio.gather(*(c.close() for c in spares), return_exceptions=True)
+        # On a connected browser, close() only disconnects and drops our contexts.
+        await asyncio.gather(*(b.close() for b in self._browsers), return_exceptions=True)
+        self._browsers = []
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @asynccontextmanager
+    async def context(self, auth_role=None, lean=True, **options):
+        """Yield a new context on the next browser in round-robin order.
+
+        With ``auth_role`` the context starts signed in as that role. The
+        login happens once per role per run, not once per test. ``lean=False``
+        loads pages in full.
+        """
+        context = None
+        if not auth_role and lean and not options:
+            context = await self._spare()
+        if context is None:
+            if auth_role:
+                options["storage_state"] = await self.auth.storage_state(auth_role)
+            context = await new_test_context(next(self._next), lean=lean, **options)
+        try:
+            yield context
+        finally:
+            await context.close()
@@ -0,0 +1,393 @@
+"""Concurrent bursts against the limiters of ``server/middleware/rateLimit.js``.
+
+Every probe opens its connections first, then releases all requests at one
+instant (or ``--spacing-ms`` apart) and checks where the 429 boundary falls:
+
+``authLimiter``
+    5 failed logins per 15 minutes, successes not counted. A burst of
+    unknown-user logins at ``/api/user/login`` and ``/api/auth/login`` must
+    get exactly 5 answers before the 429s start. ``/api/users/login``, the
+    path the client uses, only passes ``apiLimiter``, which does not count
+    failures; the tool reports whether it is limited at all.
+``registrationLimiter``
+    10 failed registrations per hour at ``/api/user/register`` and
+    ``/api/auth/register``.
+``apiLimiter``
+    200 requests per 15 minutes on ``/api``, failures not counted; a burst of
+    ``GET /api/restaurants`` must get exactly 200 answers.
+
+The limiters count a request when it starts and take failures (or
+successes) back when it ends, so concurrent requests all count while in
+flight. The ``in-flight`` probe sends correct logins at once and reports
+how many were refused although none of them failed.
+
+Limiters key on IP plus ``User-Agent``: every probe sends its own
+``User-Agent`` and so starts from an empty window without touching other
+clients. The ``key`` probe checks that a limited client gets through again
+by changing that header alone.
+
+``--latency`` measures what ``apiLimiter`` adds per request: it times 404s
+under ``/api`` (limiter, then no route) against 404s outside it (no
+limiter) at ``-c`` concurrent requests, and ``authLimiter`` the same way
+with failed logins on ``/api/user/login`` and ``/api/users/login`` (same
+handler, one limiter less).
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.burst                     # every boundary probe
+    python -m harness.burst auth registration   # some of them
+    python -m harness.burst --latency -c 50 -n 2000
+
+The server must not list this machine in ``TRUSTED_IPS``; a probe that sees
+no 429 at all says so. Requires ``pip install httpx``. Results are saved to
+``tmp/runs/burst_<timestamp>.json``.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+from . import config
+from .auth import ROLES
+from .load import percentile
+
+# Mirrors server/middleware/rateLimit.js and the mounts in server/server.js.
+AUTH_MAX = 5
+REGISTRATION_MAX = 10
+API_MAX = 200
+
+# Extra requests beyond each limit, so the 429 side of the boundary is seen.
+OVERSHOOT = 5
+
+
+def _agent(probe):
+    return f"testsprite-burst/{probe}/{uuid.uuid4().hex[:12]}"
+
+
+def _unknown_login():
+    return {"email": f"burst-{uuid.uuid4().hex[:12]}@example.com", "password": "Wrong123!"}
+
+
+async def warm(client, count, agent):
+    """Open ``count`` keep-alive connections so the burst does not pay for them."""
+    await asyncio.gather(
+        *(client.get("/api/health", headers={"User-Agent": agent}) for _ in range(count))
+    )
+
+
+async def fire(client, requests, *, spacing_ms=0, lead_ms=50):
+    """Send ``requests`` (``(method, path, kwargs)``) on a shared schedule.
+
+    Request ``i`` leaves ``lead_ms + i * spacing_ms`` after the call; with no
+    spacing they all leave together. Returns ``[{status, sentMs, ms}]`` in
+    send order, ``sentMs`` relative to the planned start.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time() + lead_ms / 1000
+
+    async def one(i, method, path, kwargs):
+        await asyncio.sleep(max(0.0, start + i * spacing_ms / 1000 - loop.time()))
+        sent = time.perf_counter()
+        sent_ms = (loop.time() - start) * 1000
+        try:
+            response = await client.request(method, path, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        return {
+            "status": status,
+            "sentMs": round(sent_ms, 3),
+            "ms": round((time.perf_counter() - sent) * 1000, 3),
+        }
+
+    return await asyncio.gather(
+        *(one(i, method, path, kwargs) for i, (method, path, kwargs) in enumerate(requests))
+    )
+
+
+def _summary(name, path, limit, responses):
+    statuses = [r["status"] for r in responses]
+    allowed = sum(1 for s in statuses if s != 429)
+    sent = [r["sentMs"] for r in responses]
+    if limit is None:
+        ok = 429 not in statuses
+        verdict = "not limited" if ok else f"limited after {allowed} requests"
+    elif 429 not in statuses:
+        ok = False
+        verdict = "no 429 at all; limiter skipped (TRUSTED_IPS?) or not mounted"
+    else:
+        ok = allowed == limit
+        verdict = f"{allowed} allowed, expected {limit}"
+    return {
+        "probe": name,
+        "path": path,
+        "limit": limit,
+        "sent": len(responses),
+        "allowed": allowed,
+        "throttled": statuses.count(429),
+        "statuses": sorted({str(s) for s in statuses}),
+        "ok": ok,
+        "verdict": verdict,
+        "sendSkewMs": round(max(sent) - min(sent), 3) if sent else 0.0,
+        "p50Ms": round(percentile(sorted(r["ms"] for r in responses), 50), 2),
+    }
+
+
+async def boundary(client, name, path, limit, body, *, method="POST", spacing_ms=0, count=None):
+    """Burst ``count`` (default ``limit + OVERSHOOT``) requests from one fresh key."""
+    agent = _agent(name)
+    count = count or (limit or AUTH_MAX) + OVERSHOOT
+    await warm(client, min(count, 50), agent)
+    requests = [
+        (method, path, {"headers": {"User-Agent": agent}, **({"json": body()} if body else {})})
+        for _ in range(count)
+    ]
+    return _summary(name, path, limit, await fire(client, requests, spacing_ms=spacing_ms))
+
+
+async def probe_auth(client, spacing_ms):
+    results = []
+    for path in ("/api/user/login", "/api/auth/login"):
+        results.append(
+            await boundary(client, "auth", path, AUTH_MAX, _unknown_login, spacing_ms=spacing_ms)
+        )
+    # Same handler as /api/user/login, but authLimiter is not mounted here.
+    results.append(
+        await boundary(
+            client, "auth", "/api/users/login", None, _unknown_login, spacing_ms=spacing_ms
+        )
+    )
+    return results
+
+
+async def probe_registration(client, spacing_ms):
+    # Missing fields: rejected with 400 before any database work.
+    return [
+        await boundary(
+            client,
+            "registration",
+            path,
+            REGISTRATION_MAX,
+            lambda: {"email": f"burst-{uuid.uuid4().hex[:12]}@example.com"},
+            spacing_ms=spacing_ms,
+        )
+        for path in ("/api/user/register", "/api/auth/register")
+    ]
+
+
+async def probe_api(client, spacing_ms):
+    return [
+        await boundary(
+            client,
+            "api",
+            "/api/restaurants",
+            API_MAX,
+            None,
+            method="GET",
+            spacing_ms=spacing_ms,
+            count=API_MAX + OVERSHOOT * 4,
+        )
+    ]
+
+
+async def probe_in_flight(client, spacing_ms):
+    creds = ROLES["customer"]
+    check = await client.post(
+        "/api/user/login",
+        json={"email": creds.email, "password": creds.password},
+        headers={"User-Agent": _agent("in-flight-check")},
+    )
+    if check.status_code != 200:
+        return [
+            {
+                "probe": "in-flight",
+                "path": "/api/user/login",
+                "ok": None,
+                "verdict": f"skipped: customer login answered HTTP {check.status_code}",
+            }
+        ]
+    result = await boundary(
+        client,
+        "in-flight",
+        "/api/user/login",
+        None,
+        lambda: {"email": creds.email, "password": creds.password},
+        spacing_ms=spacing_ms,
+        count=AUTH_MAX * 3,
+    )
+    if result["throttled"]:
+        result["verdict"] = (
+            f"{result['throttled']} of {result['sent']} correct logins refused "
+            "while counted in flight"
+        )
+    return [result]
+
+
+async def probe_key(client, spacing_ms):
+    limited = _agent("key")
+    requests = [
+        ("POST", "/api/user/login", {"headers": {"User-Agent": limited}, "json": _unknown_login()})
+        for _ in range(AUTH_MAX + 1)
+    ]
+    await fire(client, requests, spacing_ms=spacing_ms)
+    again = await client.post(
+        "/api/user/login", json=_unknown_login(), headers={"User-Agent": limited}
+    )
+    other = await client.post(
+        "/api/user/login", json=_unknown_login(), headers={"User-Agent": _agent("key")}
+    )
+    bypass = again.status_code == 429 and other.status_code != 429
+    return [
+        {
+            "probe": "key",
+            "path": "/api/user/login",
+            "ok": again.status_code == 429,
+            "verdict": (
+                "limit escaped by changing User-Agent"
+                if bypass
+                else f"same agent {again.status_code}, new agent {other.status_code}"
+            ),
+        }
+    ]
+
+
+PROBES = {
+    "auth": probe_auth,
+    "registration": probe_registration,
+    "api": probe_api,
+    "in-flight": probe_in_flight,
+    "key": probe_key,
+}
+
+
+async def _timed(client, pairs, concurrency):
+    """Run ``(label, method, path, kwargs)`` pairs ``concurrency`` at a time."""
+    gate = asyncio.Semaphore(concurrency)
+    timings = {}
+
+    async def one(label, method, path, kwargs):
+        async with gate:
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            elapsed = (time.perf_counter() - started) * 1000
+        timings.setdefault(label, []).append((elapsed, response.status_code))
+
+    await asyncio.gather(*(one(*pair) for pair in pairs))
+    return timings
+
+
+async def limiter_latency(client, *, concurrency, requests):
+    """Median and p95 per path, and the difference the limiter makes.
+
+    Each request uses its own ``User-Agent`` so no limiter ever refuses it;
+    the paths are interleaved so both see the same server load.
+    """
+    await warm(client, concurrency, _agent("latency"))
+    pairs = []
+    for _ in range(requests // 2):
+        for label, path in (("api 404", "/api/__burst_probe"), ("plain 404", "/__burst_probe")):
+            pairs.append((label, "GET", path, {"headers": {"User-Agent": _agent("latency")}}))
+        for label, path in (
+            ("authLimiter login", "/api/user/login"),
+            ("unlimited login", "/api/users/login"),
+        ):
+            pairs.append(
+                (
+                    label,
+                    "POST",
+                    path,
+                    {"headers": {"User-Agent": _agent("latency")}, "json": _unknown_login()},
+                )
+            )
+    timings = await _timed(client, pairs, concurrency)
+    paths = {}
+    for label, samples in timings.items():
+        values = sorted(ms for ms, _ in samples)
+        paths[label] = {
+            "requests": len(values),
+            "statuses": sorted({status for _, status in samples}),
+            "p50Ms": round(percentile(values, 50), 3),
+            "p95Ms": round(percentile(values, 95), 3),
+        }
+    return {
+        "concurrency": concurrency,
+        "paths": paths,
+        "apiLimiterMs": round(paths["api 404"]["p50Ms"] - paths["plain 404"]["p50Ms"], 3),
+        "authLimiterMs": round(
+            paths["authLimiter login"]["p50Ms"] - paths["unlimited login"]["p50Ms"], 3
+        ),
+    }
+
+
+async def run(names, *, spacing_ms, latency, concurrency, requests):
+    limits = httpx.Limits(max_connections=API_MAX + 50, max_keepalive_connections=API_MAX + 50)
+    async with httpx.AsyncClient(base_url=config.API_URL, limits=limits, timeout=30) as client:
+        probes = []
+        for name in names:
+            probes += await PROBES[name](client, spacing_ms)
+        measured = (
+            await limiter_latency(client, concurrency=concurrency, requests=requests)
+            if latency
+            else None
+        )
+    return probes, measured
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("probes", nargs="*", help=f"probes to run: {', '.join(PROBES)} (default all)")
+    parser.add_argument(
+        "--spacing-ms", type=float, default=0, help="gap between burst requests (0 = all at once)"
+    )
+    parser.add_argument("--latency", action="store_true", help="measure limiter overhead too")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="latency: in flight")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="latency: per path pair")
+    args = parser.parse_args(argv)
+    unknown = set(args.probes) - set(PROBES)
+    if unknown:
+        parser.error(f"unknown probes {', '.join(sorted(unknown))}")
+
+    names = args.probes or list(PROBES)
+    probes, latency = asyncio.run(
+        run(
+            names,
+            spacing_ms=args.spacing_ms,
+            latency=args.latency,
+            concurrency=args.concurrency,
+            requests=args.requests,
+        )
+    )
+    for p in probes:
+        mark = {True: "ok", False: "FAIL", None: "skip"}[p["ok"]]
+        skew = f"  skew {p['sendSkewMs']:.1f}ms" if "sendSkewMs" in p else ""
+        print(f"{mark:>4}  {p['probe']:<12} {p['path']:<22} {p['verdict']}{skew}")
+    if latency:
+        for label, s in latency["paths"].items():
+            print(f"      {label:<20} p50 {s['p50Ms']:7.2f}ms  p95 {s['p95Ms']:7.2f}ms")
+        print(
+            f"      apiLimiter adds {latency['apiLimiterMs']:.2f}ms, "
+            f"authLimiter {latency['authLimiterMs']:.2f}ms (median, "
+            f"{latency['concurrency']} concurrent)"
+        )
+
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = config.RUNS_DIR / f"burst_{stamp}.json"
+    path.write_text(
+        json.dumps(
+            {"created": stamp, "target": config.API_URL, "probes": probes, "latency": latency},
+            indent=2,
+        )
+    )
+    print(f"Report written to {path}")
+    return 1 if any(p["ok"] is False for p in probes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Offline Chapa for the payment tests.
+
+A payment script calls :meth:`ChapaRoutes.install` on its context. From then
+on the browser never talks to Chapa:
+
+- ``POST /api/payment``, the server's initialize call, is answered with what
+  ``server/routes/Payment.js`` returns for the scripted outcome;
+- the hosted page on ``https://checkout.chapa.co`` redirects straight to the
+  server's real ``/api/payment/callback/:orderId`` with that outcome. The
+  server updates the order and sends the browser on to the client's
+  ``/payment/success/:orderId`` or ``/payment/failed/:orderId`` page;
+- any other request to a ``chapa.co`` host is aborted.
+
+Outcomes:
+
+``success``
+    the customer pays; the callback marks the order paid.
+``failed``
+    the customer cancels or the charge is declined; the order is cancelled.
+``timeout``
+    the gateway never answers the initialize call. The server's error
+    response is returned at once instead of after its 30 second timeout.
+
+The order itself is created by the real ``POST /api/orders/checkout`` and
+:func:`verify_order` checks it through the real ``/api/payment/verify``.
+Under ``--hermetic`` the server's own verify calls go to the stack's fake
+Chapa, so a run needs no network at all.
+"""
+
+import json
+from urllib.parse import urlencode, urlsplit
+
+from . import config
+from .pages import CheckoutPage
+
+OUTCOMES = ("success", "failed", "timeout")
+CHECKOUT_URL = "https://checkout.chapa.co"
+
+# Body routes/Payment.js sends when axios gets no answer from Chapa.
+_GATEWAY_UNAVAILABLE = {
+    "success": False,
+    "message": (
+        "No response received from payment gateway. "
+        "Please check your internet connection and try again."
+    ),
+    "error": "timeout of 30000ms exceeded",
+    "code": "PAYMENT_GATEWAY_UNAVAILABLE",
+    "details": {},
+}
+
+
+def _is_initialize(url):
+    return urlsplit(url).path.rstrip("/") == "/api/payment"
+
+
+class ChapaRoutes:
+    """Scripted Chapa responses for one browser context.
+
+    ``outcome`` applies to payments initialized after it is set, so a test
+    can pay one order successfully and then fail the next. ``payments`` maps
+    each ``tx_ref`` to its ``orderId``, amount and outcome.
+    """
+
+    def __init__(self, outcome="success"):
+        if outcome not in OUTCOMES:
+            raise ValueError(f"unknown Chapa outcome {outcome!r}; expected one of {OUTCOMES}")
+        self.outcome = outcome
+        self.payments = {}
+
+    @property
+    def last_order(self):
+        """``orderId`` of the most recent payment, or None."""
+        if not self.payments:
+            return None
+        return list(self.payments.values())[-1]["orderId"]
+
+    async def install(self, context):
+        # Routes added later win, so the catch-all goes first.
+        await context.route("https://*.chapa.co/**", lambda route: route.abort())
+        await context.route(f"{CHECKOUT_URL}/**", self._checkout)
+        await context.route(_is_initialize, self._initialize)
+        return self
+
+    async def _initialize(self, route):
+        request = route.request
+        if request.method != "POST":
+            return await route.fallback()
+        body = request.post_data_json or {}
+        tx_ref = body.get("tx_ref") or f"order-{body.get('orderId')}"
+        self.payments[tx_ref] = {
+            "orderId": body.get("orderId"),
+            "amount": body.get("amount"),
+            "outcome": self.outcome,
+        }
+        # The client calls the API cross-origin with credentials.
+        headers = {
+            "Access-Control-Allow-Origin": request.headers.get("origin", config.BASE_URL),
+            "Access-Control-Allow-Credentials": "true",
+        }
+        if self.outcome == "timeout":
+            return await route.fulfill(status=500, headers=headers, json=_GATEWAY_UNAVAILABLE)
+        await route.fulfill(
+            headers=headers,
+            json={
+                "success": True,
+                "message": "Payment initiated successfully",
+                "data": {
+                    "checkout_url": f"{CHECKOUT_URL}/checkout/payment/{tx_ref}",
+                    "tx_ref": tx_ref,
+                    "reference": tx_ref,
+                },
+            }
+        )
+
+    async def _checkout(self, route):
+        tx_ref = urlsplit(route.request.url).path.rstrip("/").rsplit("/", 1)[-1]
+        payment = self.payments.get(tx_ref)
+        if payment is None or payment["outcome"] == "timeout":
+            return await route.fulfill(status=404, body="Invalid checkout link")
+        query = urlencode({"status": payment["outcome"], "tx_ref": tx_ref})
+        callback = f"{config.API_URL}/api/payment/callback/{payment['orderId']}?{query}"
+        await route.fulfill(status=302, headers={"Location": callback})
+
+
+async def seed_cart(context, restaurant=None, item=None):
+    """Put one menu item in the client's cart (``localStorage['cart']``).
+
+    Without ``restaurant`` and ``item`` (documents as the API or
+    :mod:`harness.factories` return them) both come from the live API. The
+    cart is refilled on every page load that finds it empty, so consecutive
+    checkouts in one test work.
+    """
+    if restaurant is None:
+        restaurants = await context.request.get(f"{config.API_URL}/api/restaurants?limit=20")
+        restaurant = (await restaurants.json())["data"][0]
+    if item is None:
+        menu_items = await context.request.get(f"{config.API_URL}/api/menu-items")
+        items = await menu_items.json()
+        item = next((i for i in items if i.get("restaurant") == restaurant["name"]), items[0])
+    restaurant_id = str(restaurant["_id"])
+    cart = {
+        restaurant_id: {
+            "items": [
+                {
+                    "_id": str(item["_id"]),
+                    "name": item["name"],
+                    "price": item["price"],
+                    "quantity": 1,
+                }
+            ],
+            "restaurant": {"_id": restaurant_id, "name": restaurant["name"]},
+        }
+    }
+    await context.add_init_script(
+        f"""(() => {{
+            if (location.origin !== {json.dumps(config.BASE_URL)}) return;
+            const saved = JSON.parse(localStorage.getItem('cart') || '{{}}');
+            if (!saved.cart || !Object.keys(saved.cart).length) {{
+                localStorage.setItem('cart', JSON.stringify({{ cart: {json.dumps(cart)} }}));
+            }}
+        }})()"""
+    )
+    return cart
+
+
+async def checkout_with_chapa(context, act, address="Bole Road, Addis Ababa"):
+    """Open ``/checkout``, choose Chapa and submit; returns the page.
+
+    The page is left wherever the scripted outcome sends it.
+    """
+    checkout = await CheckoutPage(await context.new_page()).open(act)
+    await act.fill(checkout.address, address)
+    await act.click(checkout.chapa)
+    await act.click(checkout.submit, expect_api="/api/payment")
+    return checkout.page
+
+
+async def verify_order(page, order_id):
+    """``GET /api/payment/verify/:orderId`` as the signed-in user; the JSON body."""
+    token = await page.evaluate("() => localStorage.getItem('token')")
+    response = await page.context.request.get(
+        f"{config.API_URL}/api/payment/verify/{order_id}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return await response.json()
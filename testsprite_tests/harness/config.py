@@ -0,0 +1,53 @@
+"""Shared settings for the TestSprite harness.
+
+Every value can be overridden through an environment variable so the same
+scripts run unchanged against a local stack, CI or a preview deployment.
+"""
+
+import os
+from pathlib import Path
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+RUNS_DIR = TESTS_DIR / "tmp" / "runs"
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:5173")
+API_URL = os.environ.get("TESTSPRITE_API_URL", "http://localhost:5000")
+
+# Database behind ``API_URL``; harness.factories writes test data straight into it.
+MONGO_URI = os.environ.get("TESTSPRITE_MONGO_URI", "mongodb://localhost:27017/fooddelivery")
+
+# The API origin compiled into the client (``VITE_API_BASE_URL``). When
+# ``API_URL`` differs, test contexts reroute the client's calls to ``API_URL``.
+CLIENT_API_URL = os.environ.get("TESTSPRITE_CLIENT_API_URL", "http://localhost:5000")
+
+# Test contexts skip images, media, web fonts, analytics and the Vite HMR
+# socket unless a script sets ``LEAN_PAGES = False`` (see harness.browser).
+LEAN_PAGES = not _env_flag("TESTSPRITE_FULL_PAGES")
+
+# Replace the screenshot baselines harness.visual compares against.
+UPDATE_BASELINES = _env_flag("TESTSPRITE_UPDATE_BASELINES")
+
+# Upper bound for a single action: locator lookup, actionability and the
+# action itself. Matches the ``timeout=5000`` the generated scripts used.
+STEP_TIMEOUT_MS = _env_int("TESTSPRITE_STEP_TIMEOUT_MS", 5000)
+
+# Upper bound for waiting on the effects of an action (API calls it fired,
+# DOM updates). Never longer than the fixed sleep it replaces.
+SETTLE_TIMEOUT_MS = _env_int("TESTSPRITE_SETTLE_TIMEOUT_MS", 3000)
+
+# How long the DOM must stay unchanged before a step counts as settled.
+DOM_QUIET_MS = _env_int("TESTSPRITE_DOM_QUIET_MS", 150)
+
+# Reproduce the original fixed sleeps, used for before/after comparisons.
+LEGACY_WAITS = _env_flag("TESTSPRITE_LEGACY_WAITS")
+LEGACY_WAIT_MS = 3000
@@ -0,0 +1,358 @@
+"""Test data written straight to MongoDB.
+
+Setting up a scenario through the UI (register a user, open a restaurant,
+add items, check out) costs a test dozens of steps before it reaches what it
+checks. :class:`Factory` inserts the same documents directly, in the shapes
+``server/models/*.js`` give them, so the server reads them exactly as if
+they had been created through the API::
+
+    with Factory() as data:
+        user = data.user()
+        restaurant = data.restaurant()
+        burger, fries = data.menu_items(restaurant, 2)
+        data.order(user, restaurant, [(burger, 2), (fries, 1)], status="confirmed")
+        await sign_in(context, user["email"], data.password)
+        ...
+
+Everything a factory creates carries its namespace (``tsf3fa9c1e2``) in the
+name, email or code, so parallel tests never collide on unique indexes. The
+factory remembers what it inserted and removes it with one ``delete_many``
+per collection on exit; :func:`sweep` clears what crashed runs left behind.
+
+Passwords are stored pre-hashed. Every user gets :data:`PASSWORD`, whose
+bcrypt hash (cost 10, like ``User.js``) is computed once and kept here, so
+creating a thousand users costs no hashing at all.
+
+Requires ``pymongo``. The database is ``config.MONGO_URI``, which
+``--hermetic`` points at the worker's own database.
+"""
+
+import itertools
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+from . import config
+
+PREFIX = "tsf"
+
+# Meets the client's password rules (8+ characters, upper, lower, digit).
+PASSWORD = "Password123"
+PASSWORD_HASH = "$2a$10$kOf7/iAsqTaHDBE2OwkjPuQ2F3yX2FfnNfe71o5AuUPMBbsXMxlVu"
+
+# Mongoose's default collection names for the models.
+USERS = "users"
+RESTAURANTS = "restaurants"
+MENU_ITEMS = "menuitems"
+CARTS = "carts"
+PROMO_CODES = "promocodes"
+ORDERS = "orders"
+
+IMAGE = "https://images.unsplash.com/photo-1517248135467-4c7edcad34c4"
+
+
+@lru_cache(maxsize=None)
+def _client(uri):
+    return MongoClient(uri, serverSelectionTimeoutMS=5000, tz_aware=True)
+
+
+def database(uri=None):
+    """The database named in ``uri`` (default ``config.MONGO_URI``)."""
+    client = _client(uri or config.MONGO_URI)
+    return client.get_default_database()
+
+
+def _now():
+    # Mongo stores milliseconds; truncate so documents compare equal after a read.
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def _line_items(items):
+    """``[(menu_item, quantity), ...]`` or ``[menu_item, ...]`` as pairs."""
+    return [item if isinstance(item, tuple) else (item, 1) for item in items]
+
+
+class Factory:
+    """Inserts documents for one test and deletes them again on :meth:`teardown`."""
+
+    password = PASSWORD
+
+    def __init__(self, namespace=None, *, uri=None):
+        self.namespace = namespace or f"{PREFIX}{uuid.uuid4().hex[:8]}"
+        self.db = database(uri)
+        self._serial = itertools.count(1)
+        self._created = defaultdict(list)
+        self._restaurants = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.teardown()
+
+    def _insert(self, collection, documents):
+        if documents:
+            self.db[collection].insert_many(documents, ordered=False)
+            self._created[collection].extend(doc["_id"] for doc in documents)
+        return documents
+
+    def _name(self, kind):
+        return f"{self.namespace} {kind} {next(self._serial)}"
+
+    # -- Builders ----------------------------------------------------------------
+    # Each returns the document it would insert; ``overrides`` replace fields.
+
+    def build_user(self, **overrides):
+        now = _now()
+        serial = next(self._serial)
+        return {
+            "_id": ObjectId(),
+            "name": f"{self.namespace} User {serial}",
+            "email": f"{self.namespace}-user{serial}@example.com",
+            "password": PASSWORD_HASH,
+            "phone": "",
+            "role": "user",
+            "address": {"country": "", "restaurantId": None},
+            "isActive": True,
+            "isEmailVerified": True,
+            "accountLocked": False,
+            "loginAttempts": 0,
+            # Before any token the test will be issued.
+            "passwordChangedAt": now - timedelta(seconds=1),
+            "createdAt": now,
+            "updatedAt": now,
+            "__v": 0,
+            **overrides,
+        }
+
+    def build_restaurant(self, **overrides):
+        now = _now()
+        return {
+            "_id": ObjectId(),
+            "name": self._name("Restaurant"),
+            "cuisine": "Ethiopian",
+            "rating": 4.5,
+            "deliveryTime": 30,
+            "menuItems": [],
+            "image": IMAGE,
+            "isOpen": True,
+            "isPopular": False,
+            "location": "Bole, Addis Ababa",
+            "country": "Ethiopia",
+            "createdAt": now,
+            "updatedAt": now,
+            "__v": 0,
+            **overrides,
+        }
+
+    def build_menu_item(self, restaurant, **overrides):
+        now = _now()
+        return {
+            "_id": ObjectId(),
+            "name": self._name("Dish"),
+            "description": "Made by the test data factory",
+            "price": 120,
+            "image": IMAGE,
+            # MenuItem.restaurant holds the restaurant's name, not its id.
+            "restaurant": restaurant["name"],
+            "category": "Main Course",
+            "tags": [],
+            "isAvailable": True,
+            "options": [],
+            "deliveryOptions": [],
+            "popularFilters": [],
+            "createdAt": now,
+            "updatedAt": now,
+            "__v": 0,
+            **overrides,
+        }
+
+    def build_promo_code(self, **overrides):
+        now = _now()
+        document = {
+            "_id": ObjectId(),
+            "code": f"{self.namespace}{next(self._serial)}".upper()[:20],
+            "description": f"Test promo code for {self.namespace}",
+            "discountType": "percentage",
+            "discountValue": 10,
+            "minOrderAmount": 0,
+            "maxDiscount": 50,
+            "startDate": now - timedelta(days=1),
+            "endDate": now + timedelta(days=30),
+            "isActive": True,
+            "usageLimit": 100,
+            "usedCount": 0,
+            "applicableCategories": ["all"],
+            "applicableRestaurants": [],
+            "createdAt": now,
+            "updatedAt": now,
+            "__v": 0,
+        }
+        document.update(overrides)
+        if document["discountType"] == "fixed" and "maxDiscount" not in overrides:
+            del document["maxDiscount"]
+        return document
+
+    def build_cart(self, user, items, **overrides):
+        now = _now()
+        lines = []
+        restaurants = {}
+        for menu_item, quantity in _line_items(items):
+            restaurant = self._restaurant_of(menu_item)
+            restaurants[restaurant["_id"]] = restaurant
+            lines.append(
+                {
+                    "_id": ObjectId(),
+                    "menuItemId": menu_item["_id"],
+                    "name": menu_item["name"],
+                    "quantity": quantity,
+                    "price": menu_item["price"],
+                    "restaurant": restaurant["_id"],
+                    "restaurantName": restaurant["name"],
+                }
+            )
+        return {
+            "_id": ObjectId(),
+            # Cart.userId is a string, unlike Order.userId.
+            "userId": str(user["_id"]),
+            "items": lines,
+            "restaurants": list(restaurants),
+            "totalPrice": sum(line["price"] * line["quantity"] for line in lines),
+            "createdAt": now,
+            "updatedAt": now,
+            "__v": 0,
+            **overrides,
+        }
+
+    def build_order(self, user, restaurant, items, **overrides):
+        now = _now()
+        lines = [
+            {
+                "_id": ObjectId(),
+                "menuItemId": menu_item["_id"],
+                "name": menu_item["name"],
+                "quantity": quantity,
+                "price": menu_item["price"],
+            }
+            for menu_item, quantity in _line_items(items)
+        ]
+        return {
+            "_id": ObjectId(),
+            "userId": user["_id"],
+            "restaurantId": restaurant["_id"],
+            "items": lines,
+            "totalPrice": sum(line["price"] * line["quantity"] for line in lines),
+            "paymentStatus": "pending",
+            "deliveryStatus": "pending",
+            "paymentMethod": "cash_on_delivery",
+            "deliveryAddress": "Bole Road, Addis Ababa",
+            "specialInstructions": "",
+            "paymentHistory": [],
+            "status": "pending",
+            "createdAt": now,
+            "updatedAt": now,
+            "__v": 0,
+            **overrides,
+        }
+
+    def _restaurant_of(self, menu_item):
+        name = menu_item["restaurant"]
+        if name not in self._restaurants:
+            restaurant = self.db[RESTAURANTS].find_one({"name": name})
+            if restaurant is None:
+                raise LookupError(f"no restaurant named {name!r}")
+            self._restaurants[name] = restaurant
+        return self._restaurants[name]
+
+    # -- Inserting ---------------------------------------------------------------
+
+    def users(self, count, **overrides):
+        return self._insert(USERS, [self.build_user(**overrides) for _ in range(count)])
+
+    def user(self, **overrides):
+        return self.users(1, **overrides)[0]
+
+    def restaurants(self, count, **overrides):
+        created = self._insert(
+            RESTAURANTS, [self.build_restaurant(**overrides) for _ in range(count)]
+        )
+        self._restaurants.update((restaurant["name"], restaurant) for restaurant in created)
+        return created
+
+    def restaurant(self, **overrides):
+        return self.restaurants(1, **overrides)[0]
+
+    def menu_items(self, restaurant, count, **overrides):
+        return self._insert(
+            MENU_ITEMS,
+            [self.build_menu_item(restaurant, **overrides) for _ in range(count)],
+        )
+
+    def menu_item(self, restaurant, **overrides):
+        return self.menu_items(restaurant, 1, **overrides)[0]
+
+    def promo_codes(self, count, **overrides):
+        return self._insert(
+            PROMO_CODES, [self.build_promo_code(**overrides) for _ in range(count)]
+        )
+
+    def promo_code(self, **overrides):
+        return self.promo_codes(1, **overrides)[0]
+
+    def cart(self, user, items, **overrides):
+        """The user's server-side cart; ``items`` as for :meth:`order`."""
+        return self._insert(CARTS, [self.build_cart(user, items, **overrides)])[0]
+
+    def orders(self, user, restaurant, items, count, **overrides):
+        return self._insert(
+            ORDERS,
+            [self.build_order(user, restaurant, items, **overrides) for _ in range(count)],
+        )
+
+    def order(self, user, restaurant, items, **overrides):
+        """One order; ``items`` is ``[(menu_item, quantity), ...]`` or bare menu items."""
+        return self.orders(user, restaurant, items, 1, **overrides)[0]
+
+    # -- Teardown ----------------------------------------------------------------
+
+    def teardown(self):
+        """Delete everything this factory inserted, one round trip per collection.
+
+        Orders and carts the server created for the factory's users during
+        the test go as well.
+        """
+        users = self._created.get(USERS, [])
+        if users:
+            self.db[ORDERS].delete_many({"userId": {"$in": users}})
+            self.db[CARTS].delete_many({"userId": {"$in": [str(user) for user in users]}})
+        for collection, ids in self._created.items():
+            self.db[collection].delete_many({"_id": {"$in": ids}})
+        self._created.clear()
+
+
+def sweep(uri=None, prefix=PREFIX):
+    """Delete every factory document in the database, e.g. after a crashed run.
+
+    Returns the number of documents removed per collection.
+    """
+    db = database(uri)
+    pattern = {"$regex": f"^{prefix}[0-9a-f]{{8}}", "$options": "i"}
+    restaurants = [r["name"] for r in db[RESTAURANTS].find({"name": pattern}, {"name": 1})]
+    users = [u["_id"] for u in db[USERS].find({"email": pattern}, {"_id": 1})]
+    filters = {
+        ORDERS: {"userId": {"$in": users}},
+        CARTS: {"userId": {"$in": [str(user) for user in users]}},
+        MENU_ITEMS: {"restaurant": {"$in": restaurants}},
+        PROMO_CODES: {"code": pattern},
+        RESTAURANTS: {"name": pattern},
+        USERS: {"email": pattern},
+    }
+    return {
+        collection: db[collection].delete_many(query).deleted_count
+        for collection, query in filters.items()
+    }
@@ -0,0 +1,336 @@
+"""Every run's results, kept in SQLite, and a check for tests that got slower.
+
+``tmp/test_results.json`` and ``tmp/runs/last_results.json`` only hold the
+latest outcome. :func:`record_run` appends each pass of
+``python -m harness.run`` to ``tmp/runs/history.sqlite`` instead: one row
+per run with the environment it ran in (git commit, host, URLs, workers,
+waits), one row per test with its status and duration, and one row per step
+(``act.fill``/``act.click``/``act.goto`` in browser tests, API calls in
+``--backend`` cases).
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.history                   # latest runs
+    python -m harness.history regressions       # recent medians vs the runs before
+    python -m harness.history regressions -n 20 --threshold 0.5 --steps
+
+A test regresses when the median duration of its last ``--recent`` passing
+runs exceeds the median of the ``-n`` passing runs before those by more
+than ``--threshold`` (a fraction) and by at least ``--min-seconds``. Only
+runs of the same kind (browser, legacy sleeps, backend) are compared. The
+command exits with 1 when anything regressed, so CI can fail on it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import sqlite3
+import subprocess
+import sys
+from collections import defaultdict
+from contextlib import closing
+from datetime import datetime, timezone
+from statistics import median
+
+from . import config
+
+DB_PATH = config.RUNS_DIR / "history.sqlite"
+
+KINDS = ("browser", "legacy", "backend")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    wall_seconds REAL NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    host TEXT,
+    env TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    error TEXT,
+    PRIMARY KEY (run_id, test)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    ms REAL,
+    error TEXT,
+    PRIMARY KEY (run_id, test, step)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test, run_id);
+CREATE INDEX IF NOT EXISTS runs_by_kind ON runs (kind, id);
+"""
+
+
+def connect(path=None):
+    path = path or DB_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _git(*args):
+    try:
+        out = subprocess.run(
+            ["git", *args],
+            cwd=config.TESTS_DIR,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def environment(args=None):
+    """What a run's timings depend on, besides the code under test."""
+    env = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "baseUrl": config.BASE_URL,
+        "apiUrl": config.API_URL,
+        "branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+    }
+    if args is not None:
+        env.update(
+            workers=args.workers,
+            browsers=args.browsers,
+            processes=args.processes,
+            hermetic=args.hermetic,
+            leanPages=args.lean_pages,
+            prefixes=args.prefixes,
+            changed=args.changed,
+        )
+    return env
+
+
+def record_run(results, wall_seconds, *, kind="browser", args=None, path=None):
+    """Append one pass of the runner; returns the new run's id.
+
+    ``results`` maps test names to the runner's result dicts. Their optional
+    ``steps`` list holds ``{"step", "kind", "target", "ms", "error"}``.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown run kind {kind!r}; expected one of {KINDS}")
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    with closing(connect(path)) as db, db:
+        run_id = db.execute(
+            "INSERT INTO runs (finished, kind, wall_seconds, git_commit, git_dirty, host, env)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                kind,
+                wall_seconds,
+                _git("rev-parse", "HEAD"),
+                None if status is None else int(bool(status)),
+                socket.gethostname(),
+                json.dumps(environment(args), sort_keys=True),
+            ),
+        ).lastrowid
+        db.executemany(
+            "INSERT INTO results (run_id, test, status, seconds, error) VALUES (?, ?, ?, ?, ?)",
+            [
+                (run_id, test, r["status"], r["seconds"], r.get("error") or None)
+                for test, r in results.items()
+            ],
+        )
+        db.executemany(
+            "INSERT INTO steps (run_id, test, step, kind, target, ms, error)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, test, s["step"], s["kind"], s["target"], s["ms"], s.get("error"))
+                for test, r in results.items()
+                for s in r.get("steps", ())
+            ],
+        )
+    return run_id
+
+
+def _passing_runs(db, kind, limit, table, key):
+    """``{key: [(run_id, seconds), ...]}`` newest first, passing tests only.
+
+    Each test (or step) gets its own last ``limit`` passing samples, however
+    many runs of other tests, partial runs or failures came in between. Step
+    rows count when the test they belong to passed.
+    """
+    if table == "results":
+        query = """
+            SELECT run_id, test, seconds FROM (
+                SELECT r.run_id, r.test, r.seconds, ROW_NUMBER() OVER (
+                    PARTITION BY r.test ORDER BY r.run_id DESC
+                ) AS n
+                FROM results r JOIN runs ON runs.id = r.run_id
+                WHERE runs.kind = ? AND r.status = 'passed'
+            ) WHERE n <= ?
+        """
+    else:
+        query = """
+            SELECT run_id, test, step, kind, target, seconds FROM (
+                SELECT s.run_id, s.test, s.step, s.kind, s.target, s.ms / 1000.0 AS seconds,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY s.test, s.step, s.kind, s.target ORDER BY s.run_id DESC
+                    ) AS n
+                FROM steps s
+                JOIN results r ON r.run_id = s.run_id AND r.test = s.test
+                JOIN runs ON runs.id = s.run_id
+                WHERE runs.kind = ? AND r.status = 'passed' AND s.ms IS NOT NULL
+            ) WHERE n <= ?
+        """
+    samples = defaultdict(list)
+    for row in db.execute(f"{query} ORDER BY run_id DESC", (kind, limit)):
+        samples[key(row)].append((row["run_id"], row["seconds"]))
+    return samples
+
+
+def regressions(
+    *,
+    kind="browser",
+    baseline=10,
+    recent=3,
+    threshold=0.2,
+    min_seconds=0.25,
+    steps=False,
+    path=None,
+):
+    """Tests (or steps) whose recent median is slower than their baseline median.
+
+    Returns dicts sorted by the slowdown in seconds, largest first.
+    """
+    if steps:
+        table = "steps"
+
+        def key(row):
+            return (row["test"], row["step"], f"{row['kind']} {row['target']}")
+    else:
+        table = "results"
+
+        def key(row):
+            return (row["test"],)
+
+    with closing(connect(path)) as db:
+        samples = _passing_runs(db, kind, baseline + recent, table, key)
+    found = []
+    for name, values in samples.items():
+        seconds = [s for _, s in values]
+        now, before = seconds[:recent], seconds[recent:]
+        # A handful of samples cannot tell a slowdown from noise.
+        if len(now) < recent or len(before) < max(3, baseline // 2):
+            continue
+        now_median, before_median = median(now), median(before)
+        slower = now_median - before_median
+        if slower >= min_seconds and now_median > before_median * (1 + threshold):
+            found.append(
+                {
+                    "name": name,
+                    "recentSeconds": round(now_median, 3),
+                    "baselineSeconds": round(before_median, 3),
+                    "slowerSeconds": round(slower, 3),
+                    "ratio": round(now_median / before_median, 2) if before_median else None,
+                    "samples": len(seconds),
+                }
+            )
+    return sorted(found, key=lambda r: r["slowerSeconds"], reverse=True)
+
+
+def latest_runs(limit=10, path=None):
+    with closing(connect(path)) as db:
+        return [
+            dict(row)
+            for row in db.execute(
+                "SELECT runs.id, finished, kind, wall_seconds, git_commit, git_dirty,"
+                " COUNT(results.test) AS tests,"
+                " SUM(results.status = 'passed') AS passed"
+                " FROM runs LEFT JOIN results ON results.run_id = runs.id"
+                " GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?",
+                (limit,),
+            )
+        ]
+
+
+def _print_runs(args):
+    runs = latest_runs(args.limit)
+    if not runs:
+        print(f"No runs recorded in {DB_PATH}.")
+        return 0
+    for run in runs:
+        commit = (run["git_commit"] or "unknown")[:10] + ("+" if run["git_dirty"] else "")
+        print(
+            f"#{run['id']:<5} {run['finished']}  {run['kind']:<8} {commit:<12}"
+            f" {run['passed'] or 0}/{run['tests']} passed  {run['wall_seconds']:8.1f}s"
+        )
+    return 0
+
+
+def _print_regressions(args):
+    found = regressions(
+        kind=args.kind,
+        baseline=args.runs,
+        recent=args.recent,
+        threshold=args.threshold,
+        min_seconds=args.min_seconds,
+        steps=args.steps,
+    )
+    scope = "steps" if args.steps else "tests"
+    if not found:
+        print(
+            f"No {scope} regressed more than {args.threshold:.0%} "
+            f"over the last {args.recent} {args.kind} runs."
+        )
+        return 0
+    print(
+        f"{len(found)} {scope} regressed: median of the last {args.recent} {args.kind} runs "
+        f"vs the {args.runs} before"
+    )
+    for r in found:
+        print(
+            f"  {r['baselineSeconds']:8.2f}s -> {r['recentSeconds']:8.2f}s "
+            f"(+{r['slowerSeconds']:.2f}s, x{r['ratio']})  {' '.join(map(str, r['name']))}"
+        )
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    runs = commands.add_parser("runs", help="list the latest runs (default)")
+    runs.add_argument("-l", "--limit", type=int, default=10, help="runs to list")
+    check = commands.add_parser("regressions", help="flag tests whose median duration grew")
+    check.add_argument(
+        "-n", "--runs", type=int, default=10, help="baseline: passing runs before the recent ones"
+    )
+    check.add_argument("--recent", type=int, default=3, help="latest runs whose median is checked")
+    check.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown as a fraction (0.2 = 20%%)"
+    )
+    check.add_argument(
+        "--min-seconds", type=float, default=0.25, help="ignore slowdowns smaller than this"
+    )
+    check.add_argument("--kind", choices=KINDS, default="browser", help="which runs to compare")
+    check.add_argument("--steps", action="store_true", help="compare individual steps instead")
+    args = parser.parse_args(argv)
+    if args.command == "regressions":
+        return _print_regressions(args)
+    if args.command is None:
+        args.limit = 10
+    return _print_runs(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
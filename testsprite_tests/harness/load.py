@@ -0,0 +1,370 @@
+"""HTTP load generation for the Express API.
+
+Replays weighted scenarios, one per entry in
+``testsprite_backend_test_plan.json``, against the API with a configurable
+number of concurrent virtual users, then reports throughput and
+p50/p95/p99 latency per route.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.load                          # all scenarios, 20 users, 60 s
+    python -m harness.load -c 100 -d 300            # 100 users for five minutes
+    python -m harness.load -s TC002 -s TC008        # restaurants and search only
+    python -m harness.load --weight TC002=10        # skew the mix
+
+Requires ``pip install httpx``. ``apiLimiter`` allows 200 requests per 15
+minutes per client, so start the server with ``TRUSTED_IPS`` covering the
+load generator's address; 429 responses are counted separately per route.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import httpx
+
+from . import config
+from .auth import ROLES
+
+PLAN_PATH = config.TESTS_DIR / "testsprite_backend_test_plan.json"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class RouteStats:
+    latencies_ms: list = field(default_factory=list)
+    errors: int = 0
+    throttled: int = 0
+
+    def summary(self, elapsed):
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "meanMs": round(sum(values) / count, 2) if count else 0.0,
+            "p50Ms": round(percentile(values, 50), 2),
+            "p95Ms": round(percentile(values, 95), 2),
+            "p99Ms": round(percentile(values, 99), 2),
+        }
+
+
+class LoadClient:
+    """Thin wrapper over a pooled ``httpx.AsyncClient`` that records timings.
+
+    Requests are recorded under their route template (``/api/restaurants/:id``)
+    so that every concrete ID rolls up into one row of the report.
+    """
+
+    def __init__(self, client, *, rotate_agents=False):
+        self.client = client
+        self.rotate_agents = rotate_agents
+        self.stats = defaultdict(RouteStats)
+
+    async def call(self, method, route, *, path=None, token=None, expect=(200,), **kwargs):
+        url = route.format(**path) if path else route
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if self.rotate_agents:
+            # A new rate-limit key (IP + User-Agent) for every request.
+            headers["User-Agent"] = f"testsprite-load/{uuid.uuid4().hex}"
+        key = f"{method} {route.replace('{', ':').replace('}', '')}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats[key].errors += 1
+            return None
+        stats = self.stats[key]
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        if response.status_code == 429:
+            stats.throttled += 1
+        elif response.status_code not in expect:
+            stats.errors += 1
+        return response
+
+
+@dataclass
+class Fixtures:
+    """IDs and tokens discovered once before the load starts."""
+
+    tokens: dict = field(default_factory=dict)
+    users: dict = field(default_factory=dict)
+    restaurant_ids: list = field(default_factory=list)
+    menu_items: list = field(default_factory=list)
+    cuisines: list = field(default_factory=list)
+
+
+async def sign_in(client, role):
+    creds = ROLES[role]
+    body = {"email": creds.email, "password": creds.password}
+    response = await client.post("/api/users/login", json=body)
+    if response.status_code == 401 and creds.role != "admin":
+        await client.post(
+            "/api/users/register", json={**body, "name": creds.name, "role": creds.role}
+        )
+        response = await client.post("/api/users/login", json=body)
+    response.raise_for_status()
+    data = response.json()
+    return data["token"], data["user"]
+
+
+async def load_fixtures(client):
+    fixtures = Fixtures()
+    for role in ROLES:
+        try:
+            fixtures.tokens[role], fixtures.users[role] = await sign_in(client, role)
+        except httpx.HTTPError as exc:
+            print(f"warning: cannot sign in as {role}: {exc}", file=sys.stderr)
+
+    restaurants = (await client.get("/api/restaurants", params={"limit": 100})).json()
+    fixtures.restaurant_ids = [r["_id"] for r in restaurants.get("data", [])]
+    fixtures.menu_items = (await client.get("/api/menu-items")).json()[:500]
+    fixtures.cuisines = (await client.get("/api/restaurants/cuisines")).json()
+    return fixtures
+
+
+SCENARIOS = {}
+
+
+def scenario(plan_id, weight=1):
+    def register(fn):
+        SCENARIOS[plan_id] = {"run": fn, "weight": weight}
+        return fn
+
+    return register
+
+
+@scenario("TC001", weight=2)
+async def user_registration_and_login(api, fx):
+    creds = ROLES["customer"]
+    await api.call(
+        "POST",
+        "/api/users/login",
+        json={"email": creds.email, "password": creds.password},
+    )
+    await api.call("GET", "/api/users/me", token=fx.tokens.get("customer"))
+    if random.random() < 0.1:
+        email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        await api.call(
+            "POST",
+            "/api/users/register",
+            json={"name": "Load Test", "email": email, "password": "LoadTest@123"},
+            expect=(201,),
+        )
+
+
+@scenario("TC002", weight=10)
+async def restaurant_browsing(api, fx):
+    # Browse one to three pages, following the cursors like the client would.
+    params = {}
+    for _ in range(random.randint(1, 3)):
+        response = await api.call("GET", "/api/restaurants", params=params)
+        cursor = response.json()["pagination"].get("nextCursor") if response and response.is_success else None
+        if not cursor:
+            break
+        params = {"cursor": cursor}
+    await api.call("GET", "/api/restaurants/popular")
+    await api.call("GET", "/api/restaurants/cuisines")
+    await api.call("GET", "/api/restaurants/open")
+    if fx.restaurant_ids:
+        restaurant_id = random.choice(fx.restaurant_ids)
+        await api.call("GET", "/api/restaurants/{id}", path={"id": restaurant_id})
+
+
+@scenario("TC003", weight=8)
+async def menu_items(api, fx):
+    if fx.restaurant_ids:
+        await api.call(
+            "GET",
+            "/api/menu-items/restaurant/{id}",
+            path={"id": random.choice(fx.restaurant_ids)},
+        )
+    if fx.menu_items:
+        await api.call(
+            "GET", "/api/menu-items/{id}", path={"id": random.choice(fx.menu_items)["_id"]}
+        )
+
+
+@scenario("TC004", weight=5)
+async def shopping_cart(api, fx):
+    user = fx.users.get("customer")
+    if not user or not fx.menu_items:
+        return
+    item = random.choice(fx.menu_items)
+    await api.call(
+        "POST",
+        "/api/cart",
+        json={
+            "userId": user["_id"],
+            "restaurantId": item.get("restaurant"),
+            "items": [
+                {
+                    "menuItemId": item["_id"],
+                    "name": item.get("name"),
+                    "price": item.get("price") or 0,
+                    "quantity": random.randint(1, 3),
+                    "restaurant": item.get("restaurant"),
+                }
+            ],
+        },
+        expect=(201,),
+    )
+    await api.call(
+        "GET", "/api/cart/user/{id}", path={"id": user["_id"]}, expect=(200, 404)
+    )
+
+
+@scenario("TC005", weight=4)
+async def order_history(api, fx):
+    await api.call("GET", "/api/orders", token=fx.tokens.get("customer"))
+
+
+@scenario("TC006", weight=2)
+async def payment_status(api, fx):
+    await api.call("GET", "/api/payment")
+    response = await api.call("GET", "/api/orders", token=fx.tokens.get("customer"))
+    orders = response.json() if response is not None and response.is_success else []
+    if orders:
+        await api.call(
+            "GET",
+            "/api/payment/status/{id}",
+            path={"id": random.choice(orders)["_id"]},
+            expect=(200, 404),
+        )
+
+
+@scenario("TC007", weight=2)
+async def admin_dashboard(api, fx):
+    token = fx.tokens.get("admin")
+    await api.call("GET", "/api/admin/users", token=token)
+    await api.call("GET", "/api/admin/orders", token=token)
+    await api.call("GET", "/api/admin/analytics", token=token)
+
+
+@scenario("TC008", weight=8)
+async def search_and_filter(api, fx):
+    term = random.choice(fx.cuisines or ["pizza"])
+    await api.call("GET", "/api/restaurants", params={"search": term})
+    await api.call("GET", "/api/restaurants/search/by-address", params={"address": term})
+
+
+@scenario("TC009", weight=3)
+async def promo_codes(api, fx):
+    await api.call("GET", "/api/promo-codes/active")
+
+
+@scenario("TC010", weight=2)
+async def security_middleware(api, fx):
+    await api.call("GET", "/api/users/me", expect=(401,))
+    await api.call("GET", "/api/users/me", token="not-a-jwt", expect=(401,))
+    await api.call("GET", "/api/admin/users", token=fx.tokens.get("customer"), expect=(403,))
+
+
+async def virtual_user(api, fx, mix, deadline):
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        await SCENARIOS[random.choices(names, weights)[0]]["run"](api, fx)
+        # Scenarios that find no fixtures return without awaiting I/O.
+        await asyncio.sleep(0)
+
+
+async def run_load(mix, *, concurrency, duration):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=config.API_URL, limits=limits, timeout=30
+    ) as client:
+        fixtures = await load_fixtures(client)
+        api = LoadClient(client)
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(
+            *(virtual_user(api, fixtures, mix, deadline) for _ in range(concurrency))
+        )
+        elapsed = time.monotonic() - started
+    return {route: stats.summary(elapsed) for route, stats in sorted(api.stats.items())}
+
+
+def print_table(routes):
+    header = f"{'route':<48} {'req':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5} {'429':>5}"
+    print(header)
+    print("-" * len(header))
+    for route, s in routes.items():
+        print(
+            f"{route:<48} {s['requests']:>7} {s['rps']:>8.1f} {s['p50Ms']:>8.1f} "
+            f"{s['p95Ms']:>8.1f} {s['p99Ms']:>8.1f} {s['errors']:>5} {s['throttled']:>5}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("-d", "--duration", type=float, default=60, help="seconds of load")
+    parser.add_argument(
+        "-s", "--scenario", action="append", default=[], help="plan IDs to include"
+    )
+    parser.add_argument(
+        "--weight", action="append", default=[], metavar="ID=N", help="override a weight"
+    )
+    args = parser.parse_args(argv)
+
+    plan = {entry["id"]: entry["title"] for entry in json.loads(PLAN_PATH.read_text())}
+    mix = {pid: SCENARIOS[pid]["weight"] for pid in plan if pid in SCENARIOS}
+    if args.scenario:
+        mix = {pid: w for pid, w in mix.items() if pid in args.scenario}
+    for override in args.weight:
+        pid, _, weight = override.partition("=")
+        if pid not in SCENARIOS or pid not in plan:
+            parser.error(f"--weight {override}: unknown scenario {pid!r}")
+        try:
+            mix[pid] = int(weight)
+        except ValueError:
+            parser.error(f"--weight {override}: weight must be an integer")
+        if mix[pid] < 0:
+            parser.error(f"--weight {override}: weight must not be negative")
+    mix = {pid: w for pid, w in mix.items() if w > 0}
+    if not mix:
+        parser.error("no scenarios selected")
+
+    routes = asyncio.run(
+        run_load(mix, concurrency=args.concurrency, duration=args.duration)
+    )
+    print_table(routes)
+
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = config.RUNS_DIR / f"load_{stamp}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "created": stamp,
+                "target": config.API_URL,
+                "concurrency": args.concurrency,
+                "durationSeconds": args.duration,
+                "mix": {pid: {"title": plan[pid], "weight": w} for pid, w in mix.items()},
+                "routes": routes,
+            },
+            indent=2,
+        )
+    )
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Page objects for the client's screens.
+
+TestSprite recorded every step against an absolute XPath such as
+``html/body/div/main/div/div[2]/div[2]/div/div/div[2]/a``, so adding one
+wrapper ``div`` to a component broke every script that went near it. The
+classes here name what a step is after instead ("the first restaurant's
+Order Now link", "the Email Address field") and find it by role, label or
+``data-testid``, the way a user or a screen reader would.
+
+A locator is built once per page state: each page object caches the
+locators it hands out and drops them when the page's URL changes. Repeated
+steps on the same screen, such as clicking "Add to Cart" five times, reuse
+one locator, and Playwright resolves it against the live DOM only when a
+step acts on it.
+
+Usage::
+
+    nav = Navbar(page)
+    login = LoginPage(page)
+    await act.click(nav.login_link)
+    await act.fill(login.email, "user@example.com")
+"""
+
+import functools
+import re
+
+from . import config
+
+
+def locator(build):
+    """Property returning ``build(self)``, built once per page state."""
+
+    @functools.wraps(build)
+    def get(self):
+        return self._cached(build.__name__, lambda: build(self))
+
+    return property(get)
+
+
+class PageObject:
+    """Base class; ``path`` is where :meth:`open` navigates to."""
+
+    path = None
+
+    def __init__(self, page):
+        self.page = page
+        self._state = None
+        self._locators = {}
+
+    @property
+    def url(self):
+        return f"{config.BASE_URL}{self.path}"
+
+    async def open(self, act):
+        await act.goto(self.page, self.url)
+        return self
+
+    def _cached(self, key, build):
+        if self.page.url != self._state:
+            self._state = self.page.url
+            self._locators.clear()
+        if key not in self._locators:
+            self._locators[key] = build()
+        return self._locators[key]
+
+
+class Navbar(PageObject):
+    """``components/RoleBasedNavbar.jsx`` and ``components/Footer.jsx``."""
+
+    def _nav_link(self, name):
+        return self.page.get_by_role("navigation").get_by_role("link", name=name, exact=True)
+
+    @locator
+    def home_link(self):
+        return self._nav_link("Home").first
+
+    @locator
+    def restaurants_link(self):
+        return self._nav_link("Restaurants").first
+
+    @locator
+    def login_link(self):
+        return self._nav_link("Login").first
+
+    @locator
+    def signup_link(self):
+        return self._nav_link("Sign Up").first
+
+    @locator
+    def cart_link(self):
+        return self.page.get_by_role("link", name="Cart", exact=True)
+
+    @locator
+    def account_menu(self):
+        return self.page.get_by_role("button", name="Account menu")
+
+    @locator
+    def logout(self):
+        """"Logout" in the account menu; open :attr:`account_menu` first."""
+        return self.page.get_by_role("button", name="Logout", exact=True).first
+
+    @locator
+    def profile_link(self):
+        return self._nav_link("Profile").first
+
+    @locator
+    def orders_link(self):
+        return self._nav_link("My Orders").first
+
+    @locator
+    def footer_order_link(self):
+        return self.page.get_by_role("contentinfo").get_by_role("link", name="Order", exact=True)
+
+
+class _AuthForm(PageObject):
+    """``pages/auth/AuthPage.jsx``, which renders both sign-in and sign-up.
+
+    The page keeps its mode when the router moves between ``/login`` and
+    ``/signup``, so the fields are found by label rather than by position.
+    """
+
+    @locator
+    def form(self):
+        return self.page.locator("form")
+
+    @locator
+    def email(self):
+        return self.page.get_by_label("Email Address")
+
+    @locator
+    def password(self):
+        return self.page.get_by_label("Password", exact=True)
+
+    @locator
+    def submit(self):
+        return self.form.get_by_role("button")
+
+    @locator
+    def errors(self):
+        return self.form.get_by_role("alert")
+
+    @locator
+    def sign_in_tab(self):
+        return self.page.get_by_role("button", name="Sign In", exact=True).first
+
+    @locator
+    def create_account_tab(self):
+        return self.page.get_by_role("button", name="Create Account", exact=True).first
+
+    @locator
+    def switch_mode(self):
+        """The "Create one" / "Sign in" button under the form."""
+        return self.page.get_by_role("button", name=re.compile(r"^(Create one|Sign in)$"))
+
+
+class LoginPage(_AuthForm):
+    path = "/login"
+
+    @locator
+    def forgot_password(self):
+        return self.page.get_by_role("link", name="Forgot password?")
+
+
+class RegisterPage(_AuthForm):
+    path = "/signup"
+
+    @locator
+    def name(self):
+        return self.page.get_by_label("Full Name")
+
+    @locator
+    def confirm_password(self):
+        return self.page.get_by_label("Confirm Password")
+
+
+class HomePage(PageObject):
+    """``pages/Home.jsx``."""
+
+    path = "/"
+
+    @locator
+    def search(self):
+        return self.page.get_by_placeholder("Find restaurants by country")
+
+    @locator
+    def popular(self):
+        return self.page.locator("section").filter(
+            has=self.page.get_by_role("heading", name="Popular Restaurants")
+        )
+
+    def order_now(self, index=0):
+        """"Order Now" on the ``index``-th popular restaurant."""
+        return self._cached(
+            ("order_now", index),
+            lambda: self.popular.get_by_role("button", name="Order Now").nth(index),
+        )
+
+
+class RestaurantListingPage(PageObject):
+    """``pages/RestaurantListing.jsx``."""
+
+    path = "/restaurants"
+
+    @locator
+    def sort(self):
+        return self.page.get_by_label("Sort by")
+
+    @locator
+    def clear_filters(self):
+        return self.page.get_by_role("button", name="Clear all", exact=True)
+
+    @locator
+    def cards(self):
+        return self.page.get_by_test_id("restaurant-card")
+
+    def filter_option(self, group, index=0):
+        """Checkbox ``index`` of the "Delivery Options", "Popular Filters" or
+        "Cuisines" group."""
+        return self._cached(
+            ("filter_option", group, index),
+            lambda: self.page.get_by_role("group", name=group).get_by_role("checkbox").nth(index),
+        )
+
+    def order_now(self, index=0):
+        """"Order Now" link on the ``index``-th restaurant card."""
+        return self._cached(
+            ("order_now", index),
+            lambda: self.cards.nth(index).get_by_role("link", name="Order Now"),
+        )
+
+
+class RestaurantMenuPage(PageObject):
+    """``components/RestaurantMenu.jsx``, the ``/restaurants/:id`` route.
+
+    Items are addressed by position: ``item(0)`` is the first item of the
+    first category, ``item(1, category=2)`` the second item of the third.
+    """
+
+    def __init__(self, page, restaurant_id=None):
+        super().__init__(page)
+        self.restaurant_id = restaurant_id
+
+    @property
+    def path(self):
+        return f"/restaurants/{self.restaurant_id}"
+
+    def item(self, index=0, category=0):
+        return self._cached(
+            ("item", index, category),
+            lambda: self.page.get_by_test_id("menu-category")
+            .nth(category)
+            .get_by_test_id("menu-item")
+            .nth(index),
+        )
+
+    def add_to_cart(self, index=0, category=0):
+        return self._cached(
+            ("add_to_cart", index, category),
+            lambda: self.item(index, category).get_by_role("button", name="Add to Cart"),
+        )
+
+    def increase(self, index=0, category=0):
+        return self._cached(
+            ("increase", index, category),
+            lambda: self.item(index, category).get_by_role("button", name="Increase quantity"),
+        )
+
+    def decrease(self, index=0, category=0):
+        return self._cached(
+            ("decrease", index, category),
+            lambda: self.item(index, category).get_by_role("button", name="Decrease quantity"),
+        )
+
+    def option(self, index=0, customization=0, option=0, category=0):
+        """Radio or checkbox ``option`` of one of the item's customizations."""
+        return self._cached(
+            ("option", index, customization, option, category),
+            lambda: self.item(index, category)
+            .get_by_test_id("customization")
+            .nth(customization)
+            .locator("input")
+            .nth(option),
+        )
+
+
+class CartPage(PageObject):
+    """``pages/Cart.jsx``."""
+
+    path = "/cart"
+
+    @locator
+    def items(self):
+        return self.page.get_by_test_id("cart-item")
+
+    @locator
+    def empty_message(self):
+        return self.page.get_by_role("heading", name="Your cart is empty")
+
+    @locator
+    def checkout(self):
+        return self.page.get_by_role("button", name="Proceed to Checkout")
+
+    def increase(self, index=0):
+        return self._cached(
+            ("increase", index),
+            lambda: self.items.nth(index).get_by_role("button", name="Increase quantity"),
+        )
+
+    def decrease(self, index=0):
+        return self._cached(
+            ("decrease", index),
+            lambda: self.items.nth(index).get_by_role("button", name="Decrease quantity"),
+        )
+
+    def remove(self, index=0):
+        return self._cached(
+            ("remove", index),
+            lambda: self.items.nth(index).get_by_role("button", name="Remove"),
+        )
+
+
+class CheckoutPage(PageObject):
+    """``components/Checkout.jsx``, the ``/checkout`` route."""
+
+    path = "/checkout"
+
+    @locator
+    def address(self):
+        return self.page.get_by_placeholder("Enter your delivery address")
+
+    @locator
+    def instructions(self):
+        return self.page.locator("textarea[name=specialInstructions]")
+
+    @locator
+    def cash_on_delivery(self):
+        return self.page.get_by_role("radio", name="Cash on Delivery")
+
+    @locator
+    def chapa(self):
+        return self.page.get_by_role("radio", name="Pay with Chapa")
+
+    @locator
+    def submit(self):
+        return self.page.locator("form").get_by_role("button")
+
+
+class AdminPage(PageObject):
+    """``components/admin/AdminLayout.jsx`` and the pages in its outlet."""
+
+    path = "/admin"
+
+    def section_link(self, name):
+        """Sidebar link: "Dashboard", "Orders", "Users", "Products", ..."""
+        return self._cached(
+            ("section_link", name),
+            lambda: self.page.get_by_role("link", name=name, exact=True).last,
+        )
+
+    @locator
+    def sign_out(self):
+        return self.page.get_by_role("button", name="Sign out").last
+
+    @locator
+    def user_search(self):
+        return self.page.get_by_placeholder("Search users...")
+
+    @locator
+    def user_rows(self):
+        return self.page.get_by_role("row").filter(has=self.page.get_by_role("cell"))
+
+    def user_row(self, email):
+        return self._cached(
+            ("user_row", email), lambda: self.user_rows.filter(has_text=email)
+        )
+
+    def toggle_user(self, email):
+        """The row's "Activate" / "Deactivate" button."""
+        return self._cached(
+            ("toggle_user", email),
+            lambda: self.user_row(email).get_by_role(
+                "button", name=re.compile(r"^(Activate|Deactivate)$")
+            ),
+        )
@@ -0,0 +1,312 @@
+"""Web Vitals, JS heap and request budgets for the client's main pages.
+
+Loads each page of ``perf_budgets.json`` (home, ``/restaurants``, a
+restaurant menu, cart, checkout) in a fresh context with a cold cache and
+measures, through the Chrome DevTools Protocol and ``PerformanceObserver``:
+
+``lcpMs``
+    Largest Contentful Paint;
+``cls``
+    Cumulative Layout Shift (largest session window, as Chrome reports it);
+``tbtMs``
+    Total Blocking Time: the part over 50 ms of every long task after
+    First Contentful Paint, until the page has been idle for a while;
+``jsHeapMb``
+    ``JSHeapUsedSize`` from ``Performance.getMetrics`` once the page is idle;
+``requests``, ``scriptRequests``, ``scriptKb``, ``apiRequests``
+    everything the page fetched, its scripts and their transfer size (the
+    client bundle), and its ``/api/*`` calls (data fetching).
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.perf                    # every page, median of 3 loads
+    python -m harness.perf home menu -n 5     # some pages, 5 loads each
+    python -m harness.perf --cpu-throttle 4   # emulate a slower device
+
+A budget left out of a page's entry falls back to ``defaults``. Any median
+over budget fails the run (exit status 1). The defaults suit the Vite dev
+server, which serves every module unbundled; point ``TESTSPRITE_BASE_URL``
+at ``vite preview`` and tighten ``scriptRequests``/``scriptKb`` to budget
+the production bundle. Results are saved to ``tmp/runs/perf_<timestamp>.json``.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+
+from . import config
+from .auth import AuthStore
+from .browser import LAUNCH_ARGS, new_test_context
+from .chapa import seed_cart
+
+BUDGETS_PATH = config.TESTS_DIR / "perf_budgets.json"
+
+METRICS = (
+    "lcpMs",
+    "cls",
+    "tbtMs",
+    "jsHeapMb",
+    "requests",
+    "scriptRequests",
+    "scriptKb",
+    "apiRequests",
+)
+
+# How long the network must stay quiet before a load counts
+# as finished; late long tasks and layout shifts are still counted.
+QUIET_MS = 1500
+
+_OBSERVERS = """(() => {
+    const vitals = (window.__testspriteVitals = { lcp: 0, cls: 0, fcp: 0, longTasks: [] });
+    const observe = (type, handle) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(handle))
+                .observe({ type, buffered: true });
+        } catch (e) {}
+    };
+    let windowValue = 0, windowStart = 0, lastShift = 0;
+    observe('layout-shift', (entry) => {
+        if (entry.hadRecentInput) return;
+        if (windowValue && entry.startTime - lastShift < 1000
+                && entry.startTime - windowStart < 5000) {
+            windowValue += entry.value;
+        } else {
+            windowValue = entry.value;
+            windowStart = entry.startTime;
+        }
+        lastShift = entry.startTime;
+        vitals.cls = Math.max(vitals.cls, windowValue);
+    });
+    observe('largest-contentful-paint', (entry) => {
+        vitals.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+    });
+    observe('paint', (entry) => {
+        if (entry.name === 'first-contentful-paint') vitals.fcp = entry.startTime;
+    });
+    observe('longtask', (entry) => vitals.longTasks.push([entry.startTime, entry.duration]));
+})()"""
+
+
+def load_budgets(path=None):
+    """``{page: {"path", "auth", "cart", <metric>: budget}}`` with defaults applied."""
+    spec = json.loads((path or BUDGETS_PATH).read_text())
+    defaults = spec.get("defaults", {})
+    pages = {}
+    for name, page in spec["pages"].items():
+        unknown = set(page) - set(METRICS) - {"path", "auth", "cart"}
+        if unknown:
+            raise ValueError(f"perf budget {name!r} has unknown keys {sorted(unknown)}")
+        pages[name] = {**defaults, **page}
+    return pages
+
+
+def total_blocking_time(long_tasks, fcp_ms):
+    return sum(
+        max(0.0, duration - 50) for start, duration in long_tasks if start + duration > fcp_ms
+    )
+
+
+class _Network:
+    """Counts a page's requests by type from CDP ``Network`` events."""
+
+    def __init__(self, session):
+        self.types = {}
+        self.urls = {}
+        self.bytes = {}
+        self.last_activity = asyncio.get_running_loop().time()
+        session.on("Network.requestWillBeSent", self._sent)
+        session.on("Network.loadingFinished", self._finished)
+        session.on("Network.loadingFailed", self._touch)
+
+    def _touch(self, event):
+        self.last_activity = asyncio.get_running_loop().time()
+
+    def _sent(self, event):
+        self._touch(event)
+        self.types[event["requestId"]] = event.get("type", "Other")
+        self.urls[event["requestId"]] = event["request"]["url"]
+
+    def _finished(self, event):
+        self._touch(event)
+        self.bytes[event["requestId"]] = event.get("encodedDataLength", 0)
+
+    def summary(self):
+        scripts = [rid for rid, kind in self.types.items() if kind == "Script"]
+        return {
+            "requests": len(self.types),
+            "scriptRequests": len(scripts),
+            "scriptKb": round(sum(self.bytes.get(rid, 0) for rid in scripts) / 1024, 1),
+            "apiRequests": sum(
+                1 for url in self.urls.values() if urlsplit(url).path.startswith("/api/")
+            ),
+        }
+
+
+async def _wait_quiet(page, network, timeout_s):
+    """Until no request has started or finished for :data:`QUIET_MS`."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    while loop.time() < deadline:
+        idle = loop.time() - network.last_activity
+        if idle * 1000 >= QUIET_MS:
+            return
+        await page.wait_for_timeout(QUIET_MS - idle * 1000)
+
+
+async def measure(browser, url, *, storage_state=None, cart=False, cpu_throttle=1, timeout=30):
+    """One cold load of ``url``; returns every metric of :data:`METRICS`."""
+    options = {"storage_state": storage_state} if storage_state else {}
+    context = await new_test_context(browser, lean=False, **options)
+    try:
+        if cart:
+            await seed_cart(context)
+        await context.add_init_script(_OBSERVERS)
+        page = await context.new_page()
+        session = await context.new_cdp_session(page)
+        await session.send("Performance.enable")
+        await session.send("Network.enable")
+        await session.send("Network.setCacheDisabled", {"cacheDisabled": True})
+        if cpu_throttle > 1:
+            await session.send("Emulation.setCPUThrottlingRate", {"rate": cpu_throttle})
+        network = _Network(session)
+        await page.goto(url, wait_until="load", timeout=timeout * 1000)
+        await _wait_quiet(page, network, timeout)
+        vitals = await page.evaluate("() => window.__testspriteVitals")
+        heap = {
+            m["name"]: m["value"]
+            for m in (await session.send("Performance.getMetrics"))["metrics"]
+        }["JSHeapUsedSize"]
+        return {
+            "lcpMs": round(vitals["lcp"], 1),
+            "cls": round(vitals["cls"], 4),
+            "tbtMs": round(total_blocking_time(vitals["longTasks"], vitals["fcp"]), 1),
+            "jsHeapMb": round(heap / 2**20, 1),
+            **network.summary(),
+        }
+    finally:
+        await context.close()
+
+
+async def _first_restaurant(context):
+    response = await context.request.get(f"{config.API_URL}/api/restaurants?limit=1")
+    return str((await response.json())["data"][0]["_id"])
+
+
+async def run_pages(pages, *, loads=3, cpu_throttle=1):
+    """Median of ``loads`` cold loads per page: ``{page: {metric: value}}``."""
+    results = {}
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        try:
+            auth = AuthStore(pw)
+            probe = await new_test_context(browser)
+            try:
+                restaurant = await _first_restaurant(probe)
+            finally:
+                await probe.close()
+            for name, page in pages.items():
+                storage_state = await auth.storage_state(page["auth"]) if page.get("auth") else None
+                url = config.BASE_URL + page["path"].format(restaurant=restaurant)
+                samples = [
+                    await measure(
+                        browser,
+                        url,
+                        storage_state=storage_state,
+                        cart=page.get("cart", False),
+                        cpu_throttle=cpu_throttle,
+                    )
+                    for _ in range(loads)
+                ]
+                results[name] = {
+                    metric: round(median(s[metric] for s in samples), 4) for metric in METRICS
+                }
+                print(f"measured  {name:<12} {url}")
+        finally:
+            await browser.close()
+    return results
+
+
+def over_budget(results, pages):
+    """``[(page, metric, value, budget), ...]`` for every exceeded budget."""
+    return [
+        (name, metric, values[metric], pages[name][metric])
+        for name, values in results.items()
+        for metric in METRICS
+        if metric in pages[name] and values[metric] > pages[name][metric]
+    ]
+
+
+def print_table(results, pages):
+    header = f"{'page':<12}" + "".join(f" {metric:>16}" for metric in METRICS)
+    print(header)
+    print("-" * len(header))
+    for name, values in results.items():
+        cells = []
+        for metric in METRICS:
+            budget = pages[name].get(metric)
+            cell = f"{values[metric]:g}"
+            if budget is not None:
+                cell += f"/{budget:g}" + ("!" if values[metric] > budget else "")
+            cells.append(f" {cell:>16}")
+        print(f"{name:<12}" + "".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="pages of the budget file to measure")
+    parser.add_argument("-n", "--loads", type=int, default=3, help="cold loads per page")
+    parser.add_argument(
+        "--cpu-throttle", type=float, default=1, help="CPU slowdown factor (Chrome emulation)"
+    )
+    parser.add_argument(
+        "--budgets", type=Path, default=BUDGETS_PATH, help="budget file (default perf_budgets.json)"
+    )
+    args = parser.parse_args(argv)
+
+    pages = load_budgets(args.budgets)
+    if args.pages:
+        missing = set(args.pages) - set(pages)
+        if missing:
+            parser.error(f"no budget for {', '.join(sorted(missing))}")
+        pages = {name: pages[name] for name in args.pages}
+
+    results = asyncio.run(run_pages(pages, loads=args.loads, cpu_throttle=args.cpu_throttle))
+    print_table(results, pages)
+    failures = over_budget(results, pages)
+    for name, metric, value, budget in failures:
+        print(f"over budget  {name}: {metric} {value:g} > {budget:g}")
+
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = config.RUNS_DIR / f"perf_{stamp}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "created": stamp,
+                "target": config.BASE_URL,
+                "loads": args.loads,
+                "cpuThrottle": args.cpu_throttle,
+                "pages": {
+                    name: {"measured": results[name], "budget": pages[name]} for name in results
+                },
+                "overBudget": [
+                    {"page": name, "metric": metric, "value": value, "budget": budget}
+                    for name, metric, value, budget in failures
+                ],
+            },
+            indent=2,
+        )
+    )
+    print(f"Report written to {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,446 @@
+"""Run the TestSprite scripts in parallel and write a wall-clock report.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.run                    # every script and scenario case
+    python -m harness.run TC003 TC004        # tests whose name starts with these
+    python -m harness.run -w 8 -b 2          # 8 concurrent tests on 2 browsers
+    python -m harness.run -p 4               # shard across 4 processes
+    python -m harness.run --compare-legacy   # also time the fixed-sleep mode
+    python -m harness.run --changed          # only tests affected by the diff to HEAD
+    python -m harness.run --changed main     # ... or by the diff to another ref
+    python -m harness.run --trace            # also write per-step timing spans
+    python -m harness.run --no-preflight     # skip the up-front app/API check
+    python -m harness.run --no-warm          # skip compiling the client up front
+    python -m harness.run --full-pages       # do not block images, fonts and HMR
+    python -m harness.run --update-baselines # re-record the responsive screenshots
+    python -m harness.run --backend          # API cases only, no browser
+    python -m harness.run --hermetic -p 4    # against a throwaway seeded backend
+
+Browsers are launched once per process and every test gets its own
+``browser.new_context()``. Tests are pulled from a shared queue by ``-w``
+workers on one asyncio loop; ``-p`` splits the queue across processes when
+a single loop cannot keep the cores busy.
+
+With ``--compare-legacy`` the suite runs twice, once with the original three
+second sleeps and once with the event-driven waits, and the report shows
+both timings side by side.
+
+Besides the ``TC*.py`` scripts, the run includes every case of the
+data-driven flows in :mod:`harness.scenarios`, reported as ``TC001[valid-data]``.
+``--changed`` narrows the run to the tests :mod:`harness.select` maps the
+diff to.
+
+Before any test starts, each process loads the home page and
+``/api/health`` once. If either is broken every test is reported as
+``skipped`` with that reason, instead of each one failing on its first
+page load. Scripts that end in TestSprite's placeholder failure are
+reported as ``unverified``.
+
+Before that, the Vite dev server is asked once for every module the client
+can load (see :mod:`harness.warm`), so no test waits for a first compile.
+While ``python -m harness.warm serve`` is running, the pool connects to
+that Chromium instead of launching its own, and keeps a few blank contexts
+ready for the next tests.
+
+``--backend`` runs the browserless API cases of :mod:`harness.api`
+instead, ``-w`` at a time on one pooled HTTP client.
+
+``--hermetic`` starts :mod:`harness.stack` first and gives every worker
+process its own server and freshly seeded database.
+
+Every pass is appended to :mod:`harness.history` with per-step durations;
+``python -m harness.history regressions`` flags tests that got slower.
+"""
+
+import argparse
+import asyncio
+import functools
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import auth, config, history, select, stack, trace
+
+
+def discover(prefixes=()):
+    # The browser modules are imported where they are used, so that
+    # ``--backend`` runs do not need playwright.
+    from . import scenarios
+
+    scripts = sorted(config.TESTS_DIR.glob("TC*.py"))
+    if prefixes:
+        scripts = [s for s in scripts if s.name.startswith(tuple(prefixes))]
+    return scripts + scenarios.discover(prefixes)
+
+
+def test_name(test):
+    return test.stem if isinstance(test, Path) else test.name
+
+
+def test_text(test):
+    """Name plus plan title, used to match tests to features."""
+    return test.stem if isinstance(test, Path) else f"{test.name} {test.title}"
+
+
+def test_sources(test):
+    if isinstance(test, Path):
+        return [f"{config.TESTS_DIR.name}/{test.name}"]
+    return test.sources
+
+
+def load_test(script):
+    spec = importlib.util.spec_from_file_location(script.stem, script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _describe(exc):
+    message = str(exc).strip().splitlines()
+    return f"{type(exc).__name__}: {message[0]}" if message else type(exc).__name__
+
+
+def _entry_point(pool, test):
+    """Return ``(auth_role, lean_pages, run_test)`` for a script path or a scenario case."""
+    if isinstance(test, Path):
+        module = load_test(test)
+        role = getattr(module, "AUTH_ROLE", None)
+        return role, getattr(module, "LEAN_PAGES", True), module.run_test
+    return test.auth_role, test.lean_pages, functools.partial(test.run, auth=pool.auth)
+
+
+async def run_one(pool, test, timeout, *, tracing=False):
+    from .actions import Unverified
+
+    started = time.perf_counter()
+    # Step spans are always kept for the history; network capture only with --trace.
+    tracer = trace.Tracer(test_name(test))
+    try:
+        role, lean, run_test = _entry_point(pool, test)
+        with trace.activated(tracer):
+            async with pool.context(auth_role=role, lean=lean) as context:
+                if tracing:
+                    tracer.attach(context)
+                await asyncio.wait_for(run_test(context), timeout)
+        status, error = "passed", ""
+    except Unverified as exc:
+        status, error = "unverified", _describe(exc)
+    except asyncio.TimeoutError:
+        status, error = "failed", f"timed out after {timeout}s"
+    except Exception as exc:
+        status, error = "failed", _describe(exc)
+    result = {
+        "status": status,
+        "error": error,
+        "seconds": round(time.perf_counter() - started, 3),
+        "steps": tracer.timings(),
+    }
+    if tracing:
+        result["trace"] = tracer.export()
+    return result
+
+
+async def preflight(pool):
+    """Return why the app is unusable, or None if the home page and API respond."""
+    from .actions import Actions, StepFailed
+
+    async with pool.context() as context:
+        try:
+            response = await context.request.get(f"{config.API_URL}/api/health")
+            if not response.ok:
+                return f"{config.API_URL}/api/health answered HTTP {response.status}"
+        except Exception as exc:
+            return f"{config.API_URL}/api/health unreachable: {_describe(exc)}"
+        try:
+            await Actions(context).goto(await context.new_page(), config.BASE_URL)
+        except StepFailed as exc:
+            return str(exc)
+    return None
+
+
+async def run_all(tests, *, workers, browsers, timeout, tracing=False, check=True):
+    from . import warm
+    from .browser import BrowserPool
+
+    queue = asyncio.Queue()
+    for test in tests:
+        queue.put_nowait(test)
+    results = {}
+
+    pool = BrowserPool(browsers, spares=min(workers, 4), endpoint=warm.running_server())
+    async with pool:
+        reason = await preflight(pool) if check else None
+        if reason:
+            print(f"preflight failed: {reason}")
+            skipped = {"status": "skipped", "error": f"preflight: {reason}", "seconds": 0.0}
+            return {test_name(test): dict(skipped) for test in tests}
+
+        async def worker():
+            while not queue.empty():
+                test = queue.get_nowait()
+                result = await run_one(pool, test, timeout, tracing=tracing)
+                results[test_name(test)] = result
+                print(f"{result['status']:>6}  {result['seconds']:7.1f}s  {test_name(test)}")
+
+        await asyncio.gather(*(worker() for _ in range(min(workers, len(tests)))))
+    return results
+
+
+def _run_shard(
+    tests, backend, workers, browsers, timeout, legacy, tracing, check, lean, update_baselines
+):
+    config.LEGACY_WAITS = legacy
+    config.LEAN_PAGES = lean
+    config.UPDATE_BASELINES = update_baselines
+    if backend:
+        config.API_URL = backend["apiUrl"]
+        config.MONGO_URI = backend["mongoUri"]
+        auth.AUTH_DIR = Path(backend["authDir"])
+    return asyncio.run(
+        run_all(
+            tests,
+            workers=workers,
+            browsers=browsers,
+            timeout=timeout,
+            tracing=tracing,
+            check=check,
+        )
+    )
+
+
+def run_pass(tests, args, *, legacy=False):
+    """Run every test once; return per-test results and the pass wall clock."""
+    started = time.perf_counter()
+    shard_args = (
+        args.workers,
+        args.browsers,
+        args.timeout,
+        legacy,
+        args.trace and not legacy,
+        args.preflight,
+        args.lean_pages,
+        args.update_baselines,
+    )
+    backends = args.backends or [None] * args.processes
+    if args.processes > 1:
+        shards = [tests[i :: args.processes] for i in range(args.processes)]
+        results = {}
+        with ProcessPoolExecutor(args.processes) as executor:
+            futures = [
+                executor.submit(_run_shard, shard, backend, *shard_args)
+                for shard, backend in zip(shards, backends, strict=True)
+                if shard
+            ]
+            for future in futures:
+                results.update(future.result())
+    else:
+        results = _run_shard(tests, backends[0], *shard_args)
+    return results, round(time.perf_counter() - started, 3)
+
+
+def write_report(results, walls):
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    compare = "legacy" in walls
+    report = {"created": stamp, "wallSeconds": walls, "tests": results}
+
+    lines = ["# TestSprite run report", "", f"- **Run:** {stamp}"]
+    if compare:
+        lines += [
+            f"- **Fixed sleeps:** {walls['legacy']:.1f}s wall clock",
+            f"- **Event-driven waits:** {walls['event']:.1f}s wall clock",
+            f"- **Saved:** {walls['legacy'] - walls['event']:.1f}s",
+            "",
+            "| Test | Status | Fixed sleeps (s) | Event-driven (s) |",
+            "|------|--------|------------------|------------------|",
+        ]
+        for r in results:
+            lines.append(
+                f"| {r['test']} | {r['event']['status']} "
+                f"| {r['legacy']['seconds']:.1f} | {r['event']['seconds']:.1f} |"
+            )
+    else:
+        lines += [
+            f"- **Wall clock:** {walls['event']:.1f}s",
+            "",
+            "| Test | Status | Seconds | Error |",
+            "|------|--------|---------|-------|",
+        ]
+        for r in results:
+            e = r["event"]
+            lines.append(
+                f"| {r['test']} | {e['status']} | {e['seconds']:.1f} | {e['error']} |"
+            )
+
+    json_path = config.RUNS_DIR / f"run_report_{stamp}.json"
+    json_path.write_text(json.dumps(report, indent=2))
+    (config.RUNS_DIR / f"run_report_{stamp}.md").write_text("\n".join(lines) + "\n")
+    return json_path
+
+
+def write_traces(traces):
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    jsonl_path = config.RUNS_DIR / f"trace_{stamp}.jsonl"
+    trace.write_jsonl(traces, jsonl_path)
+    trace.write_chrome(traces, config.RUNS_DIR / f"trace_{stamp}.json")
+    print(f"Trace written to {jsonl_path} (Chrome trace: trace_{stamp}.json)")
+
+
+def run_backend(args):
+    # Imported here so that browser runs do not need httpx.
+    from . import api
+
+    if args.backends:
+        config.API_URL = args.backends[0]["apiUrl"]
+        config.MONGO_URI = args.backends[0]["mongoUri"]
+    names = api.discover(args.prefixes)
+    started = time.perf_counter()
+    results = asyncio.run(api.run_all(names, workers=args.workers, timeout=args.timeout))
+    wall = round(time.perf_counter() - started, 3)
+    select.record_results(results)
+    for result in results.values():
+        result["steps"] = [
+            {"step": i, "kind": "call", "target": call["call"], "ms": call["ms"], "error": None}
+            for i, call in enumerate(result.get("calls", ()), 1)
+        ]
+    history.record_run(results, wall, kind="backend", args=args)
+    path = write_report([{"test": name, "event": results[name]} for name in names], {"event": wall})
+    print(f"Report written to {path}")
+    return 0 if all(r["status"] == "passed" for r in results.values()) else 1
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("prefixes", nargs="*", help="only run tests with these name prefixes")
+    parser.add_argument("-w", "--workers", type=int, default=cpus, help="concurrent tests per process")
+    parser.add_argument(
+        "-b", "--browsers", type=int, default=max(1, cpus // 4), help="browsers per process"
+    )
+    parser.add_argument("-p", "--processes", type=int, default=1, help="worker processes")
+    parser.add_argument("--timeout", type=float, default=300, help="per-test timeout in seconds")
+    parser.add_argument(
+        "--compare-legacy",
+        action="store_true",
+        help="also run the suite with the original fixed sleeps",
+    )
+    parser.add_argument(
+        "--changed",
+        nargs="?",
+        const="HEAD",
+        metavar="REF",
+        help="only run tests affected by the changes since REF (default HEAD)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="record per-step spans to tmp/runs/trace_<timestamp>.{jsonl,json}",
+    )
+    parser.add_argument(
+        "--backend",
+        action="store_true",
+        help="run the pure-HTTP API cases instead of the browser tests",
+    )
+    parser.add_argument(
+        "--hermetic",
+        action="store_true",
+        help="start a throwaway seeded server per worker process (see harness.stack)",
+    )
+    parser.add_argument(
+        "--no-preflight",
+        dest="preflight",
+        action="store_false",
+        help="start the tests without checking the home page and /api/health first",
+    )
+    parser.add_argument(
+        "--no-warm",
+        dest="warm",
+        action="store_false",
+        help="do not have the dev server compile the client's modules before the tests",
+    )
+    parser.add_argument(
+        "--full-pages",
+        dest="lean_pages",
+        action="store_false",
+        default=config.LEAN_PAGES,
+        help="load images, fonts and the Vite HMR socket in every test",
+    )
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        default=config.UPDATE_BASELINES,
+        help="replace the screenshot baselines of the responsive checks",
+    )
+    parser.add_argument(
+        "--fresh-auth",
+        action="store_true",
+        help="discard cached logins and sign every role in again",
+    )
+    args = parser.parse_args(argv)
+    args.backends = []
+
+    if args.fresh_auth:
+        auth.clear_cache()
+    if not args.hermetic:
+        return execute(args)
+    with stack.Stack(workers=1 if args.backend else args.processes) as hermetic:
+        args.backends = [backend.settings() for backend in hermetic.backends]
+        print(f"hermetic stack: {', '.join(b['apiUrl'] for b in args.backends)}")
+        return execute(args)
+
+
+def execute(args):
+    if args.backend:
+        return run_backend(args)
+    tests = discover(args.prefixes)
+    if args.changed:
+        tests, reasons = select.select(
+            tests,
+            select.changed_files(args.changed),
+            name_of=test_name,
+            text_of=test_text,
+            sources_of=test_sources,
+        )
+        for name, reason in reasons.items():
+            print(f"select  {name}: {reason}")
+        if not tests:
+            print(f"No tests affected by changes since {args.changed}.")
+            return 0
+    if args.warm:
+        from . import warm
+
+        count, seconds = asyncio.run(warm.warm_vite_once())
+        print(f"warmed {count} client modules in {seconds:.1f}s")
+    walls = {}
+    legacy = {}
+    if args.compare_legacy:
+        legacy, walls["legacy"] = run_pass(tests, args, legacy=True)
+        history.record_run(legacy, walls["legacy"], kind="legacy", args=args)
+    event, walls["event"] = run_pass(tests, args)
+    select.record_results(event)
+    history.record_run(event, walls["event"], args=args)
+    if args.trace:
+        write_traces([r.pop("trace") for r in event.values() if "trace" in r])
+
+    results = []
+    for test in tests:
+        name = test_name(test)
+        entry = {"test": name, "event": event[name]}
+        if args.compare_legacy:
+            entry["legacy"] = legacy[name]
+        results.append(entry)
+
+    path = write_report(results, walls)
+    print(f"Report written to {path}")
+    return 0 if all(r["event"]["status"] == "passed" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
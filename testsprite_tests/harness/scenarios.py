@@ -0,0 +1,686 @@
+"""Data-driven flows for the plan entries TestSprite recorded several times.
+
+TestSprite generated up to five near-identical scripts per plan entry
+(``TC001`` registration, ``TC008`` shopping cart, ``TC013`` promo codes,
+...), often under different numbers, each with its own copy of the same
+clicks and only the typed values differing. Those entries now have a single
+flow here: one step function per step of the entry in
+``testsprite_frontend_test_plan.json``, run once per parameter set in
+``scenario_params.json``. ``harness.run`` discovers the resulting cases,
+named ``TC001[valid-data]`` and so on, next to the remaining ``TC*.py``
+scripts.
+
+Parameter values, nested ones included, may contain ``{uid}``, replaced by
+a fresh hex string per case, and ``"account": "<role>"`` to use (and, if
+needed, create) one of the accounts from :data:`harness.auth.ROLES`.
+
+A step the application gives no way to perform (there is no promo code
+field at checkout, for one) raises :class:`~harness.actions.Unverified`, so
+the case is reported ``unverified`` rather than failed.
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import expect
+
+from . import config
+from .actions import Actions, Unverified
+from .auth import ROLES, token_expiry
+from .pages import (
+    CartPage,
+    HomePage,
+    LoginPage,
+    Navbar,
+    RegisterPage,
+    RestaurantListingPage,
+    RestaurantMenuPage,
+)
+
+PLAN_PATH = config.TESTS_DIR / "testsprite_frontend_test_plan.json"
+PARAMS_PATH = config.TESTS_DIR / "scenario_params.json"
+
+# The client calls the singular alias routes, see client/src/context/AuthContext.jsx.
+LOGIN_API = "/api/user/login"
+REGISTER_API = "/api/user/register"
+
+
+class ScenarioError(AssertionError):
+    """A step of a data-driven flow failed; the message names the plan step."""
+
+
+@lru_cache(maxsize=None)
+def load_plan():
+    return {entry["id"]: entry for entry in json.loads(PLAN_PATH.read_text())}
+
+
+@lru_cache(maxsize=None)
+def load_params():
+    return json.loads(PARAMS_PATH.read_text())
+
+
+@dataclass
+class ScenarioRun:
+    """State shared by the steps of one case."""
+
+    context: object
+    auth: object
+    params: dict
+    act: Actions
+    page: object = None
+    form: object = None
+    state: dict = field(default_factory=dict)
+
+    async def credentials(self):
+        """Email and password for the case, creating the account if it names one."""
+        role = self.params.get("account")
+        if role:
+            await self.auth.session(role)
+            creds = ROLES[role]
+            return (
+                self.params.get("email", creds.email),
+                self.params.get("password", creds.password),
+            )
+        return self.params["email"], self.params["password"]
+
+    async def stored_token(self):
+        return await self.page.evaluate("() => localStorage.getItem('token')")
+
+
+FLOWS = {}
+
+
+def flow(plan_id, *steps):
+    """Register the step functions for ``plan_id``, one per plan step."""
+    FLOWS[plan_id] = steps
+
+
+# -- Registration and login form (client/src/pages/auth/AuthPage.jsx) --------
+
+
+async def _open(run, page_class):
+    run.page = await run.context.new_page()
+    run.form = await page_class(run.page).open(run.act)
+    await expect(run.form.form).to_be_visible()
+
+
+async def open_signup(run):
+    await _open(run, RegisterPage)
+
+
+async def open_login(run):
+    await _open(run, LoginPage)
+
+
+async def fill_signup(run):
+    form = run.form
+    email, password = await run.credentials()
+    await run.act.fill(form.name, run.params["name"])
+    await run.act.fill(form.email, email)
+    await run.act.fill(form.password, password)
+    await run.act.fill(form.confirm_password, run.params.get("confirmPassword", password))
+
+
+async def fill_login(run):
+    form = run.form
+    email, password = await run.credentials()
+    await run.act.fill(form.email, email)
+    await run.act.fill(form.password, password)
+
+
+def submit(api):
+    async def submit_form(run):
+        # Client-side validation stops invalid input before any request is sent.
+        expect_api = api if run.params.get("reachesApi", True) else None
+        await run.act.click(run.form.submit, expect_api=expect_api)
+
+    return submit_form
+
+
+async def expect_signed_in(run):
+    await expect(run.page).not_to_have_url(f"{config.BASE_URL}/login")
+    await expect(run.page).not_to_have_url(f"{config.BASE_URL}/signup")
+    await expect(run.form.errors).to_have_count(0)
+
+
+async def expect_token(run):
+    token = await run.stored_token()
+    assert token, "no token in localStorage after signing in"
+    assert token.count(".") == 2, f"stored token is not a JWT: {token[:20]}..."
+    assert token_expiry(token) > time.time(), "stored JWT is already expired"
+
+
+async def expect_login_success(run):
+    await expect_signed_in(run)
+    await expect_token(run)
+
+
+async def expect_form_error(run):
+    invalid = run.params.get("invalidField")
+    if invalid:
+        field_locator = run.form.email
+        assert invalid == "email", f"unsupported invalidField {invalid!r}"
+        valid = await field_locator.evaluate("el => el.validity.valid")
+        assert not valid, "browser accepted the email field"
+        await expect(run.page).to_have_url(f"{config.BASE_URL}/signup")
+    else:
+        await expect(run.form.errors.first).to_contain_text(
+            run.params["error"], ignore_case=True
+        )
+
+
+async def expect_no_token(run):
+    token = await run.stored_token()
+    assert not token, "a token was stored although registration failed"
+
+
+flow("TC001", open_signup, fill_signup, submit(REGISTER_API), expect_signed_in, expect_token)
+flow("TC002", open_signup, fill_signup, submit(REGISTER_API), expect_form_error, expect_no_token)
+flow("TC003", open_login, fill_login, submit(LOGIN_API), expect_login_success)
+flow("TC004", open_login, fill_login, submit(LOGIN_API), expect_form_error)
+
+
+# -- Protected API endpoints ------------------------------------------------
+
+
+def call_protected(kind):
+    async def call(run):
+        headers = {}
+        if kind == "invalid":
+            headers["Authorization"] = f"Bearer {run.params['invalidToken']}"
+        elif kind == "valid":
+            headers["Authorization"] = f"Bearer {await run.auth.token(run.params['account'])}"
+        url = f"{config.API_URL}{run.params['endpoint']}"
+        run.state["response"] = await run.context.request.get(url, headers=headers)
+
+    return call
+
+
+def expect_status(status):
+    async def check(run):
+        response = run.state["response"]
+        assert response.status == status, (
+            f"{run.params['endpoint']} answered HTTP {response.status}, expected {status}"
+        )
+        if status == 200:
+            body = await response.json()
+            assert body is not None, f"{run.params['endpoint']} returned no data"
+
+    return check
+
+
+flow(
+    "TC005",
+    call_protected("none"),
+    expect_status(401),
+    call_protected("invalid"),
+    expect_status(401),
+    call_protected("valid"),
+    expect_status(200),
+)
+
+
+# -- Shared steps for flows that start signed in -----------------------------
+
+
+async def sign_in(run):
+    """Sign in through the login form as the case's ``account``."""
+    await open_login(run)
+    await fill_login(run)
+    await submit(LOGIN_API)(run)
+    await expect_login_success(run)
+
+
+async def _api(run, method, path, **kwargs):
+    """Call the API as the user signed in on ``run.page`` (or anonymously)."""
+    token = await run.stored_token() if run.page else None
+    headers = {**kwargs.pop("headers", {})}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return await run.context.request.fetch(
+        f"{config.API_URL}{path}", method=method, headers=headers, **kwargs
+    )
+
+
+def _probe_agent(name):
+    # The limiters key on IP plus User-Agent: probes get a window of their own
+    # instead of using up the one the browser's logins share.
+    return f"testsprite-scenario/{name}/{uuid.uuid4().hex[:12]}"
+
+
+# -- Restaurant listings (server/routes/RestaurantRoutes.js) -----------------
+
+
+async def create_restaurant(run):
+    # The client has no listing form; owners create restaurants through the API.
+    response = await _api(run, "POST", "/api/restaurants", data=run.params["restaurant"])
+    assert response.status == 201, (
+        f"creating a restaurant answered HTTP {response.status}: {await response.text()}"
+    )
+    run.state["restaurant"] = await response.json()
+
+
+async def _search_ids(run, text):
+    response = await _api(run, "GET", "/api/restaurants", params={"search": f"{text} ", "limit": 100})
+    assert response.ok, f"restaurant search answered HTTP {response.status}"
+    return {r["_id"] for r in (await response.json())["data"]}
+
+
+async def expect_restaurant_listed(run):
+    restaurant = run.state["restaurant"]
+    assert restaurant["_id"] in await _search_ids(run, restaurant["name"]), (
+        f"{restaurant['name']} is not in the restaurant listings"
+    )
+    menu = await RestaurantMenuPage(run.page, restaurant["_id"]).open(run.act)
+    await expect(menu.page.get_by_role("heading", name=restaurant["name"])).to_be_visible()
+
+
+async def update_restaurant(run):
+    path = f"/api/restaurants/{run.state['restaurant']['_id']}"
+    response = await _api(run, "PUT", path, data=run.params["update"])
+    assert response.ok, f"updating the restaurant answered HTTP {response.status}"
+
+
+async def expect_restaurant_updated(run):
+    path = f"/api/restaurants/{run.state['restaurant']['_id']}"
+    saved = await (await _api(run, "GET", path)).json()
+    for key, value in run.params["update"].items():
+        assert saved.get(key) == value, f"{key} is {saved.get(key)!r} after updating it to {value!r}"
+
+
+async def delete_restaurant(run):
+    path = f"/api/restaurants/{run.state['restaurant']['_id']}"
+    response = await _api(run, "DELETE", path)
+    assert response.ok, f"deleting the restaurant answered HTTP {response.status}"
+
+
+async def expect_restaurant_gone(run):
+    restaurant = run.state["restaurant"]
+    response = await _api(run, "GET", f"/api/restaurants/{restaurant['_id']}")
+    assert response.status == 404, f"deleted restaurant answered HTTP {response.status}"
+    assert restaurant["_id"] not in await _search_ids(run, restaurant["name"]), (
+        f"{restaurant['name']} is still listed after deleting it"
+    )
+
+
+async def modify_foreign_restaurant(run):
+    owner = run.state["restaurant"].get("owner")
+    if owner is None:
+        raise Unverified("restaurants record no owner, so none belongs to another user")
+    listing = await (await _api(run, "GET", "/api/restaurants", params={"limit": 20})).json()
+    foreign = next((r for r in listing["data"] if r.get("owner") != owner), None)
+    assert foreign, "no restaurant of another owner to try"
+    # The update changes nothing, so a server that wrongly accepts it does no harm.
+    run.state["response"] = await _api(run, "PUT", f"/api/restaurants/{foreign['_id']}", data={})
+
+
+async def expect_access_denied(run):
+    status = run.state["response"].status
+    assert status in (401, 403), f"updating another owner's restaurant answered HTTP {status}"
+
+
+flow(
+    "TC006",
+    sign_in,
+    create_restaurant,
+    expect_restaurant_listed,
+    update_restaurant,
+    expect_restaurant_updated,
+    delete_restaurant,
+    expect_restaurant_gone,
+    modify_foreign_restaurant,
+    expect_access_denied,
+)
+
+
+# -- Shopping cart (client/src/context/CartContext.jsx) ----------------------
+
+
+async def add_items(run):
+    """Open a restaurant's menu, ``via`` the home page or the listing, and add
+    ``items``: ``{"index", "category", "options": [[customization, option]]}``."""
+    page = run.page
+    home = await HomePage(page).open(run.act)
+    if run.params.get("via") == "home":
+        await run.act.click(home.order_now(0))
+    else:
+        await run.act.click(Navbar(page).restaurants_link)
+        await run.act.click(RestaurantListingPage(page).order_now(0))
+    menu = RestaurantMenuPage(page)
+    for item in run.params["items"]:
+        index, category = item["index"], item.get("category", 0)
+        for customization, option in item.get("options", []):
+            await run.act.click(menu.option(index, customization, option, category=category))
+        await run.act.click(menu.add_to_cart(index, category=category))
+
+
+async def _cart_lines(run):
+    """``[(item id, quantity, unit price)]`` from the client's saved cart."""
+    saved = json.loads(await run.page.evaluate("() => localStorage.getItem('cart')") or "{}")
+    return [
+        (item["_id"], item["quantity"], item["price"])
+        for entry in saved.get("cart", {}).values()
+        for item in entry["items"]
+    ]
+
+
+async def _expect_cart_matches(run, lines):
+    cart = run.state["cart"]
+    await expect(cart.items).to_have_count(len(lines))
+    if lines:
+        subtotal = sum(quantity * price for _, quantity, price in lines)
+        await expect(run.page.get_by_text(f"${subtotal:.2f}", exact=True).first).to_be_visible()
+
+
+async def open_cart(run):
+    run.state["cart"] = await CartPage(run.page).open(run.act)
+
+
+async def expect_cart_items(run):
+    await open_cart(run)
+    lines = await _cart_lines(run)
+    items = run.params["items"]
+    assert len(lines) == run.params.get("lines", len(items)), f"cart holds {lines}"
+    assert sum(quantity for _, quantity, _ in lines) == len(items), f"cart holds {lines}"
+    await _expect_cart_matches(run, lines)
+    run.state["lines"] = lines
+
+
+async def increase_quantity(run):
+    await run.act.click(run.state["cart"].increase(0))
+
+
+async def expect_quantity_updated(run):
+    before, lines = run.state["lines"], await _cart_lines(run)
+    assert lines[0][1] == before[0][1] + 1, f"quantity went from {before[0][1]} to {lines[0][1]}"
+    await _expect_cart_matches(run, lines)
+    run.state["lines"] = lines
+
+
+async def remove_item(run):
+    await run.act.click(run.state["cart"].remove(len(run.state["lines"]) - 1))
+
+
+async def expect_item_removed(run):
+    lines = await _cart_lines(run)
+    assert lines == run.state["lines"][:-1], f"cart holds {lines} after removing the last item"
+    await _expect_cart_matches(run, lines)
+    run.state["lines"] = lines
+
+
+async def sign_out_and_in(run):
+    nav = Navbar(run.page)
+    await run.act.click(nav.account_menu)
+    await run.act.click(nav.logout)
+    await sign_in(run)
+
+
+async def expect_cart_kept(run):
+    await open_cart(run)
+    lines = await _cart_lines(run)
+    assert lines == run.state["lines"], f"cart holds {lines} after signing in again"
+    await _expect_cart_matches(run, lines)
+
+
+flow(
+    "TC008",
+    sign_in,
+    add_items,
+    expect_cart_items,
+    increase_quantity,
+    expect_quantity_updated,
+    remove_item,
+    expect_item_removed,
+    sign_out_and_in,
+    expect_cart_kept,
+)
+
+
+# -- Promo codes (server/routes/PromoCodeRoutes.js) --------------------------
+
+
+async def add_items_and_check_out(run):
+    await sign_in(run)
+    await add_items(run)
+    await open_cart(run)
+    await run.act.click(run.state["cart"].checkout)
+    await expect(run.page).to_have_url(f"{config.BASE_URL}/checkout")
+
+
+def _promo_field(run):
+    field_locator = run.page.get_by_placeholder(re.compile("promo", re.I))
+    return field_locator, run.page.get_by_role("button", name=re.compile("^apply", re.I))
+
+
+async def _apply_promo(run, code):
+    field_locator, apply = _promo_field(run)
+    if not await field_locator.count():
+        raise Unverified("checkout has no promo code field")
+    await run.act.fill(field_locator, code)
+    await run.act.click(apply)
+
+
+async def enter_valid_promo(run):
+    response = await _api(run, "GET", "/api/promo-codes/active")
+    codes = [promo["code"] for promo in await response.json()]
+    assert codes, "no active promo code to apply"
+    await _apply_promo(run, codes[0])
+
+
+async def expect_discount(run):
+    await expect(run.page.get_by_text(re.compile("discount", re.I)).first).to_be_visible()
+
+
+async def enter_invalid_promo(run):
+    await _apply_promo(run, run.params["invalidCode"])
+
+
+async def expect_promo_rejected(run):
+    await expect(run.page.get_by_role("alert").first).to_be_visible()
+    await expect(run.page.get_by_text(re.compile("discount", re.I))).to_have_count(0)
+
+
+async def enter_exhausted_promo(run):
+    code = run.params.get("exhaustedCode")
+    if not code:
+        raise Unverified("no promo code at its usage limit to try")
+    await _apply_promo(run, code)
+
+
+flow(
+    "TC013",
+    add_items_and_check_out,
+    enter_valid_promo,
+    expect_discount,
+    enter_invalid_promo,
+    expect_promo_rejected,
+    enter_exhausted_promo,
+    expect_promo_rejected,
+)
+
+
+# -- Rate limiting (server/middleware/rateLimit.js, see also harness.burst) --
+
+
+async def _send_all(run, bodies, agent):
+    url = f"{config.API_URL}{run.params['endpoint']}"
+    responses = await asyncio.gather(
+        *(
+            run.context.request.post(url, data=body, headers={"User-Agent": agent})
+            for body in bodies
+        )
+    )
+    return [response.status for response in responses]
+
+
+async def send_burst(run):
+    # Failed requests count towards both limiters; this many go past the limit.
+    count = run.params["limit"] + 5
+    bodies = [run.params["burstBody"]] * count
+    run.state["statuses"] = await _send_all(run, bodies, _probe_agent("burst"))
+
+
+async def expect_too_many_requests(run):
+    statuses = run.state["statuses"]
+    assert 429 in statuses, "no 429 at all: limiter skipped (TRUSTED_IPS?) or not mounted"
+    allowed = sum(1 for status in statuses if status != 429)
+    assert allowed == run.params["limit"], (
+        f"{allowed} requests got through before the 429s, expected {run.params['limit']}"
+    )
+
+
+async def send_normal_volume(run):
+    body = run.params.get("normalBody")
+    if body is None:
+        email, password = await run.credentials()
+        body = {"email": email, "password": password}
+    run.state["statuses"] = await _send_all(run, [body], _probe_agent("normal"))
+
+
+async def expect_processed(run):
+    statuses = run.state["statuses"]
+    assert all(200 <= status < 300 for status in statuses), f"normal requests answered {statuses}"
+
+
+flow("TC014", send_burst, expect_too_many_requests, send_normal_volume, expect_processed)
+
+
+# -- Input validation and sanitization ---------------------------------------
+
+_FORMS = {"login": LoginPage, "signup": RegisterPage, "search": HomePage}
+_FIELDS = {
+    "name": "name",
+    "email": "email",
+    "password": "password",
+    "confirmPassword": "confirm_password",
+    "search": "search",
+}
+
+
+async def submit_malicious_input(run):
+    form = run.params.get("form")
+    if form:
+        run.page = await run.context.new_page()
+        run.form = await _FORMS[form](run.page).open(run.act)
+        for key, value in run.params["fields"].items():
+            await run.act.fill(getattr(run.form, _FIELDS[key]), value)
+        if form != "search":
+            await submit(LOGIN_API if form == "login" else REGISTER_API)(run)
+    request = run.params["api"]
+    response = await run.context.request.fetch(
+        f"{config.API_URL}{request['path']}",
+        method=request["method"],
+        data=request.get("json"),
+        params=request.get("query"),
+        headers={"User-Agent": _probe_agent("input")},
+    )
+    run.state["response"] = (response.status, await response.text())
+
+
+async def expect_input_rejected(run):
+    assert not run.act.dialogs, f"injected script opened a dialog: {run.act.dialogs}"
+    if run.page:
+        injected = await run.page.evaluate(
+            "() => [...document.scripts].filter((s) => /alert\\(/i.test(s.textContent)).length"
+        )
+        assert not injected, "an injected <script> made it into the page"
+    status, text = run.state["response"]
+    path = run.params["api"]["path"]
+    if run.params.get("rejected", True):
+        assert 400 <= status < 500, f"{path} accepted the input (HTTP {status})"
+    else:
+        assert "<script" not in text.lower(), f"{path} echoed the script back unescaped"
+
+
+async def expect_server_unharmed(run):
+    # Server logs are out of reach; an unhandled payload shows up as a 5xx.
+    status, text = run.state["response"]
+    assert status < 500, f"{run.params['api']['path']} failed with HTTP {status}: {text[:200]}"
+    health = await run.context.request.get(f"{config.API_URL}/api/health")
+    assert health.ok, f"/api/health answered HTTP {health.status} after the malicious input"
+
+
+flow("TC015", submit_malicious_input, expect_input_rejected, expect_server_unharmed)
+
+
+# -- Cases ---------------------------------------------------------------------
+
+
+def _expand(value, uid):
+    if isinstance(value, str):
+        return value.replace("{uid}", uid)
+    if isinstance(value, list):
+        return [_expand(item, uid) for item in value]
+    if isinstance(value, dict):
+        return {key: _expand(item, uid) for key, item in value.items()}
+    return value
+
+
+@dataclass(frozen=True)
+class Case:
+    """One parameter set of one flow. Picklable, so it can cross processes."""
+
+    plan_id: str
+    label: str
+
+    @property
+    def name(self):
+        return f"{self.plan_id}[{self.label}]"
+
+    @property
+    def title(self):
+        return load_plan()[self.plan_id]["title"]
+
+    @property
+    def sources(self):
+        """Files that define the case, relative to the repository root."""
+        root = config.TESTS_DIR.name
+        return (f"{root}/{PARAMS_PATH.name}", f"{root}/harness/scenarios.py")
+
+    @property
+    def auth_role(self):
+        # Cases sign in through the form themselves; they never start signed in.
+        return None
+
+    @property
+    def lean_pages(self):
+        return True
+
+    async def run(self, context, auth):
+        plan_steps = load_plan()[self.plan_id]["steps"]
+        steps = FLOWS[self.plan_id]
+        if len(steps) != len(plan_steps):
+            raise ScenarioError(
+                f"{self.plan_id} has {len(plan_steps)} plan steps but {len(steps)} handlers"
+            )
+        uid = uuid.uuid4().hex[:12]
+        params = _expand(load_params()[self.plan_id][self.label], uid)
+        run = ScenarioRun(context=context, auth=auth, params=params, act=Actions(context))
+        for number, (plan_step, step) in enumerate(zip(plan_steps, steps, strict=True), 1):
+            try:
+                await step(run)
+            except Unverified as exc:
+                raise Unverified(f"step {number} ({plan_step['description']}): {exc}") from exc
+            except (AssertionError, PlaywrightError) as exc:
+                raise ScenarioError(
+                    f"step {number} ({plan_step['description']}): {exc}"
+                ) from exc
+
+
+def discover(prefixes=()):
+    """Every (flow, parameter set) pair, optionally filtered by name prefix."""
+    cases = [
+        Case(plan_id, label)
+        for plan_id, param_sets in sorted(load_params().items())
+        if plan_id in FLOWS
+        for label in param_sets
+    ]
+    if prefixes:
+        cases = [c for c in cases if c.name.startswith(tuple(prefixes))]
+    return cases
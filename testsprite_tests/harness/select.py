@@ -0,0 +1,191 @@
+"""Pick the tests affected by a git diff.
+
+``tmp/code_summary.json`` lists, per feature, the client and server files
+that implement it. A changed file selects its features, and a feature
+selects every test whose name (or plan title, for scenario cases) mentions
+one of its keywords. Anything the map cannot place errs towards running
+more:
+
+- a changed file that belongs to no feature selects the whole suite;
+- a test that matches no feature keyword is always selected;
+- a test without a cached pass from an earlier run is always selected.
+
+The last result of every test is kept in ``tmp/runs/last_results.json``.
+"""
+
+import json
+import re
+import subprocess
+from datetime import datetime, timezone
+
+from . import config
+
+SUMMARY_PATH = config.TESTS_DIR / "tmp" / "code_summary.json"
+RESULTS_PATH = config.RUNS_DIR / "last_results.json"
+
+# Files that exist in this tree but are missing from code_summary.json.
+EXTRA_FILES = {
+    "User Authentication": [
+        "server/routes/UserRoutesFixed.js",
+        "server/routes/authRoutes.js",
+        "server/controllers/authController.js",
+        "server/middleware/authMiddleware.js",
+        "server/middleware/authValidation.js",
+        "server/models/Session.js",
+        "server/models/UserSimple.js",
+    ],
+    "Restaurant Management": [
+        "server/seeds/seedRestaurants.js",
+        "server/utils/catalogCache.js",
+        "server/utils/pagination.js",
+    ],
+    "Menu Management": [
+        "server/controllers/MenuItemController.js",
+        "server/seeds/seedMenuItems.js",
+        "server/utils/streamJson.js",
+    ],
+    "Shopping Cart": ["server/utils/streamJson.js"],
+    "Payment Integration": ["server/utils/chapa.js"],
+    "Admin Dashboard": [
+        "server/routes/adminRoutes.js",
+        "server/controllers/adminController.js",
+        "server/middleware/admin.js",
+        "server/utils/pagination.js",
+        "server/utils/streamJson.js",
+    ],
+    "Search and Filtering": [
+        "server/data/gazetteer.json",
+        "server/seeds/backfillRestaurantGeo.js",
+        "server/utils/geocode.js",
+        "server/utils/searchIndex.js",
+    ],
+    "Promo Code System": ["server/seeds/seedPromoCodes.js"],
+}
+
+FEATURE_KEYWORDS = {
+    "User Authentication": (
+        "registration",
+        "login",
+        "jwt",
+        "password",
+        "authentication",
+    ),
+    "Restaurant Management": ("restaurant creation", "restaurant listing", "new restaurant"),
+    "Menu Management": ("menu item",),
+    "Shopping Cart": ("cart",),
+    "Order Management": ("order", "checkout"),
+    "Payment Integration": ("payment", "chapa"),
+    "Admin Dashboard": ("admin",),
+    "Restaurant Dashboard": ("analytics",),
+    "Search and Filtering": ("search", "filter"),
+    "Promo Code System": ("promo code",),
+    "Rate Limiting": ("rate limiting",),
+    "Home Page Components": ("home page",),
+    "Navigation and Layout": ("responsive", "protected route"),
+    "User Profile and Favorites": ("profile", "favorite"),
+    "Reviews and Ratings": ("review", "rating"),
+}
+
+# Changes to these never affect what the browser tests exercise.
+IGNORED_SUFFIXES = (".md",)
+
+
+def _git(*args):
+    return subprocess.run(
+        ["git", *args],
+        cwd=config.TESTS_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+
+
+def changed_files(ref="HEAD"):
+    """Repository-relative paths changed since ``ref``, including untracked files."""
+    files = _git("diff", "--name-only", ref)
+    files += _git("ls-files", "--others", "--exclude-standard", "--full-name")
+    return sorted(set(files))
+
+
+def feature_files():
+    """Map every implementation file to the features it belongs to."""
+    summary = json.loads(SUMMARY_PATH.read_text())
+    owners = {}
+    for feature in summary["features"]:
+        files = feature["files"] + EXTRA_FILES.get(feature["name"], [])
+        for path in files:
+            owners.setdefault(path, set()).add(feature["name"])
+    return owners
+
+
+def test_features(text):
+    """Features whose keywords appear in a test name or title."""
+    words = re.sub(r"[_\W]+", " ", text).lower()
+    return {
+        feature
+        for feature, keywords in FEATURE_KEYWORDS.items()
+        if any(keyword in words for keyword in keywords)
+    }
+
+
+def load_last_results():
+    try:
+        return json.loads(RESULTS_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def record_results(results):
+    """Merge ``{test: {"status", "seconds", ...}}`` into the cache."""
+    cache = load_last_results()
+    finished = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for name, result in results.items():
+        cache[name] = {
+            "status": result["status"],
+            "seconds": result["seconds"],
+            "finished": finished,
+        }
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    RESULTS_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+
+def select(tests, changed, *, name_of, text_of, sources_of):
+    """Return ``(selected, reasons)``; reasons maps each selected name to why it runs.
+
+    ``sources_of(test)`` gives the repository paths that define a test, so
+    editing a script or a scenario parameter file reruns just those tests.
+    """
+    owners = feature_files()
+    last = load_last_results()
+    changed = {path for path in changed if not path.endswith(IGNORED_SUFFIXES)}
+    sources = {test: set(sources_of(test)) for test in tests}
+    test_files = set().union(*sources.values())
+
+    features = set()
+    unmapped = []
+    for path in sorted(changed - test_files):
+        if path in owners:
+            features |= owners[path]
+        else:
+            unmapped.append(path)
+
+    selected, reasons = [], {}
+    for test in tests:
+        name = name_of(test)
+        touched = test_features(text_of(test))
+        status = last.get(name, {}).get("status", "never run")
+        if unmapped:
+            reason = f"unmapped change: {unmapped[0]}"
+        elif sources[test] & changed:
+            reason = "test changed"
+        elif touched & features:
+            reason = "feature changed: " + ", ".join(sorted(touched & features))
+        elif not touched:
+            reason = "no feature mapping"
+        elif status != "passed":
+            reason = f"last result: {status}"
+        else:
+            continue
+        selected.append(test)
+        reasons[name] = reason
+    return selected, reasons
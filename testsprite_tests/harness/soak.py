@@ -0,0 +1,287 @@
+"""Hours-long mixed load with server memory and event-loop sampling.
+
+Runs the scenarios of :mod:`harness.load` in turn, ``--phase`` minutes each
+(one scenario at a time, then the weighted mix), for ``--hours``, and
+samples the Node process every ``--interval`` seconds:
+
+- RSS, heap used/total, external and array buffers;
+- event-loop delay since the previous sample (mean, p99, max);
+- keys held by the rate limiters' in-memory stores;
+- document counts of ``sessions``, ``users``, ``orders`` and ``carts``.
+
+The samples come from ``GET /api/debug/metrics``, which the server only
+serves with ``ENABLE_DEBUG_METRICS=true`` (``harness.stack`` sets it). For
+a server started without it, ``--pid`` reads RSS from ``/proc`` instead and
+the other series stay empty.
+
+Growth is reported per scenario: the least-squares slope of each series
+within every phase, averaged over that scenario's phases weighted by their
+length, in units per hour. A leak in, say, the login path shows up as a
+steady RSS and ``sessions`` slope for ``TC001`` while the other scenarios
+stay flat.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.soak --hours 4                    # every scenario and the mix
+    python -m harness.soak --hours 1 -s TC001 -s TC008  # some scenarios
+    python -m harness.soak --rotate-agents              # a new User-Agent per request
+    python -m harness.soak --max-rss-slope 20           # fail above 20 MB/h
+
+``--rotate-agents`` gives each request its own rate-limit key, which grows
+the limiters' stores the way many distinct clients would. As with
+:mod:`harness.load`, start the server with ``TRUSTED_IPS`` covering this
+machine. Requires ``pip install httpx``. Results, including every sample,
+are saved to ``tmp/runs/soak_<timestamp>.json``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from . import config
+from .load import SCENARIOS, LoadClient, load_fixtures, virtual_user
+
+MIXED = "mixed"
+
+MB = 2**20
+
+# Series whose growth is reported per scenario.
+SERIES = ("rssMb", "heapUsedMb", "externalMb", "loopP99Ms", "rateLimitKeys", "sessions")
+
+
+class Sampler:
+    """Reads one sample per call from the debug endpoint or ``/proc``."""
+
+    def __init__(self, client, pid=None):
+        self.client = client
+        self.pid = pid
+        self.endpoint = True
+
+    async def start(self):
+        response = await self.client.get("/api/debug/metrics")
+        if response.status_code == 404:
+            if self.pid is None:
+                raise SystemExit(
+                    "GET /api/debug/metrics answered 404: start the server with "
+                    "ENABLE_DEBUG_METRICS=true, or pass --pid to sample RSS from /proc"
+                )
+            self.endpoint = False
+        else:
+            response.raise_for_status()
+        return self
+
+    async def sample(self):
+        if not self.endpoint:
+            return {"rssMb": _proc_rss(self.pid) / MB}
+        data = (await self.client.get("/api/debug/metrics")).json()
+        memory = data["memory"]
+        return {
+            "rssMb": memory["rss"] / MB,
+            "heapUsedMb": memory["heapUsed"] / MB,
+            "heapTotalMb": memory["heapTotal"] / MB,
+            "externalMb": (memory["external"] + memory.get("arrayBuffers", 0)) / MB,
+            "loopMeanMs": data["eventLoop"]["meanMs"],
+            "loopP99Ms": data["eventLoop"]["p99Ms"],
+            "loopMaxMs": data["eventLoop"]["maxMs"],
+            "rateLimitKeys": data.get("rateLimitKeys"),
+            **data.get("collections", {}),
+        }
+
+
+def _proc_rss(pid):
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    raise RuntimeError(f"no VmRSS for process {pid}")
+
+
+def slope_per_hour(points):
+    """Least-squares slope of ``[(seconds, value), ...]``, per hour."""
+    points = [(t, v) for t, v in points if v is not None]
+    if len(points) < 3:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    spread = sum((t - mean_t) ** 2 for t, _ in points)
+    if not spread:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / spread * 3600
+
+
+def growth(phases):
+    """Per scenario and series: length-weighted mean of the in-phase slopes."""
+    totals = defaultdict(lambda: defaultdict(float))
+    weights = defaultdict(lambda: defaultdict(float))
+    for phase in phases:
+        samples = phase["samples"]
+        if len(samples) < 3:
+            continue
+        length = samples[-1]["t"] - samples[0]["t"]
+        for series in SERIES:
+            slope = slope_per_hour([(s["t"], s.get(series)) for s in samples])
+            if slope is not None:
+                totals[phase["scenario"]][series] += slope * length
+                weights[phase["scenario"]][series] += length
+    return {
+        scenario: {
+            series: round(totals[scenario][series] / weights[scenario][series], 3)
+            for series in totals[scenario]
+        }
+        for scenario in totals
+    }
+
+
+async def _sample_until(sampler, started, interval, done, samples):
+    while True:
+        sample = await sampler.sample()
+        samples.append({"t": round(time.monotonic() - started, 3), **sample})
+        try:
+            await asyncio.wait_for(done.wait(), interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_phase(api, fixtures, mix, *, concurrency, seconds, sampler, started, interval):
+    """Load with ``mix`` for ``seconds`` while sampling; returns the samples."""
+    samples = []
+    done = asyncio.Event()
+    sampling = asyncio.create_task(_sample_until(sampler, started, interval, done, samples))
+    deadline = time.monotonic() + seconds
+    await asyncio.gather(*(virtual_user(api, fixtures, mix, deadline) for _ in range(concurrency)))
+    done.set()
+    await sampling
+    # One sample at the phase boundary, so each phase is measured end to end.
+    samples.append({"t": round(time.monotonic() - started, 3), **await sampler.sample()})
+    return samples
+
+
+async def soak(scenarios, *, hours, phase_minutes, concurrency, interval, pid, rotate_agents):
+    # The mixed phase uses the selected scenarios, or all of them.
+    weights = {
+        plan_id: SCENARIOS[plan_id]["weight"]
+        for plan_id in ([s for s in scenarios if s != MIXED] or SCENARIOS)
+    }
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=config.API_URL, limits=limits, timeout=30
+    ) as client, httpx.AsyncClient(base_url=config.API_URL, timeout=30) as probe:
+        sampler = await Sampler(probe, pid).start()
+        fixtures = await load_fixtures(client)
+        started = time.monotonic()
+        deadline = started + hours * 3600
+        phases = []
+        for index in itertools.count():
+            if time.monotonic() >= deadline:
+                break
+            scenario = scenarios[index % len(scenarios)]
+            mix = weights if scenario == MIXED else {scenario: 1}
+            api = LoadClient(client, rotate_agents=rotate_agents)
+            seconds = min(phase_minutes * 60, deadline - time.monotonic())
+            samples = await run_phase(
+                api,
+                fixtures,
+                mix,
+                concurrency=concurrency,
+                seconds=seconds,
+                sampler=sampler,
+                started=started,
+                interval=interval,
+            )
+            routes = {route: stats.summary(seconds) for route, stats in sorted(api.stats.items())}
+            phases.append({"scenario": scenario, "samples": samples, "routes": routes})
+            first, last = samples[0], samples[-1]
+            print(
+                f"phase {index + 1:>3}  {scenario:<6} {seconds / 60:5.1f} min  "
+                f"rss {first['rssMb']:7.1f} -> {last['rssMb']:7.1f} MB  "
+                f"requests {sum(r['requests'] for r in routes.values())}"
+            )
+    return phases
+
+
+def print_growth(slopes):
+    header = f"{'scenario':<10}" + "".join(f" {f'{s}/h':>18}" for s in SERIES)
+    print(header)
+    print("-" * len(header))
+    for scenario, values in slopes.items():
+        cells = "".join(
+            f" {values[s]:>+18.2f}" if s in values else f" {'-':>18}" for s in SERIES
+        )
+        print(f"{scenario:<10}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=2, help="total soak time")
+    parser.add_argument("--phase", type=float, default=10, help="minutes per scenario phase")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--interval", type=float, default=15, help="seconds between samples")
+    parser.add_argument(
+        "-s", "--scenario", action="append", default=[], help="plan IDs (or 'mixed') to include"
+    )
+    parser.add_argument("--pid", type=int, help="server process to read RSS from via /proc")
+    parser.add_argument(
+        "--rotate-agents", action="store_true", help="a new User-Agent (rate-limit key) per request"
+    )
+    parser.add_argument(
+        "--max-rss-slope", type=float, help="fail when a scenario grows RSS faster (MB/h)"
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or [*SCENARIOS, MIXED]
+    unknown = set(scenarios) - set(SCENARIOS) - {MIXED}
+    if unknown:
+        parser.error(f"unknown scenarios {', '.join(sorted(unknown))}")
+
+    phases = asyncio.run(
+        soak(
+            scenarios,
+            hours=args.hours,
+            phase_minutes=args.phase,
+            concurrency=args.concurrency,
+            interval=args.interval,
+            pid=args.pid,
+            rotate_agents=args.rotate_agents,
+        )
+    )
+    slopes = growth(phases)
+    print_growth(slopes)
+
+    config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = config.RUNS_DIR / f"soak_{stamp}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "created": stamp,
+                "target": config.API_URL,
+                "hours": args.hours,
+                "phaseMinutes": args.phase,
+                "concurrency": args.concurrency,
+                "rotateAgents": args.rotate_agents,
+                "growthPerHour": slopes,
+                "phases": phases,
+            },
+            indent=2,
+        )
+    )
+    print(f"Report written to {path}")
+    if args.max_rss_slope is not None:
+        leaking = [s for s, v in slopes.items() if v.get("rssMb", 0) > args.max_rss_slope]
+        if leaking:
+            print(f"RSS grows faster than {args.max_rss_slope} MB/h under: {', '.join(leaking)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
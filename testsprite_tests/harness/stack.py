@@ -0,0 +1,475 @@
+"""A throwaway backend for test runs: mongod on tmpfs, seeded databases, fake Chapa.
+
+``python -m harness.run --hermetic`` (or ``python -m harness.stack`` on its
+own) starts, under a fresh directory in ``/dev/shm``:
+
+- one ``mongod`` whose data files live in memory;
+- one ``server/server.js`` per worker process, each on its own port and its
+  own database (``testsprite_w0``, ``testsprite_w1``, ...) seeded by
+  ``node seed.js`` from ``server/seeds/*.js``;
+- a local fake of the two Chapa endpoints ``utils/chapa.js`` and
+  ``routes/Payment.js`` call (``/v1/transaction/initialize`` and
+  ``/v1/transaction/verify/<tx_ref>``), plus a hosted checkout page that
+  reports the payment to ``callback_url`` and redirects to ``return_url``.
+
+Nothing outside the directory is touched and everything is removed on exit,
+so every run starts from the same seed data. The browser keeps loading the
+client from ``TESTSPRITE_BASE_URL``; :func:`harness.browser.new_test_context`
+reroutes the client's ``/api`` calls to the worker's server.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+from . import config
+
+SERVER_DIR = config.TESTS_DIR.parent / "server"
+STACK_PATH = config.TESTS_DIR / "tmp" / "stack.json"
+
+# Secrets only this stack's servers and fake ever see.
+JWT_SECRET = "testsprite-hermetic-jwt-secret-0123456789"
+CHAPA_SECRET_KEY = "CHASECK_TEST-testsprite-hermetic"
+
+_MONGOD_CACHES = (
+    SERVER_DIR / "node_modules" / ".cache" / "mongodb-memory-server",
+    Path.home() / ".cache" / "mongodb-binaries",
+)
+
+
+class StackError(RuntimeError):
+    """Raised when part of the hermetic stack cannot be started."""
+
+
+def find_mongod():
+    """``TESTSPRITE_MONGOD``, ``mongod`` on PATH, or mongodb-memory-server's download."""
+    explicit = os.environ.get("TESTSPRITE_MONGOD") or shutil.which("mongod")
+    if explicit:
+        return explicit
+    for cache in _MONGOD_CACHES:
+        found = sorted(p for p in cache.glob("**/mongod*") if p.is_file() and os.access(p, os.X_OK))
+        if found:
+            return str(found[-1])
+    raise StackError(
+        "mongod not found; install MongoDB, set TESTSPRITE_MONGOD, or run "
+        "`npx mongodb-memory-server preinstall` in server/"
+    )
+
+
+def _tmpfs_root():
+    shm = Path("/dev/shm")
+    return shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _tail(path, lines=20):
+    try:
+        return "\n".join(path.read_text(errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
+
+
+# -- Fake Chapa ------------------------------------------------------------------
+
+
+class _ChapaHandler(BaseHTTPRequestHandler):
+    server_version = "FakeChapa/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=()):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _authorized(self):
+        chapa = self.server.chapa
+        if self.headers.get("Authorization") == f"Bearer {chapa.secret_key}":
+            return True
+        self._send(401, {"message": "Invalid API Key or User doesn't exist", "status": "failed"})
+        return False
+
+    def _form(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+        if "json" in self.headers.get("Content-Type", ""):
+            return json.loads(raw or "{}")
+        return dict(parse_qsl(raw))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/v1/transaction/initialize":
+            return self._send(404, {"message": "Not found", "status": "failed", "data": None})
+        if not self._authorized():
+            return
+        form = self._form()
+        missing = [key for key in ("amount", "currency", "tx_ref") if not form.get(key)]
+        if missing:
+            errors = {key: [f"The {key} field is required."] for key in missing}
+            return self._send(400, {"message": errors, "status": "failed", "data": None})
+        self.server.chapa.initialize(form)
+        checkout_url = f"{self.server.chapa.url}/checkout/{quote(form['tx_ref'], safe='')}"
+        self._send(
+            200, {"message": "Hosted Link", "status": "success", "data": {"checkout_url": checkout_url}}
+        )
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path.startswith("/v1/transaction/verify/"):
+            if self._authorized():
+                self._verify(unquote(path.rsplit("/", 1)[1]))
+        elif path.startswith("/checkout/"):
+            self._checkout(unquote(path.rsplit("/", 1)[1]))
+        else:
+            self._send(404, {"message": "Not found", "status": "failed", "data": None})
+
+    def _verify(self, tx_ref):
+        transaction = self.server.chapa.transactions.get(tx_ref)
+        if transaction is None:
+            return self._send(
+                404,
+                {"message": "Invalid transaction or Transaction not found", "status": "failed", "data": None},
+            )
+        details = {
+            "amount": transaction.get("amount"),
+            "currency": transaction.get("currency"),
+            "tx_ref": tx_ref,
+            "charge": "0",
+            "mode": "test",
+            "method": "test",
+            "type": "API",
+            "status": transaction["status"],
+            "created_at": transaction["created_at"],
+            "updated_at": transaction["updated_at"],
+        }
+        # utils/chapa.js reads the fields at the top level, the real API nests them.
+        self._send(200, {"message": "Payment details", **details, "data": details})
+
+    def _checkout(self, tx_ref):
+        transaction = self.server.chapa.complete(tx_ref)
+        if transaction is None:
+            return self._send(404, {"message": "Invalid checkout link", "status": "failed"})
+        query = {"trx_ref": tx_ref, "tx_ref": tx_ref, "status": transaction["status"]}
+        if transaction.get("callback_url"):
+            try:
+                urllib.request.urlopen(_with_query(transaction["callback_url"], query), timeout=5)
+            except (OSError, urllib.error.URLError):
+                pass  # The callback redirects to the client, which need not be running.
+        if transaction.get("return_url"):
+            return self._send(302, headers=[("Location", _with_query(transaction["return_url"], query))])
+        self._send(200, {"message": "Payment completed", "status": transaction["status"]})
+
+
+def _with_query(url, params):
+    parts = urlsplit(url)
+    query = "&".join(q for q in (parts.query, urlencode(params)) if q)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
+
+
+class FakeChapa:
+    """In-process stand-in for ``https://api.chapa.co/v1``.
+
+    A transaction is ``pending`` after ``initialize`` and takes ``outcome``
+    (``"success"`` or ``"failed"``) once its checkout page is opened.
+    """
+
+    def __init__(self, secret_key=CHAPA_SECRET_KEY, outcome="success"):
+        self.secret_key = secret_key
+        self.outcome = outcome
+        self.transactions = {}
+        self._lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/v1"
+
+    def initialize(self, form):
+        now = time.strftime("%Y-%m-%dT%H:%M:%S.000000Z", time.gmtime())
+        with self._lock:
+            self.transactions[form["tx_ref"]] = {
+                **form,
+                "status": "pending",
+                "created_at": now,
+                "updated_at": now,
+            }
+
+    def complete(self, tx_ref):
+        with self._lock:
+            transaction = self.transactions.get(tx_ref)
+            if transaction is not None and transaction["status"] == "pending":
+                transaction["status"] = self.outcome
+                transaction["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S.000000Z", time.gmtime())
+            return transaction
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ChapaHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.chapa = self
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+# -- Stack -----------------------------------------------------------------------
+
+
+@dataclass
+class Backend:
+    """One worker's ``server.js`` and database."""
+
+    index: int
+    database: str
+    port: int
+    auth_dir: Path
+    mongo_uri: str
+    process: subprocess.Popen = None
+
+    @property
+    def api_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def settings(self):
+        """Picklable description handed to the worker process."""
+        return {
+            "index": self.index,
+            "apiUrl": self.api_url,
+            "database": self.database,
+            "mongoUri": self.mongo_uri,
+            "authDir": str(self.auth_dir),
+        }
+
+
+def _stop(process, timeout=5):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+class Stack:
+    """Start with ``with Stack(workers=4) as stack:``; ``stack.backends[i]`` is worker i's."""
+
+    def __init__(self, workers=1, *, timeout=60, mongod=None, node=None):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.mongod = mongod
+        self.node = node or os.environ.get("TESTSPRITE_NODE", "node")
+        self.root = None
+        self.mongo_port = None
+        self.chapa = FakeChapa()
+        self.backends = []
+        self._mongod = None
+
+    @property
+    def mongo_uri(self):
+        return f"mongodb://127.0.0.1:{self.mongo_port}"
+
+    def start(self):
+        if not (SERVER_DIR / "node_modules").is_dir():
+            raise StackError(f"{SERVER_DIR}/node_modules is missing; run `npm ci` in server/")
+        deadline = time.monotonic() + self.timeout
+        self.root = Path(tempfile.mkdtemp(prefix="testsprite-stack-", dir=_tmpfs_root()))
+        try:
+            self._start_mongod(deadline)
+            self.chapa.start()
+            self.backends = [
+                Backend(
+                    i,
+                    f"testsprite_w{i}",
+                    _free_port(),
+                    self.root / "auth" / f"w{i}",
+                    f"{self.mongo_uri}/testsprite_w{i}",
+                )
+                for i in range(self.workers)
+            ]
+            self._seed(deadline)
+            for backend in self.backends:
+                backend.process = self._spawn(
+                    [self.node, "server.js"], backend, f"server-w{backend.index}"
+                )
+            for backend in self.backends:
+                self._wait_healthy(backend, deadline)
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def stop(self):
+        for backend in self.backends:
+            _stop(backend.process)
+        self.chapa.stop()
+        _stop(self._mongod, timeout=15)
+        self._mongod = None
+        if self.root:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def describe(self):
+        return {
+            "mongoUri": self.mongo_uri,
+            "chapaUrl": self.chapa.api_url,
+            "backends": [backend.settings() for backend in self.backends],
+        }
+
+    # -- Processes ---------------------------------------------------------------
+
+    def _start_mongod(self, deadline):
+        dbpath = self.root / "db"
+        dbpath.mkdir()
+        self.mongo_port = _free_port()
+        log = self.root / "mongod.log"
+        command = [
+            self.mongod or find_mongod(),
+            "--dbpath", str(dbpath),
+            "--port", str(self.mongo_port),
+            "--bind_ip", "127.0.0.1",
+            "--logpath", str(log),
+            "--wiredTigerCacheSizeGB", "0.25",
+            "--setParameter", "diagnosticDataCollectionEnabled=false",
+        ]
+        self._mongod = subprocess.Popen(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+        )
+        while time.monotonic() < deadline:
+            if self._mongod.poll() is not None:
+                raise StackError(f"mongod exited with {self._mongod.returncode}:\n{_tail(log)}")
+            try:
+                socket.create_connection(("127.0.0.1", self.mongo_port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        raise StackError(f"mongod did not accept connections:\n{_tail(log)}")
+
+    def _env(self, backend):
+        return {
+            **os.environ,
+            "NODE_ENV": "test",
+            "PORT": str(backend.port),
+            "MONGODB_URI": backend.mongo_uri,
+            "MONGO_URI": backend.mongo_uri,
+            "JWT_SECRET": JWT_SECRET,
+            "REFRESH_TOKEN_SECRET": f"{JWT_SECRET}-refresh",
+            "JWT_EXPIRE": "1d",
+            "JWT_EXPIRES_IN": "1d",
+            "CHAPA_SECRET_KEY": self.chapa.secret_key,
+            "CHAPA_API_URL": self.chapa.api_url,
+            "BACKEND_URL": backend.api_url,
+            "FRONTEND_URL": config.BASE_URL,
+            "LOG_LEVEL": "warn",
+            "ENABLE_DEBUG_METRICS": "true",
+        }
+
+    def _spawn(self, command, backend, name):
+        with (self.root / f"{name}.log").open("wb") as log:
+            return subprocess.Popen(
+                command,
+                cwd=SERVER_DIR,
+                env=self._env(backend),
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+
+    def _seed(self, deadline):
+        # One seed process per database, all at once.
+        seeds = [
+            (backend, self._spawn([self.node, "seed.js"], backend, f"seed-w{backend.index}"))
+            for backend in self.backends
+        ]
+        for backend, process in seeds:
+            try:
+                code = process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                _stop(process)
+                code = "timeout"
+            if code != 0:
+                log = self.root / f"seed-w{backend.index}.log"
+                raise StackError(f"seeding {backend.database} failed ({code}):\n{_tail(log)}")
+
+    def _wait_healthy(self, backend, deadline):
+        url = f"{backend.api_url}/api/health"
+        while time.monotonic() < deadline:
+            if backend.process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                pass
+            time.sleep(0.1)
+        log = self.root / f"server-w{backend.index}.log"
+        raise StackError(f"{url} did not become healthy:\n{_tail(log)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-w", "--workers", type=int, default=1, help="servers (and databases) to start")
+    parser.add_argument("--timeout", type=float, default=60, help="startup timeout in seconds")
+    args = parser.parse_args(argv)
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    with Stack(workers=args.workers, timeout=args.timeout) as stack:
+        STACK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STACK_PATH.write_text(json.dumps(stack.describe(), indent=2))
+        print(f"mongod      {stack.mongo_uri}")
+        print(f"fake Chapa  {stack.chapa.api_url}")
+        for backend in stack.backends:
+            print(f"worker {backend.index}    TESTSPRITE_API_URL={backend.api_url}  ({backend.database})")
+        print(f"Written to {STACK_PATH}; Ctrl+C stops the stack.")
+        try:
+            stopping.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            STACK_PATH.unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Per-step timing spans for the TestSprite scripts.
+
+Every fill, click and :meth:`Actions.goto <harness.actions.Actions.goto>`
+a test runs under ``python -m harness.run`` becomes a span split into
+phases:
+
+``locate``
+    waiting for the target to become visible, i.e. the page still rendering;
+``action``
+    Playwright performing the fill or click (or loading the URL);
+``settle``
+    waiting for the ``/api/*`` calls the step fired and for the DOM to go quiet.
+
+Step durations go to :mod:`harness.history` on every run. With ``--trace``
+the tracer also watches the network: each span lists the API requests it
+triggered with their status and duration, and document navigations
+(including the ones scripts start with a bare ``page.goto``) are recorded
+from request to ``load``. The runner writes all spans as JSON lines and as
+a Chrome trace that ``chrome://tracing`` or https://ui.perfetto.dev can
+open.
+"""
+
+import contextvars
+import json
+import re
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+_current = contextvars.ContextVar("testsprite_tracer", default=None)
+
+_SELECTOR = re.compile(r"selector='(.*)'>$")
+
+
+def current():
+    """The tracer of the test running in this task, or None."""
+    return _current.get()
+
+
+@contextmanager
+def activated(tracer):
+    """Make ``tracer`` the one :class:`Actions` picks up in the current task."""
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+
+
+def describe(locator):
+    """Short, stable label for a locator: its selector without the frame."""
+    match = _SELECTOR.search(repr(locator))
+    return match.group(1) if match else repr(locator)
+
+
+def _path(url):
+    parts = urlparse(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class Span:
+    def __init__(self, tracer, index, kind, target):
+        self.tracer = tracer
+        self.record = {
+            "step": index,
+            "kind": kind,
+            "target": target,
+            "startMs": round(tracer.now_ms(), 3),
+            "durationMs": None,
+            "phases": {},
+            "error": None,
+        }
+
+    @contextmanager
+    def phase(self, name):
+        started = self.tracer.now_ms()
+        try:
+            yield
+        finally:
+            self.record["phases"][name] = round(self.tracer.now_ms() - started, 3)
+
+
+class _NullSpan:
+    @contextmanager
+    def phase(self, name):
+        yield
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects spans, API requests and navigations for one test."""
+
+    def __init__(self, test):
+        self.test = test
+        self._origin = time.perf_counter()
+        self.spans = []
+        self.requests = {}
+        self.navigations = []
+        self._open_step = None
+        self._open_navigations = {}
+
+    def now_ms(self):
+        return (time.perf_counter() - self._origin) * 1000
+
+    def attach(self, context):
+        context.on("request", self._on_request)
+        context.on("response", self._on_response)
+        context.on("requestfinished", self._on_request_done)
+        context.on("requestfailed", self._on_request_failed)
+        context.on("page", self._watch_page)
+        for page in context.pages:
+            self._watch_page(page)
+
+    @contextmanager
+    def step(self, kind, target):
+        span = Span(self, len(self.spans) + 1, kind, target)
+        self.spans.append(span.record)
+        self._open_step = span.record["step"]
+        try:
+            yield span
+        except BaseException as exc:
+            message = str(exc).strip().splitlines()
+            span.record["error"] = (
+                f"{type(exc).__name__}: {message[0]}" if message else type(exc).__name__
+            )
+            raise
+        finally:
+            span.record["durationMs"] = round(self.now_ms() - span.record["startMs"], 3)
+            self._open_step = None
+
+    # -- Network ---------------------------------------------------------------
+
+    def _on_request(self, request):
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            self._open_navigations[request.frame] = {
+                "url": request.url,
+                "step": self._open_step,
+                "startMs": round(self.now_ms(), 3),
+                "domContentLoadedMs": None,
+                "loadMs": None,
+            }
+            self.navigations.append(self._open_navigations[request.frame])
+        if urlparse(request.url).path.startswith("/api/"):
+            self.requests[request] = {
+                "method": request.method,
+                "url": _path(request.url),
+                "step": self._open_step,
+                "startMs": round(self.now_ms(), 3),
+                "durationMs": None,
+                "status": None,
+            }
+
+    def _on_response(self, response):
+        record = self.requests.get(response.request)
+        if record is not None:
+            record["status"] = response.status
+            record["ttfbMs"] = round(self.now_ms() - record["startMs"], 3)
+
+    def _on_request_done(self, request):
+        record = self.requests.get(request)
+        if record is not None:
+            record["durationMs"] = round(self.now_ms() - record["startMs"], 3)
+
+    def _on_request_failed(self, request):
+        self._on_request_done(request)
+        record = self.requests.get(request)
+        if record is not None:
+            record["failure"] = request.failure
+
+    def _watch_page(self, page):
+        page.on("domcontentloaded", lambda p: self._on_page_event(p, "domContentLoadedMs"))
+        page.on("load", lambda p: self._on_page_event(p, "loadMs"))
+
+    def _on_page_event(self, page, field):
+        navigation = self._open_navigations.get(page.main_frame)
+        if navigation is not None and navigation[field] is None:
+            navigation[field] = round(self.now_ms() - navigation["startMs"], 3)
+            if field == "loadMs":
+                del self._open_navigations[page.main_frame]
+
+    def timings(self):
+        """Step durations alone, as :mod:`harness.history` stores them."""
+        return [
+            {
+                "step": span["step"],
+                "kind": span["kind"],
+                "target": span["target"],
+                "ms": span["durationMs"],
+                "error": span["error"],
+            }
+            for span in self.spans
+        ]
+
+    def export(self):
+        """Plain data for the report; picklable across runner processes."""
+        requests = list(self.requests.values())
+        spans = [
+            {**span, "requests": [r for r in requests if r["step"] == span["step"]]}
+            for span in self.spans
+        ]
+        return {
+            "test": self.test,
+            "spans": spans,
+            "requests": requests,
+            "navigations": self.navigations,
+        }
+
+
+def write_jsonl(traces, path):
+    """One line per span, request and navigation, tagged with the test name.
+
+    Spans embed the API requests they triggered; requests also get lines of
+    their own so that calls made outside any step are not lost.
+    """
+    with path.open("w") as out:
+        for trace in traces:
+            for kind in ("spans", "requests", "navigations"):
+                for record in trace[kind]:
+                    out.write(json.dumps({"test": trace["test"], "type": kind[:-1], **record}))
+                    out.write("\n")
+
+
+_STEPS_TID, _API_TID, _NAV_TID = 1, 2, 3
+
+
+def _complete(name, cat, pid, tid, start_ms, duration_ms, args):
+    return {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "pid": pid,
+        "tid": tid,
+        "ts": round(start_ms * 1000),
+        "dur": round((duration_ms or 0) * 1000),
+        "args": args,
+    }
+
+
+def write_chrome(traces, path):
+    """Chrome trace event format: one process per test, one thread per track."""
+    events = []
+    for pid, trace in enumerate(traces, 1):
+        events.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": trace["test"]}}
+        )
+        for tid, label in ((_STEPS_TID, "steps"), (_API_TID, "api"), (_NAV_TID, "navigation")):
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": label}}
+            )
+        for span in trace["spans"]:
+            name = f"{span['kind']} {span['target']}"
+            events.append(
+                _complete(name, "step", pid, _STEPS_TID, span["startMs"], span["durationMs"], span)
+            )
+            offset = span["startMs"]
+            for phase, duration in span["phases"].items():
+                events.append(_complete(phase, "phase", pid, _STEPS_TID, offset, duration, {}))
+                offset += duration
+        for request in trace["requests"]:
+            name = f"{request['method']} {request['url']}"
+            events.append(
+                _complete(
+                    name, "api", pid, _API_TID, request["startMs"], request["durationMs"], request
+                )
+            )
+        for navigation in trace["navigations"]:
+            events.append(
+                _complete(
+                    _path(navigation["url"]) or "/",
+                    "navigation",
+                    pid,
+                    _NAV_TID,
+                    navigation["startMs"],
+                    navigation["loadMs"] or navigation["domContentLoadedMs"],
+                    navigation,
+                )
+            )
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
@@ -0,0 +1,304 @@
+"""Responsive screenshots compared against stored baselines.
+
+:func:`check_breakpoints` opens one page at every breakpoint at once, each
+in its own context on the test's browser, and compares a full-page
+screenshot per breakpoint with its baseline:
+
+- identical bytes pass straight away: baselines are stored by the SHA-256
+  of their PNG, so an unchanged page costs one hash;
+- otherwise both images are compared pixel by pixel with NumPy. A pixel
+  counts as changed when any channel differs by more than the baseline's
+  ``tolerance``; regions listed in its ``masks`` are ignored, and the check
+  fails when more than ``maxRatio`` of the remaining pixels changed;
+- a page wider than its viewport (horizontal overflow) fails at once.
+
+Elements whose content varies between runs, such as remote photos, are
+painted over before the screenshot (``mask``, ``img`` by default), so only
+their size and position are compared.
+
+Baselines live in ``visual_baselines/``: ``index.json`` maps
+``<name>/<breakpoint>`` to the hash of its PNG in ``blobs/`` plus its
+tolerance settings. A missing baseline is recorded and the test is reported
+``unverified``; ``python -m harness.run --update-baselines`` (or
+``TESTSPRITE_UPDATE_BASELINES=1``) replaces the baselines of every page
+checked. Failed comparisons leave the screenshot and a diff image in
+``tmp/runs/visual/``.
+
+Requires ``numpy`` and ``Pillow``.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import io
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from . import config
+from .actions import Actions, Unverified
+from .browser import new_test_context
+
+BASELINES_DIR = config.TESTS_DIR / "visual_baselines"
+INDEX_PATH = BASELINES_DIR / "index.json"
+INDEX_LOCK_PATH = BASELINES_DIR / ".index.lock"
+BLOBS_DIR = BASELINES_DIR / "blobs"
+# Decoded baselines, so a changed page decodes only its new screenshot.
+PIXEL_CACHE_DIR = config.TESTS_DIR / "tmp" / "visual_cache"
+DIFFS_DIR = config.RUNS_DIR / "visual"
+
+# Per-channel difference (0-255) still treated as equal: anti-aliasing and
+# sub-pixel text rendering move edges by a shade or two.
+TOLERANCE = 16
+# Share of unmasked pixels allowed to change.
+MAX_RATIO = 0.001
+
+
+@dataclass(frozen=True)
+class Breakpoint:
+    name: str
+    width: int
+    height: int
+    mobile: bool = False
+
+    def context_options(self):
+        return {
+            "viewport": {"width": self.width, "height": self.height},
+            "is_mobile": self.mobile,
+            "has_touch": self.mobile,
+            "device_scale_factor": 1,
+        }
+
+
+BREAKPOINTS = (
+    Breakpoint("mobile", 375, 812, mobile=True),
+    Breakpoint("tablet", 768, 1024, mobile=True),
+    Breakpoint("laptop", 1280, 720),
+    Breakpoint("desktop", 1920, 1080),
+)
+
+# Same rendering on every machine: no motion, fixed locale, clock and theme.
+_STABLE_OPTIONS = {
+    "locale": "en-US",
+    "timezone_id": "UTC",
+    "color_scheme": "light",
+    "reduced_motion": "reduce",
+}
+
+_OVERFLOW_JS = "() => document.documentElement.scrollWidth - window.innerWidth"
+
+
+class VisualMismatch(AssertionError):
+    """A screenshot differs from its baseline beyond the tolerance."""
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_index():
+    return json.loads(INDEX_PATH.read_text()) if INDEX_PATH.exists() else {}
+
+
+@contextmanager
+def _index_lock():
+    BASELINES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(INDEX_LOCK_PATH, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _save_index(updates):
+    # Worker processes record pages concurrently: re-read, merge and replace
+    # the index under a lock, and write it whole so readers never see half.
+    with _index_lock():
+        index = load_index()
+        index.update(updates)
+        fd, tmp = tempfile.mkstemp(dir=BASELINES_DIR, prefix=".index.", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(index, indent=2, sort_keys=True) + "\n")
+            os.replace(tmp, INDEX_PATH)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _store_blob(png):
+    digest = _sha256(png)
+    path = BLOBS_DIR / f"{digest}.png"
+    if not path.exists():
+        BLOBS_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+    return digest
+
+
+def _decode(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+def baseline_pixels(digest):
+    """The baseline's RGB array, decoded once and then read from the cache."""
+    cached = PIXEL_CACHE_DIR / f"{digest}.npy"
+    if cached.exists():
+        return np.load(cached)
+    pixels = _decode((BLOBS_DIR / f"{digest}.png").read_bytes())
+    PIXEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    np.save(cached, pixels)
+    return pixels
+
+
+def compare(expected, actual, *, tolerance=TOLERANCE, masks=()):
+    """``(changed_ratio, changed)``: share of unmasked pixels that differ and where.
+
+    ``masks`` are ``[x, y, width, height]`` rectangles to ignore.
+    """
+    if expected.shape != actual.shape:
+        raise VisualMismatch(
+            f"size changed from {expected.shape[1]}x{expected.shape[0]} "
+            f"to {actual.shape[1]}x{actual.shape[0]}"
+        )
+    delta = np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max(axis=2)
+    changed = delta > tolerance
+    considered = np.ones(changed.shape, dtype=bool)
+    for x, y, width, height in masks:
+        considered[y : y + height, x : x + width] = False
+    changed &= considered
+    total = int(considered.sum())
+    return (changed.sum() / total if total else 0.0), changed
+
+
+def _write_diff(key, actual_png, actual, changed):
+    DIFFS_DIR.mkdir(parents=True, exist_ok=True)
+    stem = key.replace("/", "-")
+    (DIFFS_DIR / f"{stem}-actual.png").write_bytes(actual_png)
+    # Faded screenshot with the changed pixels in red.
+    diff = (actual // 3 + 170).astype(np.uint8)
+    diff[changed] = (255, 0, 0)
+    Image.fromarray(diff).save(DIFFS_DIR / f"{stem}-diff.png")
+    return DIFFS_DIR / f"{stem}-diff.png"
+
+
+def verify(key, png, index, *, update=False):
+    """Check one screenshot against ``index[key]``; returns what happened.
+
+    ``"match"``, ``"within tolerance"`` or ``"recorded"``; raises
+    :class:`VisualMismatch` otherwise. ``index`` is updated in place when
+    a baseline is recorded.
+    """
+    entry = index.get(key)
+    digest = _sha256(png)
+    if entry is None or update:
+        settings = {k: v for k, v in (entry or {}).items() if k != "sha256"}
+        index[key] = {"tolerance": TOLERANCE, "maxRatio": MAX_RATIO, "masks": [], **settings}
+        index[key]["sha256"] = _store_blob(png)
+        return "recorded"
+    if digest == entry["sha256"]:
+        return "match"
+    actual = _decode(png)
+    try:
+        ratio, changed = compare(
+            baseline_pixels(entry["sha256"]),
+            actual,
+            tolerance=entry.get("tolerance", TOLERANCE),
+            masks=entry.get("masks", ()),
+        )
+    except VisualMismatch as exc:
+        DIFFS_DIR.mkdir(parents=True, exist_ok=True)
+        (DIFFS_DIR / f"{key.replace('/', '-')}-actual.png").write_bytes(png)
+        raise VisualMismatch(f"{key}: {exc}") from None
+    if ratio > entry.get("maxRatio", MAX_RATIO):
+        path = _write_diff(key, png, actual, changed)
+        raise VisualMismatch(
+            f"{key}: {ratio:.2%} of pixels changed "
+            f"(allowed {entry.get('maxRatio', MAX_RATIO):.2%}); diff in {path}"
+        )
+    return "within tolerance"
+
+
+async def screenshot(
+    context, breakpoint, url, *, setup=None, mask=("img",), signed_in=True
+):
+    """Load ``url`` at ``breakpoint`` in a new context next to ``context``.
+
+    With ``signed_in`` the new context copies ``context``'s cookies and
+    storage. ``setup`` is awaited with it before the page opens (e.g.
+    :func:`harness.chapa.seed_cart`).
+    """
+    state = await context.storage_state() if signed_in else None
+    page_context = await new_test_context(
+        context.browser,
+        lean=False,
+        storage_state=state,
+        **_STABLE_OPTIONS,
+        **breakpoint.context_options(),
+    )
+    try:
+        if setup is not None:
+            await setup(page_context)
+        page = await page_context.new_page()
+        await Actions(page_context).goto(page, url)
+        await page.evaluate("() => document.fonts.ready.then(() => true)")
+        overflow = await page.evaluate(_OVERFLOW_JS)
+        png = await page.screenshot(
+            full_page=True,
+            animations="disabled",
+            caret="hide",
+            mask=[page.locator(selector) for selector in mask],
+        )
+        return png, overflow
+    finally:
+        await page_context.close()
+
+
+async def check_breakpoints(
+    context,
+    name,
+    path,
+    *,
+    setup=None,
+    mask=("img",),
+    signed_in=True,
+    breakpoints=BREAKPOINTS,
+):
+    """Screenshot ``path`` at every breakpoint concurrently and check each one.
+
+    Returns ``{breakpoint: outcome}`` (see :func:`verify`). Raises
+    :class:`VisualMismatch` listing every breakpoint that overflowed or
+    changed, and :class:`~harness.actions.Unverified` when baselines were
+    recorded for the first time.
+    """
+    url = f"{config.BASE_URL}{path}"
+    shots = await asyncio.gather(
+        *(
+            screenshot(context, bp, url, setup=setup, mask=mask, signed_in=signed_in)
+            for bp in breakpoints
+        )
+    )
+    index = load_index()
+    outcomes, problems = {}, []
+    for bp, (png, overflow) in zip(breakpoints, shots, strict=True):
+        key = f"{name}/{bp.name}"
+        if overflow > 0:
+            problems.append(f"{key}: page is {overflow}px wider than the {bp.width}px viewport")
+            continue
+        try:
+            outcomes[bp.name] = verify(key, png, index, update=config.UPDATE_BASELINES)
+        except VisualMismatch as exc:
+            problems.append(str(exc))
+    recorded = [bp for bp, outcome in outcomes.items() if outcome == "recorded"]
+    if recorded:
+        _save_index({f"{name}/{bp}": index[f"{name}/{bp}"] for bp in recorded})
+    if problems:
+        raise VisualMismatch("; ".join(problems))
+    if recorded and not config.UPDATE_BASELINES:
+        raise Unverified(f"{name}: recorded new baselines for {', '.join(recorded)}")
+    return outcomes
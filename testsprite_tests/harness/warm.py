@@ -0,0 +1,216 @@
+"""Warm starts: Vite's module graph and a standing Chromium.
+
+Two costs come before the first step of every run:
+
+- Vite transforms each module on its first request, so the first test to
+  open a page waits for the app, its lazy routes and their dependencies to
+  compile. :func:`warm_vite` requests every module the entry point reaches,
+  eight at a time, before any test starts. The module list is kept in
+  ``tmp/vite_modules.json`` together with a fingerprint of ``client/src``,
+  the lockfile and ``vite.config.js``; while those are unchanged the next
+  run requests the list in one parallel burst instead of crawling import by
+  import. (``vite.config.js`` also lists the app under ``server.warmup``,
+  so a freshly started dev server begins compiling on its own.)
+- Launching Chromium. ``python -m harness.warm serve`` starts one headless
+  Chromium and leaves it running; while it is up, :class:`BrowserPool
+  <harness.browser.BrowserPool>` connects to it over CDP instead of
+  launching browsers, across any number of runs. Every test still gets its
+  own context, so nothing but the process is shared.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.warm serve     # keep a Chromium up for later runs
+    python -m harness.warm vite      # compile the client's modules now
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urljoin, urlsplit
+
+from playwright.async_api import async_playwright
+
+from . import config
+
+CLIENT_DIR = config.TESTS_DIR.parent / "client"
+MODULES_PATH = config.TESTS_DIR / "tmp" / "vite_modules.json"
+SERVER_PATH = config.TESTS_DIR / "tmp" / "browser_server.json"
+
+# Static imports, re-exports and dynamic import() with a literal specifier.
+_SPECIFIER = re.compile(
+    r"""(?:\bimport\s*(?:[\w*{}\s,$]+\s*from\s*)?|\bexport\s*[\w*{}\s,$]+\s*from\s*|\bimport\s*\(\s*)"""
+    r"""["']([^"']+)["']"""
+)
+_ENTRY = re.compile(r"""<script[^>]+type=["']module["'][^>]+src=["']([^"']+)["']""")
+
+_DEVTOOLS = re.compile(r"DevTools listening on (ws://\S+)")
+
+
+def fingerprint():
+    """Changes whenever the client's sources, dependencies or Vite config do."""
+    digest = hashlib.sha256()
+    paths = sorted((CLIENT_DIR / "src").rglob("*"))
+    paths += [CLIENT_DIR / "package-lock.json", CLIENT_DIR / "vite.config.js", CLIENT_DIR / "index.html"]
+    for path in paths:
+        if path.is_file():
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _cached_modules(key):
+    try:
+        cached = json.loads(MODULES_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    # An empty list means the crawl found nothing: never replay it
+    return cached["modules"] if cached.get("key") == key and cached.get("modules") else None
+
+
+def _specifiers(source, url):
+    for specifier in _SPECIFIER.findall(source):
+        if specifier.startswith(("/", "./", "../")):
+            yield urljoin(url, specifier)
+
+
+async def warm_vite(request, *, concurrency=8):
+    """Have the dev server transform every module the app can load.
+
+    ``request`` is a Playwright ``APIRequestContext`` (``context.request``).
+    Returns ``(module_count, seconds)``.
+    """
+    started = time.perf_counter()
+    origin = f"{urlsplit(config.BASE_URL).scheme}://{urlsplit(config.BASE_URL).netloc}"
+    key = f"{config.BASE_URL}|{fingerprint()}"
+    gate = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with gate:
+            try:
+                response = await request.get(url)
+                return await response.text() if response.ok else None
+            except Exception:
+                return None
+
+    modules = _cached_modules(key)
+    if modules is not None:
+        await asyncio.gather(*(fetch(url) for url in modules))
+        return len(modules), round(time.perf_counter() - started, 3)
+
+    page = await fetch(config.BASE_URL + "/")
+    if not page:
+        # Dev server down or not serving the app: nothing to warm or cache
+        return 0, round(time.perf_counter() - started, 3)
+    seen = {urljoin(config.BASE_URL + "/", src) for src in _ENTRY.findall(page)}
+    frontier = list(seen)
+    while frontier:
+        sources = await asyncio.gather(*(fetch(url) for url in frontier))
+        found = set()
+        for url, source in zip(frontier, sources, strict=True):
+            if source:
+                found.update(u for u in _specifiers(source, url) if u.startswith(origin))
+        frontier = sorted(found - seen)
+        seen |= found
+    modules = sorted(seen)
+    if modules:
+        MODULES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        MODULES_PATH.write_text(json.dumps({"key": key, "modules": modules}, indent=2))
+    return len(modules), round(time.perf_counter() - started, 3)
+
+
+def running_server():
+    """CDP endpoint of the Chromium ``serve`` left running, or None."""
+    try:
+        server = json.loads(SERVER_PATH.read_text())
+        os.kill(server["pid"], 0)
+    except (OSError, ValueError, KeyError):
+        return None
+    return server["endpoint"]
+
+
+async def _executable():
+    async with async_playwright() as pw:
+        return pw.chromium.executable_path
+
+
+def serve(args):
+    from .browser import LAUNCH_ARGS
+
+    profile = tempfile.mkdtemp(prefix="testsprite-chromium-")
+    process = subprocess.Popen(
+        [
+            asyncio.run(_executable()),
+            "--headless=new",
+            "--remote-debugging-port=0",
+            f"--user-data-dir={profile}",
+            *LAUNCH_ARGS,
+            "about:blank",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        for line in process.stderr:
+            match = _DEVTOOLS.search(line)
+            if match:
+                break
+        else:
+            print("Chromium exited before it was ready", file=sys.stderr)
+            return 1
+        # connect_over_cdp takes the HTTP origin and looks the socket up itself.
+        endpoint = "http://" + urlsplit(match.group(1)).netloc
+        SERVER_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SERVER_PATH.write_text(json.dumps({"endpoint": endpoint, "pid": process.pid}))
+        print(f"Chromium ready at {endpoint}; Ctrl-C to stop")
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        # Keep draining stderr so Chromium never blocks on a full pipe.
+        for _ in process.stderr:
+            pass
+        return process.wait()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        SERVER_PATH.unlink(missing_ok=True)
+        process.terminate()
+        try:
+            process.wait(5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(profile, ignore_errors=True)
+
+
+async def warm_vite_once():
+    """Run :func:`warm_vite` on a driver of its own."""
+    async with async_playwright() as pw:
+        request = await pw.request.new_context()
+        try:
+            return await warm_vite(request)
+        finally:
+            await request.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="start a Chromium that later runs connect to")
+    commands.add_parser("vite", help="request every client module from the dev server")
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        return serve(args)
+    count, seconds = asyncio.run(warm_vite_once())
+    print(f"warmed {count} modules in {seconds:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())